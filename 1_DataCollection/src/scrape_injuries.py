@@ -0,0 +1,198 @@
+"""
+# Scrape Injuries - concurrent, resumable version of scrape_data from prem_WebScrape.ipynb
+# Pages for every (season, week) are fetched on a small thread pool sharing one pooled
+# requests.Session with retry/backoff and a global rate limit. Each parsed week is written
+# to its own checkpoint file, so an interrupted backfill picks up where it stopped; the
+# per-season CSV (same columns as the notebook) is assembled from the checkpoints.
+## Run from 1_DataCollection: python src/scrape_injuries.py 2020 2021 [--base-url http://localhost:8000/]
+"""
+import os
+import csv
+import time
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+BASE_URL = "https://www.nfl.com/injuries/league/"
+DATA_DIR = "../data"
+CHECKPOINT_DIR = "../data/scrape_checkpoints"
+
+WEEKS = [f"REG{i}" for i in range(1, 19)] + [f"POST{i}" for i in range(1, 5)]
+# Seasons have had 18 regular-season weeks since 2021; REG18 does not exist before that
+FIRST_18_WEEK_SEASON = 2021
+HEADER = ["Week", "Player", "Position", "Injury", "Game Status", "Game Type"]
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Spaces request starts at least `interval` seconds apart across all threads."""
+
+    def __init__(self, requests_per_second):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self.lock = threading.Lock()
+        self.next_time = 0.0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_time)
+            self.next_time = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def make_session(pool_size, retries=4, backoff=0.5):
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = "Mozilla/5.0 (injury-report research scraper)"
+    return session
+
+
+# Function to pull every table row of an injury page, as in the notebook
+def parse_injury_page(html, week):
+    soup = BeautifulSoup(html, "html.parser")
+    rows = []
+    for table in soup.find_all("table"):
+        for row in table.find_all("tr"):
+            columns = row.find_all(["th", "td"])
+            rows.append([week] + [col.text.strip() for col in columns])
+    return rows
+
+
+def _checkpoint_path(checkpoint_dir, year, week):
+    return os.path.join(checkpoint_dir, str(year), f"{week}.csv")
+
+
+def _write_rows(path, rows, header=None):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", newline="") as csvfile:
+        csvwriter = csv.writer(csvfile)
+        if header:
+            csvwriter.writerow(header)
+        csvwriter.writerows(rows)
+    os.replace(tmp_path, path)
+
+
+def scrape_week(session, limiter, base_url, year, week, checkpoint_dir, timeout=30):
+    limiter.wait()
+    response = session.get(f"{base_url}{year}/{week}", timeout=timeout)
+    # a 404 (e.g. a playoff round not played yet) is not checkpointed, so it is retried
+    response.raise_for_status()
+    rows = parse_injury_page(response.text, week)
+    _write_rows(_checkpoint_path(checkpoint_dir, year, week), rows)
+    return len(rows)
+
+
+# Function to list the weeks a season has pages for
+def season_weeks(year, weeks=WEEKS):
+    if int(year) < FIRST_18_WEEK_SEASON:
+        return [week for week in weeks if week != "REG18"]
+    return list(weeks)
+
+
+# Function to scrape all missing (season, week) pages and rebuild each season's CSV
+def scrape_seasons(
+    years,
+    base_url=BASE_URL,
+    data_dir=DATA_DIR,
+    checkpoint_dir=CHECKPOINT_DIR,
+    weeks=WEEKS,
+    workers=4,
+    requests_per_second=2.0,
+):
+    expected = [
+        (str(year), week) for year in years for week in season_weeks(year, weeks)
+    ]
+    pending = [
+        (year, week)
+        for year, week in expected
+        if not os.path.exists(_checkpoint_path(checkpoint_dir, year, week))
+    ]
+    logger.info(
+        "%d pages to fetch, %d already checkpointed",
+        len(pending),
+        len(expected) - len(pending),
+    )
+
+    failed = []
+    session = make_session(workers)
+    limiter = RateLimiter(requests_per_second)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(
+                scrape_week, session, limiter, base_url, year, week, checkpoint_dir
+            ): (year, week)
+            for year, week in pending
+        }
+        for future in as_completed(futures):
+            year, week = futures[future]
+            try:
+                logger.info(
+                    "Scraping done for %s %s (%d rows)", year, week, future.result()
+                )
+            except Exception as e:
+                # Not checkpointed, so the next run retries it
+                logger.error("Error! %s %s: %s", year, week, e)
+                failed.append((year, week))
+
+    # Assemble each fully checkpointed season into the notebook's CSV layout
+    for year in map(str, years):
+        paths = [
+            _checkpoint_path(checkpoint_dir, year, week)
+            for week in season_weeks(year, weeks)
+        ]
+        if not all(os.path.exists(p) for p in paths):
+            logger.warning("Season %s incomplete, rerun to resume", year)
+            continue
+        rows = []
+        for path in paths:
+            with open(path, newline="") as f:
+                rows.extend(csv.reader(f))
+        _write_rows(os.path.join(data_dir, f"injuries_scrape_{year}.csv"), rows, HEADER)
+    return failed
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(description="Scrape nfl.com weekly injury reports")
+    parser.add_argument("years", nargs="+")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--checkpoint-dir", default=CHECKPOINT_DIR)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--rps", type=float, default=2.0, help="max requests per second"
+    )
+    args = parser.parse_args()
+
+    failed = scrape_seasons(
+        args.years,
+        base_url=args.base_url,
+        data_dir=args.data_dir,
+        checkpoint_dir=args.checkpoint_dir,
+        workers=args.workers,
+        requests_per_second=args.rps,
+    )
+    if failed:
+        raise SystemExit(f"{len(failed)} pages failed: {failed}")
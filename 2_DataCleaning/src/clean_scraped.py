@@ -0,0 +1,116 @@
+"""
+# Clean Scraped - vectorized version of clean_scraped_csvs from prem_WebScrape.ipynb
+# The REG/WC/DIV/CON/SB game type and the week number come from one regex extract over
+# the 'Week' column instead of a per-row .loc loop. Season files are cleaned in parallel
+# and each one is written straight to its own season=<year> Parquet partition (and
+# optionally appended to the legacy CSV in season order) instead of pd.concat + to_csv.
+## Run from 2_DataCleaning: python src/clean_scraped.py 2020 2021 [--csv]
+"""
+import os
+import logging
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+SCRAPE_CSV = "../data/injuries_scrape_{year}.csv"
+OUTPUT_DIR = "../data/cleaned_scraped"
+LEGACY_CSV = "../data/cleaned_scraped_data.csv"
+
+POST_GAME_TYPES = {"1": "WC", "2": "DIV", "3": "CON", "4": "SB"}
+STATUS_COLUMNS = ["Game Status", "Game Type"]
+
+logger = logging.getLogger(__name__)
+
+
+def clean_scraped_frame(df, year):
+    # drop the header rows the scrape repeats for every table
+    df = df[df["Player"] != "Player"].copy()
+
+    # 'REG7' -> ('REG', '7'), 'POST2' -> ('POST', '2')
+    parts = df["Week"].str.extract(r"^(REG|POST)(\d+)$")
+    game_type = np.where(
+        parts[0] == "REG", "REG", parts[1].map(POST_GAME_TYPES).to_numpy()
+    )
+    df["game_type"] = pd.Categorical(
+        game_type, categories=["REG", "WC", "DIV", "CON", "SB"]
+    )
+    df["week"] = pd.to_numeric(parts[1], errors="coerce").astype("Int8")
+    df = df.drop(columns="Week")
+
+    # statuses: trim whitespace, blank -> missing, stored as categories
+    for column in STATUS_COLUMNS:
+        if column in df.columns:
+            status = df[column].astype("string").str.strip()
+            df[column] = status.mask(status == "").astype("category")
+    for column in ["Player", "Position", "Injury"]:
+        df[column] = df[column].astype("string").str.strip()
+    df["Position"] = df["Position"].astype("category")
+
+    # add a season column to ensure the data aligns w/ the proper year
+    df["season"] = int(year)
+    return df.reset_index(drop=True)
+
+
+# Worker: clean one season file and write its partition
+def clean_season(year, scrape_csv=SCRAPE_CSV, output_dir=OUTPUT_DIR):
+    df = pd.read_csv(scrape_csv.format(year=year), dtype=str)
+    df = clean_scraped_frame(df, year)
+
+    partition = os.path.join(output_dir, f"season={year}")
+    os.makedirs(partition, exist_ok=True)
+    tmp_path = os.path.join(partition, "part-0.parquet.tmp")
+    df.drop(columns="season").to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, os.path.join(partition, "part-0.parquet"))
+    return year, len(df)
+
+
+def clean_seasons(
+    years, scrape_csv=SCRAPE_CSV, output_dir=OUTPUT_DIR, legacy_csv=None, workers=None
+):
+    if legacy_csv and os.path.exists(legacy_csv):
+        os.remove(legacy_csv)
+
+    rows = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(clean_season, year, scrape_csv, output_dir) for year in years
+        ]
+        for future in as_completed(futures):
+            year, count = future.result()
+            rows[year] = count
+            logger.info("Cleaned %s: %s rows", year, count)
+
+    # seasons finish in any order, so the legacy CSV is written once all are done:
+    # by season, then game type and week (rows within a week keep the page order)
+    if legacy_csv:
+        for year in sorted(rows, key=int):
+            part = pd.read_parquet(
+                os.path.join(output_dir, f"season={year}", "part-0.parquet")
+            )
+            part = part.sort_values(
+                ["game_type", "week"], kind="stable", ignore_index=True
+            )
+            part["season"] = int(year)
+            part.to_csv(legacy_csv, mode="a", header=not os.path.exists(legacy_csv))
+    return rows
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    parser = argparse.ArgumentParser(description="Clean scraped injury CSVs")
+    parser.add_argument("years", nargs="+")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--csv", action="store_true", help=f"also write {LEGACY_CSV}")
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    clean_seasons(
+        args.years,
+        output_dir=args.output_dir,
+        legacy_csv=LEGACY_CSV if args.csv else None,
+        workers=args.workers,
+    )
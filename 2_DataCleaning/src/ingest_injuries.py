@@ -0,0 +1,192 @@
+"""
+# Ingest Injuries - append-only, incremental ingestion of weekly injury report drops
+# A drop (same columns as injuries.csv) is logged as-is, then merged into the latest-revision
+# table, which is partitioned by season/week so only the weeks in the drop are read (and is
+# the history 7_Deployment/injury_history.py queries with pushed-down filters). Rows are
+# keyed on (gsis_id, team, season, week); exact repeats of a date_modified are dropped and the
+# newest revision wins. The per-player aggregates (Out counts per season for feature engineering and
+# the injury category counts of load_injuries) are updated by the difference, not rebuilt.
+## Run from 2_DataCleaning: python src/ingest_injuries.py ../1_DataCollection/src/injuries.csv
+"""
+import os
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+STORE_DIR = "../data/injury_reports"
+
+# team is part of the key: a player traded mid-week is on both teams' reports
+KEY = ["gsis_id", "team", "season", "week"]
+OUT_KEY = ["gsis_id", "season"]
+COUNT_KEY = ["gsis_id", "Full Name Lower", "Injury Category"]
+ROW_GROUP_ROWS = 64
+
+
+# Same placeholder categories as key_DataCleaning.ipynb
+def injury_category(report_primary_injury):
+    return np.select(
+        [
+            report_primary_injury.isin(["Shoulder", "Arm"]),
+            report_primary_injury.isin(["Leg", "Knee"]),
+        ],
+        ["Upper Body", "Lower Body"],
+        default="Other",
+    )
+
+
+def read_drop(path):
+    drop = pd.read_csv(path, dtype={"gsis_id": str})
+    drop["date_modified"] = pd.to_datetime(drop["date_modified"], utc=True)
+    drop = drop.dropna(subset=KEY)
+    drop[["season", "week"]] = drop[["season", "week"]].astype(int)
+    # exact repeats of a revision go, then the newest revision of each key wins
+    drop = drop.drop_duplicates(KEY + ["date_modified"])
+    drop = drop.sort_values("date_modified", kind="stable")
+    return drop.drop_duplicates(KEY, keep="last")
+
+
+def _partition_path(store_dir, season, week):
+    return os.path.join(
+        store_dir, "latest", f"season={season}", f"week={week}", "part-0.parquet"
+    )
+
+
+# Partition files leave out season/week, the season=/week= directories carry them
+def _read_partition(store_dir, season, week):
+    path = _partition_path(store_dir, season, week)
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path).assign(season=season, week=week)
+
+
+# Sorted by gsis_id in small row groups, so a player lookup reads one group per week;
+# every column but date_modified is text, written as strings even when a week has none
+def _write_partition(df, store_dir, season, week):
+    df = df.drop(columns=["season", "week"]).sort_values("gsis_id", kind="stable")
+    text = df.columns.drop("date_modified")
+    df[text] = df[text].astype(object).where(df[text].notna(), None)
+    schema = pa.schema(
+        [
+            (c, pa.timestamp("ns", tz="UTC") if c == "date_modified" else pa.string())
+            for c in df.columns
+        ]
+    )
+    _write_parquet(
+        df.reset_index(drop=True),
+        _partition_path(store_dir, season, week),
+        schema=schema,
+        row_group_size=ROW_GROUP_ROWS,
+    )
+
+
+def _write_parquet(df, path, **options):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    df.to_parquet(path + ".tmp", index=False, **options)
+    os.replace(path + ".tmp", path)
+
+
+# Function to turn report rows into +/- contributions to both aggregates
+def _contributions(rows, sign):
+    out = rows.loc[rows["report_status"] == "Out", OUT_KEY].assign(Out_Count=sign)
+    counts = pd.DataFrame(
+        {
+            "gsis_id": rows["gsis_id"].to_numpy(),
+            "Full Name Lower": rows["full_name"].str.strip().str.lower().to_numpy(),
+            "Injury Category": injury_category(rows["report_primary_injury"]),
+            "Counts": sign,
+        }
+    )
+    return out, counts
+
+
+def _apply_delta(path, delta, key, value):
+    if delta.empty:
+        return
+    delta = delta.groupby(key, as_index=False)[value].sum()
+    if os.path.exists(path):
+        current = pd.read_parquet(path)
+        delta = pd.concat([current, delta]).groupby(key, as_index=False)[value].sum()
+    _write_parquet(delta[delta[value] != 0].reset_index(drop=True), path)
+
+
+# Function to ingest one weekly drop; work is proportional to the drop, not the history
+def ingest_drop(path, store_dir=STORE_DIR):
+    drop = read_drop(path)
+
+    # append-only log of every drop as received
+    log_path = os.path.join(
+        store_dir, "log", f"drop-{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}.parquet"
+    )
+    _write_parquet(drop, log_path)
+
+    removed, added = [], []
+    for (season, week), new_rows in drop.groupby(["season", "week"]):
+        old_rows = _read_partition(store_dir, season, week)
+        if old_rows is None or old_rows.empty:
+            _write_partition(new_rows, store_dir, season, week)
+            added.append(new_rows)
+            continue
+
+        combined = pd.concat(
+            [old_rows.assign(_new=False), new_rows.assign(_new=True)], ignore_index=True
+        )
+        combined = combined.sort_values(["date_modified", "_new"], kind="stable")
+        # an identical revision we already have is not an update
+        combined = combined.drop_duplicates(KEY + ["date_modified"], keep="first")
+        latest = combined.drop_duplicates(KEY, keep="last")
+
+        winners = latest[latest["_new"]]
+        replaced_keys = winners[KEY].merge(old_rows[KEY], on=KEY)
+        removed.append(old_rows.merge(replaced_keys, on=KEY))
+        added.append(winners.drop(columns="_new"))
+        _write_partition(
+            latest.drop(columns="_new").reset_index(drop=True), store_dir, season, week
+        )
+
+    out_delta, count_delta = [], []
+    for rows, sign in [(r, -1) for r in removed] + [(a, 1) for a in added]:
+        if rows.empty:
+            continue
+        out, counts = _contributions(rows, sign)
+        out_delta.append(out)
+        count_delta.append(counts)
+
+    if out_delta:
+        _apply_delta(
+            os.path.join(store_dir, "out_counts.parquet"),
+            pd.concat(out_delta),
+            OUT_KEY,
+            "Out_Count",
+        )
+        _apply_delta(
+            os.path.join(store_dir, "injury_counts.parquet"),
+            pd.concat(count_delta),
+            COUNT_KEY,
+            "Counts",
+        )
+
+    return {
+        "rows_in_drop": len(drop),
+        "rows_added": int(sum(len(a) for a in added)),
+        "rows_replaced": int(sum(len(r) for r in removed)),
+    }
+
+
+def read_latest(store_dir=STORE_DIR):
+    latest = pd.read_parquet(os.path.join(store_dir, "latest"))
+    latest[["season", "week"]] = latest[["season", "week"]].astype(int)
+    return latest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest weekly injury report drops")
+    parser.add_argument("drops", nargs="+", help="CSV files in injuries.csv format")
+    parser.add_argument("--store-dir", default=STORE_DIR)
+    args = parser.parse_args()
+
+    for drop_path in args.drops:
+        stats = ingest_drop(drop_path, args.store_dir)
+        print(f"{drop_path}: {stats}")
@@ -0,0 +1,110 @@
+"""
+# Join Injury Plays - InjuryRecord.csv joined to the play it happened on, in one keyed pass
+# Replaces the two merges of injury_EDA/cleaning_and_eda.ipynb. PlayList.csv is streamed in
+# chunks with only the columns the output needs (categorical dtypes for the text columns) and
+# only the plays of injured games are kept, so memory stays close to the size of the output.
+# Injuries without a PlayKey get the first play of their game from a per-game lookup instead of
+# merging every play of the game and deduplicating. Writes the inj_ind.csv the app reads.
+# On the Kaggle data the output is the notebook's 105 rows, row for row: the notebook's
+# drop_duplicates('GameID') would only lose rows if a game had two key-less injuries, and none does.
+## Run from 2_DataCleaning: python src/join_injury_plays.py [--output ../7_Deployment/src/inj_ind.csv]
+"""
+import os
+import argparse
+
+import pandas as pd
+
+SURFACE_DIR = "../data_planB/nfl-playing-surface-analytics"
+INJURY_RECORD_CSV = os.path.join(SURFACE_DIR, "InjuryRecord.csv")
+PLAYLIST_CSV = os.path.join(SURFACE_DIR, "PlayList.csv")
+INJ_IND_CSV = "../7_Deployment/src/inj_ind.csv"
+
+CHUNK_ROWS = 100_000
+
+INJURY_COLUMNS = [
+    "PlayerKey",
+    "GameID",
+    "PlayKey",
+    "BodyPart",
+    "Surface",
+    "DM_M1",
+    "DM_M7",
+    "DM_M28",
+    "DM_M42",
+]
+# RosterPosition and Position are left out like in the notebook
+PLAY_DTYPES = {
+    "GameID": "string",
+    "PlayKey": "string",
+    "PlayerDay": "Int16",
+    "PlayerGame": "Int16",
+    "StadiumType": "category",
+    "FieldType": "category",
+    "Temperature": "Int16",
+    "Weather": "category",
+    "PlayType": "category",
+    "PlayerGamePlay": "Int16",
+    "PositionGroup": "category",
+}
+PLAY_COLUMNS = [c for c in PLAY_DTYPES if c not in ("GameID", "PlayKey")]
+
+
+def read_injuries(path=INJURY_RECORD_CSV):
+    injuries = pd.read_csv(path, usecols=INJURY_COLUMNS)
+    injuries["Severe"] = injuries["DM_M42"].astype(int)
+    return injuries
+
+
+# Function to keep only the plays of the given games, one chunk of PlayList at a time
+def read_injured_games(game_ids, path=PLAYLIST_CSV, chunk_rows=CHUNK_ROWS):
+    game_ids = set(game_ids)
+    kept = []
+    with pd.read_csv(
+        path, usecols=list(PLAY_DTYPES), dtype=PLAY_DTYPES, chunksize=chunk_rows
+    ) as reader:
+        for chunk in reader:
+            kept.append(chunk[chunk["GameID"].isin(game_ids)])
+    plays = pd.concat(kept, ignore_index=True)
+    # concat of chunks with different categories falls back to object, restore them
+    return plays.astype({c: t for c, t in PLAY_DTYPES.items() if t == "category"})
+
+
+# Function to attach each injury's play; key-less injuries use their game's first play
+def join_injury_plays(injuries, plays):
+    by_play_key = plays.set_index("PlayKey")
+    first_play = (
+        plays.sort_values("PlayerGamePlay", kind="stable")
+        .drop_duplicates("GameID")
+        .set_index("GameID")["PlayKey"]
+    )
+
+    play_key = injuries["PlayKey"].fillna(injuries["GameID"].map(first_play))
+    matched = by_play_key.reindex(play_key)[PLAY_COLUMNS].reset_index(drop=True)
+    joined = pd.concat(
+        [injuries.drop(columns="PlayKey").reset_index(drop=True), matched], axis=1
+    )
+    joined.insert(2, "PlayKey", play_key.to_numpy())
+
+    # key-less rows after the keyed ones, matching the notebook's concat order; a second
+    # key-less injury in the same game is kept here, where the notebook would drop it
+    keyed = injuries["PlayKey"].notna().to_numpy()
+    return pd.concat([joined[keyed], joined[~keyed]], ignore_index=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Join injuries to their plays")
+    parser.add_argument("--injuries", default=INJURY_RECORD_CSV)
+    parser.add_argument("--plays", default=PLAYLIST_CSV)
+    parser.add_argument("--output", default=INJ_IND_CSV)
+    args = parser.parse_args()
+
+    injuries = read_injuries(args.injuries)
+    plays = read_injured_games(injuries["GameID"], args.plays)
+    inj_ind = join_injury_plays(injuries, plays)
+
+    inj_ind.to_csv(args.output + ".tmp", index=False)
+    os.replace(args.output + ".tmp", args.output)
+    missing = inj_ind["PlayerGamePlay"].isna().sum()
+    print(
+        f"{len(inj_ind)} injuries from {len(plays)} plays ({missing} unmatched) -> {args.output}"
+    )
@@ -0,0 +1,151 @@
+"""
+# Build Features - one row per player with per-season Out counts and the target label
+# Replaces the per-season filter / groupby / merge cells of FeatureEngineering_main.ipynb
+# with a single (gsis_id, season) pivot, so any season range is one pass over the data.
+## Run from 4_FeatureEngineering: python src/build_features.py --seasons 2020 2022
+"""
+import os
+import argparse
+
+import numpy as np
+import pandas as pd
+
+MERGED_CSV = "../2_DataCleaning/cleaned_data/clean_merged_data.csv"
+# weekly report store of 2_DataCleaning/src/ingest_injuries.py, which keeps
+# out_counts.parquet (gsis_id, season, Out_Count) up to date drop by drop
+REPORT_STORE_DIR = "../data/injury_reports"
+MODELING_CSV = "../5_ModelDevelopment/src/player_modeling_data.csv"
+
+# Columns the notebook drops before modeling
+DROP_COLUMNS = [
+    "season",
+    "season_20",
+    "season_21",
+    "season_x",
+    "status",
+    "birth_date",
+    "report_secondary_injury",
+    "practice_primary_injury",
+    "practice_secondary_injury",
+    "report_status_x",
+    "practice_status_x",
+    "days_since_last_injury",
+    "previous_injuries_count",
+]
+
+
+# Function to put every row's season in one column
+def derive_season(df):
+    if "season" in df.columns:
+        return pd.to_numeric(df["season"], errors="coerce")
+    # clean_merged_data keeps the scraped 2020/2021 rows in their own columns,
+    # everything else is the 2022 injury report ('season_x')
+    season = df["season_x"].copy()
+    if "season_20" in df.columns:
+        season = season.mask(df["season_20"] == 2020, 2020)
+    if "season_21" in df.columns:
+        season = season.mask(df["season_21"] == 2021, 2021)
+    return pd.to_numeric(season, errors="coerce")
+
+
+# Function to count 'Out' reports per player and season in a single grouped pass
+def out_counts_by_season(df, seasons):
+    season = derive_season(df)
+    in_range = season.isin(seasons).to_numpy()
+    is_out = (df["report_status_x"] == "Out").to_numpy(dtype=np.int64)[in_range]
+    ids = df["gsis_id"].to_numpy()[in_range]
+
+    counts = (
+        pd.Series(is_out)
+        .groupby([ids, season.to_numpy()[in_range].astype(int)])
+        .sum()
+        .unstack(fill_value=0)
+        .reindex(columns=seasons, fill_value=0)
+    )
+    counts.columns = [f"Out_Count_{s}" for s in seasons]
+    counts.index.name = "gsis_id"
+    return counts
+
+
+# Function to read the ingested Out counts in the same shape as out_counts_by_season
+def read_out_counts(seasons, store_dir=REPORT_STORE_DIR):
+    # A season that was never ingested would otherwise come back as all-zero Out counts
+    missing = [
+        s
+        for s in seasons
+        if not os.path.isdir(os.path.join(store_dir, "latest", f"season={s}"))
+    ]
+    if missing:
+        raise ValueError(
+            f"No ingested reports for season(s) {missing} under {store_dir}/latest; "
+            "ingest them or narrow --seasons instead of counting them as 0"
+        )
+    out = pd.read_parquet(
+        os.path.join(store_dir, "out_counts.parquet"),
+        filters=[("season", "in", list(seasons))],
+    )
+    counts = (
+        out.groupby(["gsis_id", out["season"].astype(int)])["Out_Count"]
+        .sum()
+        .unstack(fill_value=0)
+        .reindex(columns=seasons, fill_value=0)
+    )
+    counts.columns = [f"Out_Count_{s}" for s in seasons]
+    counts.index.name = "gsis_id"
+    return counts
+
+
+# Out counts are `out_counts` (see read_out_counts) when given, otherwise counted from df
+def build_player_features(df, seasons, target_season=None, out_counts=None):
+    seasons = sorted(seasons)
+    target_season = target_season or seasons[-1]
+
+    # Last known attributes per player
+    df = df.drop(columns=["Unnamed: 0"], errors="ignore")
+    players = df.groupby("gsis_id", as_index=False).last().sort_values("gsis_id")
+
+    if out_counts is None:
+        counts = out_counts_by_season(df, seasons)
+    else:
+        counts = out_counts.reindex(columns=[f"Out_Count_{s}" for s in seasons])
+        counts = counts.fillna(0).astype(int)
+    counts.insert(0, "Out_Count", counts.sum(axis=1))
+    counts[f"Injured_in_{target_season}"] = (
+        counts[f"Out_Count_{target_season}"] > 0
+    ).astype(int)
+
+    # One join; players without any report in range get zeros
+    features = players.join(counts, on="gsis_id")
+    features[counts.columns] = features[counts.columns].fillna(0)
+    return features.drop(columns=DROP_COLUMNS, errors="ignore").reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the player modeling table")
+    parser.add_argument("--input", default=MERGED_CSV)
+    parser.add_argument("--output", default=MODELING_CSV)
+    parser.add_argument(
+        "--seasons",
+        nargs=2,
+        type=int,
+        default=[2020, 2022],
+        metavar=("FIRST", "LAST"),
+        help="inclusive season range",
+    )
+    parser.add_argument("--target-season", type=int)
+    parser.add_argument(
+        "--reports",
+        nargs="?",
+        const=REPORT_STORE_DIR,
+        help="take the Out counts the report store keeps instead of recounting --input",
+    )
+    args = parser.parse_args()
+
+    merged = pd.read_csv(args.input)
+    seasons = list(range(args.seasons[0], args.seasons[1] + 1))
+    out_counts = read_out_counts(seasons, args.reports) if args.reports else None
+    modeling_df = build_player_features(merged, seasons, args.target_season, out_counts)
+    modeling_df.to_csv(args.output)
+    print(
+        f"{modeling_df.shape[0]} players x {modeling_df.shape[1]} columns -> {args.output}"
+    )
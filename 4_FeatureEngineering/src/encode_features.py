@@ -0,0 +1,98 @@
+"""
+# Encode Features - sparse one-hot / scaled encoding of the player modeling table
+# Replaces pd.get_dummies + the dense encoded CSV: the encoder keeps a fitted vocabulary
+# (unseen injury strings at scoring time are ignored instead of breaking the columns) and
+# the encoded matrix is saved as a compressed scipy CSR .npz next to a small Parquet of ids.
+## Run from 4_FeatureEngineering: python src/encode_features.py
+"""
+import os
+import json
+import argparse
+
+import joblib
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.compose import ColumnTransformer
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+MODELING_CSV = "../5_ModelDevelopment/src/player_modeling_data.csv"
+FEATURES_DIR = "./features"
+
+CATEGORICAL = ["position_x_x", "injury_category", "report_primary_injury_x"]
+NUMERIC_BASE = ["height", "weight", "age_at_injury", "years_exp"]
+ID_COLUMNS = ["gsis_id", "full_name", "team_x"]
+
+
+def target_column(df):
+    targets = sorted(c for c in df.columns if c.startswith("Injured_in_"))
+    return targets[-1]
+
+
+# Numeric features are the player attributes plus the Out counts before the target season
+def numeric_columns(df, target):
+    target_season = target.rsplit("_", 1)[1]
+    prior_counts = sorted(
+        c
+        for c in df.columns
+        if c.startswith("Out_Count_") and c.rsplit("_", 1)[1] < target_season
+    )
+    return [c for c in NUMERIC_BASE if c in df.columns] + prior_counts
+
+
+def build_encoder(categorical, numeric):
+    return ColumnTransformer(
+        [
+            (
+                "onehot",
+                OneHotEncoder(handle_unknown="ignore", dtype=np.float32),
+                categorical,
+            ),
+            ("scale", StandardScaler(), numeric),
+        ],
+        # always hand back a sparse matrix, however dense the numeric block is
+        sparse_threshold=1.0,
+    )
+
+
+def encode(df, target=None):
+    df = df.drop(columns=["Unnamed: 0"], errors="ignore")
+    target = target or target_column(df)
+    numeric = numeric_columns(df, target)
+    # rows with missing numeric values are dropped, as in the modeling notebook
+    df = df.dropna(subset=numeric + [target]).reset_index(drop=True)
+    df[CATEGORICAL] = df[CATEGORICAL].astype(object)
+
+    encoder = build_encoder(CATEGORICAL, numeric)
+    X = sp.csr_matrix(encoder.fit_transform(df[CATEGORICAL + numeric]))
+    meta = df[ID_COLUMNS + [target]].copy()
+    return encoder, X, meta, {"categorical": CATEGORICAL, "numeric": numeric}
+
+
+def save_features(encoder, X, meta, columns, features_dir=FEATURES_DIR):
+    os.makedirs(features_dir, exist_ok=True)
+    sp.save_npz(os.path.join(features_dir, "player_features.npz"), X, compressed=True)
+    meta.to_parquet(os.path.join(features_dir, "player_features_meta.parquet"))
+    joblib.dump(encoder, os.path.join(features_dir, "encoder.joblib"))
+
+    info = dict(columns)
+    info["target"] = meta.columns[-1]
+    info["feature_names"] = encoder.get_feature_names_out().tolist()
+    info["shape"] = list(X.shape)
+    info["nnz"] = int(X.nnz)
+    with open(os.path.join(features_dir, "encoder.json"), "w") as f:
+        json.dump(info, f, indent=2)
+    return info
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Encode the player modeling table")
+    parser.add_argument("--input", default=MODELING_CSV)
+    parser.add_argument("--output-dir", default=FEATURES_DIR)
+    parser.add_argument("--target")
+    args = parser.parse_args()
+
+    encoder, X, meta, columns = encode(pd.read_csv(args.input), args.target)
+    info = save_features(encoder, X, meta, columns, args.output_dir)
+    density = info["nnz"] / max(1, X.shape[0] * X.shape[1])
+    print(f"{X.shape[0]} x {X.shape[1]} sparse matrix, {info['nnz']} non-zeros ({density:.1%})")
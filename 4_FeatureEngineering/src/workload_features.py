@@ -0,0 +1,272 @@
+"""
+# Workload Features - per-player, per-week workload from the Big Data Bowl tracking parquet
+# The tracking file is never loaded whole: each week's row groups are read one at a time with
+# only the columns needed, reduced to per-(game, player, play) sums and then to per-player totals.
+# Weeks run on a process pool, so peak memory is one row group plus one week of aggregates no
+# matter how many weeks are processed. Output: snaps, distance, high-speed and sprint distance,
+# top speed and high-acceleration time per player and week, keyed by nflId and gameId.
+# When ../data/game_weather.parquet exists (7_Deployment/weather_features.py), each player-week
+# also gets its game's kickoff temperature, precipitation, wind and indoor flag.
+## Run from 4_FeatureEngineering: python src/workload_features.py [--weeks 1 9] [--workers 4]
+"""
+import os
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+TRACKING_PARQ = "../data/tracking_all_weeks.parq"
+GAMES_PARQ = "../data/games.parq"
+WORKLOAD_PARQUET = "./features/player_week_workload.parquet"
+GAME_WEATHER_PARQUET = "../data/game_weather.parquet"
+WEATHER_COLUMNS = ["Kickoff_Temp_F", "Kickoff_Precip_mm", "Kickoff_Wind_mph", "Indoors"]
+
+# Tracking speeds are yards/second and frames are 0.1 s apart
+FRAME_SECONDS = 0.1
+HIGH_SPEED_YPS = 5.5  # ~11 mph
+SPRINT_YPS = 7.0  # ~14 mph
+HIGH_ACCEL_YPS2 = 3.0
+FOOTBALL_ID = -999
+
+READ_COLUMNS = ["gameId", "playId", "nflId", "s", "a", "dis"]
+
+
+##########################################
+##  Row Groups                          ##
+##########################################
+
+
+def _week_lookup(games_path=GAMES_PARQ):
+    games = pd.read_parquet(games_path, columns=["gameId", "week"])
+    return pd.Series(games["week"].to_numpy(), index=games["gameId"].to_numpy())
+
+
+def _column_range(row_group, name):
+    for i in range(row_group.num_columns):
+        column = row_group.column(i)
+        if column.path_in_schema == name and column.is_stats_set:
+            stats = column.statistics
+            if stats.has_min_max:
+                return stats.min, stats.max
+    return None
+
+
+# Function to map each week to the row groups that can hold its frames (from footer statistics)
+def plan_weeks(tracking_path=TRACKING_PARQ, games_path=GAMES_PARQ, weeks=None):
+    parquet = pq.ParquetFile(tracking_path)
+    names = parquet.schema_arrow.names
+    lookup = _week_lookup(games_path)
+    all_weeks = sorted(lookup.unique()) if weeks is None else list(weeks)
+    plan = {week: [] for week in all_weeks}
+    for i in range(parquet.metadata.num_row_groups):
+        row_group = parquet.metadata.row_group(i)
+        span = None
+        if "tracking_week" in names:
+            span = _column_range(row_group, "tracking_week")
+        else:
+            games = _column_range(row_group, "gameId")
+            if games is not None:
+                in_span = lookup[
+                    (lookup.index >= games[0]) & (lookup.index <= games[1])
+                ]
+                span = (in_span.min(), in_span.max()) if len(in_span) else None
+        for week in plan:
+            # without statistics every week has to look at the row group
+            if span is None or span[0] <= week <= span[1]:
+                plan[week].append(i)
+    return plan
+
+
+##########################################
+##  Aggregation                         ##
+##########################################
+
+
+# Function to reduce one chunk of frames to per-(game, player, play) sums
+def play_workload(frames):
+    frames = frames[frames["nflId"] != FOOTBALL_ID]
+    speed = frames["s"].to_numpy()
+    distance = frames["dis"].to_numpy()
+    chunk = pd.DataFrame(
+        {
+            "gameId": frames["gameId"].to_numpy(),
+            "nflId": frames["nflId"].to_numpy(),
+            "playId": frames["playId"].to_numpy(),
+            "frames": np.ones(len(frames), dtype=np.int32),
+            "distance_yd": distance,
+            "high_speed_yd": np.where(speed >= HIGH_SPEED_YPS, distance, 0.0),
+            "sprint_yd": np.where(speed >= SPRINT_YPS, distance, 0.0),
+            "max_speed_yps": speed,
+            "high_accel_frames": (frames["a"].to_numpy() >= HIGH_ACCEL_YPS2).astype(
+                np.int32
+            ),
+        }
+    )
+    return chunk.groupby(["gameId", "nflId", "playId"], sort=False).agg(
+        frames=("frames", "sum"),
+        distance_yd=("distance_yd", "sum"),
+        high_speed_yd=("high_speed_yd", "sum"),
+        sprint_yd=("sprint_yd", "sum"),
+        max_speed_yps=("max_speed_yps", "max"),
+        high_accel_frames=("high_accel_frames", "sum"),
+    )
+
+
+# Function to combine partial play sums; a play split across row groups is merged here
+def _combine(partials):
+    return (
+        pd.concat(partials)
+        .groupby(level=["gameId", "nflId", "playId"], sort=False)
+        .agg(
+            {
+                "frames": "sum",
+                "distance_yd": "sum",
+                "high_speed_yd": "sum",
+                "sprint_yd": "sum",
+                "max_speed_yps": "max",
+                "high_accel_frames": "sum",
+            }
+        )
+    )
+
+
+# Worker: stream one week's row groups and return its per-player totals
+def week_workload(tracking_path, week, row_groups, games_path=GAMES_PARQ):
+    parquet = pq.ParquetFile(tracking_path)
+    names = parquet.schema_arrow.names
+    columns = READ_COLUMNS + (["tracking_week"] if "tracking_week" in names else [])
+    week_games = None
+    if "tracking_week" not in names:
+        lookup = _week_lookup(games_path)
+        week_games = lookup.index[lookup == week].to_numpy()
+
+    partials = []
+    for i in row_groups:
+        frames = parquet.read_row_group(i, columns=columns).to_pandas()
+        if "tracking_week" in frames.columns:
+            frames = frames[frames["tracking_week"] == week]
+        else:
+            frames = frames[frames["gameId"].isin(week_games)]
+        if frames.empty:
+            continue
+        partials.append(play_workload(frames))
+        del frames
+
+    if not partials:
+        return None
+    plays = _combine(partials).reset_index()
+    players = plays.groupby(["gameId", "nflId"], sort=False).agg(
+        snaps=("playId", "nunique"),
+        frames=("frames", "sum"),
+        distance_yd=("distance_yd", "sum"),
+        high_speed_yd=("high_speed_yd", "sum"),
+        sprint_yd=("sprint_yd", "sum"),
+        max_speed_yps=("max_speed_yps", "max"),
+        high_accel_frames=("high_accel_frames", "sum"),
+    )
+    players = players.reset_index()
+    players.insert(0, "week", np.int16(week))
+    return players
+
+
+def compact(workload):
+    workload["seconds_tracked"] = (workload.pop("frames") * FRAME_SECONDS).astype(
+        "float32"
+    )
+    workload["high_accel_seconds"] = (
+        workload.pop("high_accel_frames") * FRAME_SECONDS
+    ).astype("float32")
+    workload = workload.astype(
+        {
+            "week": "int16",
+            "gameId": "int64",
+            "nflId": "int32",
+            "snaps": "int16",
+            "distance_yd": "float32",
+            "high_speed_yd": "float32",
+            "sprint_yd": "float32",
+            "max_speed_yps": "float32",
+        }
+    )
+    return workload.sort_values(["nflId", "week"]).reset_index(drop=True)
+
+
+# Function to attach each game's kickoff weather; player-weeks without it stay missing
+def add_game_weather(workload, game_weather_path=GAME_WEATHER_PARQUET):
+    if not game_weather_path or not os.path.exists(game_weather_path):
+        return workload
+    weather = pd.read_parquet(game_weather_path, columns=["Game ID"] + WEATHER_COLUMNS)
+    weather = weather.rename(columns={"Game ID": "gameId"}).astype(
+        {
+            "gameId": "int64",
+            "Kickoff_Temp_F": "float32",
+            "Kickoff_Precip_mm": "float32",
+            "Kickoff_Wind_mph": "float32",
+            "Indoors": "boolean",
+        }
+    )
+    return workload.merge(weather, on="gameId", how="left")
+
+
+def build_workload(
+    tracking_path=TRACKING_PARQ,
+    games_path=GAMES_PARQ,
+    output=WORKLOAD_PARQUET,
+    weeks=None,
+    workers=None,
+    game_weather_path=GAME_WEATHER_PARQUET,
+):
+    plan = plan_weeks(tracking_path, games_path, weeks)
+    plan = {week: groups for week, groups in plan.items() if groups}
+    workers = min(workers or os.cpu_count() or 1, max(len(plan), 1))
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(week_workload, tracking_path, week, groups, games_path): week
+            for week, groups in plan.items()
+        }
+        for future in futures:
+            result = future.result()
+            if result is not None:
+                results.append(result)
+    if not results:
+        raise ValueError(f"No tracking frames found for weeks {sorted(plan)}")
+
+    workload = compact(pd.concat(results, ignore_index=True))
+    workload = add_game_weather(workload, game_weather_path)
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    workload.to_parquet(output + ".tmp", index=False)
+    os.replace(output + ".tmp", output)
+    return workload
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-player weekly workload features")
+    parser.add_argument("--input", default=TRACKING_PARQ)
+    parser.add_argument("--games", default=GAMES_PARQ)
+    parser.add_argument("--output", default=WORKLOAD_PARQUET)
+    parser.add_argument(
+        "--weeks",
+        nargs=2,
+        type=int,
+        metavar=("FIRST", "LAST"),
+        help="inclusive week range (default: every week in games.parq)",
+    )
+    parser.add_argument("--workers", type=int)
+    parser.add_argument(
+        "--game-weather",
+        default=GAME_WEATHER_PARQUET,
+        help="kickoff weather per game to join on (skipped if the file is missing)",
+    )
+    args = parser.parse_args()
+
+    weeks = range(args.weeks[0], args.weeks[1] + 1) if args.weeks else None
+    workload = build_workload(
+        args.input, args.games, args.output, weeks, args.workers, args.game_weather
+    )
+    print(
+        f"{len(workload)} player-weeks, {workload['nflId'].nunique()} players -> {args.output}"
+    )
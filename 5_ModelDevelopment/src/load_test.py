@@ -0,0 +1,128 @@
+"""
+# Load Test - sustained requests/sec against the local scoring service (serve_model.py)
+# Runs N client threads for a fixed time, each posting single-player /score requests with a
+# mix of plain gsis_id lookups and hypothetical overrides, then prints client-side throughput
+# and latency next to the service's own /metrics.
+## Run from 5_ModelDevelopment (service running): python src/load_test.py [--clients 32] [--seconds 10]
+"""
+import json
+import time
+import argparse
+import threading
+import http.client
+
+import numpy as np
+import pandas as pd
+
+PLAYERS_CSV = "./src/player_modeling_data.csv"
+
+
+# Function to build request bodies: a player as-is, or with weight/age nudged
+def request_bodies(players_csv=PLAYERS_CSV, n=5000, override_share=0.5, seed=42):
+    rng = np.random.default_rng(seed)
+    players = pd.read_csv(players_csv, usecols=["gsis_id", "weight", "age_at_injury"])
+    picks = players.iloc[rng.integers(0, len(players), n)]
+    bodies = []
+    for gsis_id, weight, age, hypothetical in zip(
+        picks["gsis_id"],
+        picks["weight"],
+        picks["age_at_injury"],
+        rng.random(n) < override_share,
+    ):
+        body = {"gsis_id": gsis_id}
+        if hypothetical and pd.notna(weight) and pd.notna(age):
+            body["overrides"] = {
+                "weight": float(weight + rng.integers(-15, 16)),
+                "age_at_injury": float(age + rng.integers(0, 3)),
+            }
+        bodies.append(json.dumps(body).encode())
+    return bodies
+
+
+def _client(host, port, bodies, stop_at, latencies, errors):
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    i = 0
+    while time.perf_counter() < stop_at:
+        body = bodies[i % len(bodies)]
+        i += 1
+        start = time.perf_counter()
+        try:
+            conn.request("POST", "/score", body, {"Content-Type": "application/json"})
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(repr(e))
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=10)
+            continue
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+
+
+def run_load_test(host="127.0.0.1", port=8765, clients=32, seconds=10.0, bodies=None):
+    bodies = bodies or request_bodies()
+    latencies, errors = [], []
+    stop_at = time.perf_counter() + seconds
+    threads = [
+        threading.Thread(
+            target=_client,
+            args=(host, port, bodies[i::clients], stop_at, latencies, errors),
+        )
+        for i in range(clients)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latency_ms = np.array(latencies) * 1e3
+    p50, p95, p99 = (
+        np.percentile(latency_ms, [50, 95, 99]) if len(latency_ms) else [np.nan] * 3
+    )
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": elapsed,
+        "requests_per_sec": len(latencies) / elapsed,
+        "p50_ms": p50,
+        "p95_ms": p95,
+        "p99_ms": p99,
+    }
+
+
+def service_metrics(host="127.0.0.1", port=8765):
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    conn.request("GET", "/metrics")
+    metrics = json.loads(conn.getresponse().read())
+    conn.close()
+    return metrics
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the scoring service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--players", default=PLAYERS_CSV)
+    args = parser.parse_args()
+
+    result = run_load_test(
+        args.host,
+        args.port,
+        args.clients,
+        args.seconds,
+        request_bodies(args.players),
+    )
+    print(
+        f"{result['requests']:,} requests in {result['seconds']:.1f}s "
+        f"({result['requests_per_sec']:,.0f} req/sec, {result['errors']} errors), "
+        f"latency p50 {result['p50_ms']:.1f} ms / p95 {result['p95_ms']:.1f} ms / "
+        f"p99 {result['p99_ms']:.1f} ms"
+    )
+    print(json.dumps(service_metrics(args.host, args.port), indent=2))
@@ -0,0 +1,69 @@
+"""
+# Model Store - versioned, serialized injury model pipelines in 5_ModelDevelopment/models
+# Each save writes injury_model_v<N>.joblib (the fitted sklearn Pipeline) and a matching
+# injury_model_v<N>.json with the input columns, target and any metrics.
+## Paths are relative to 5_ModelDevelopment, the same as the modeling notebook
+"""
+import os
+import re
+import json
+import time
+
+import joblib
+import sklearn
+
+MODELS_DIR = "./models"
+MODEL_PREFIX = "injury_model"
+
+TARGET = "Injured_in_2022"
+
+
+def list_versions(models_dir=MODELS_DIR):
+    if not os.path.isdir(models_dir):
+        return []
+    pattern = re.compile(rf"^{MODEL_PREFIX}_v(\d+)\.joblib$")
+    versions = [pattern.match(f) for f in os.listdir(models_dir)]
+    return sorted(int(m.group(1)) for m in versions if m)
+
+
+def _paths(version, models_dir):
+    base = os.path.join(models_dir, f"{MODEL_PREFIX}_v{version}")
+    return base + ".joblib", base + ".json"
+
+
+# Function to save a fitted pipeline as the next version
+def save_model(pipeline, features, metadata=None, models_dir=MODELS_DIR):
+    os.makedirs(models_dir, exist_ok=True)
+    versions = list_versions(models_dir)
+    version = versions[-1] + 1 if versions else 1
+    model_path, meta_path = _paths(version, models_dir)
+
+    meta = {
+        "version": version,
+        "features": list(features),
+        "target": TARGET,
+        "saved_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sklearn_version": sklearn.__version__,
+    }
+    meta.update(metadata or {})
+
+    # Write to temp names first so a reader never picks up a half-written version
+    joblib.dump(pipeline, model_path + ".tmp")
+    with open(meta_path + ".tmp", "w") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(meta_path + ".tmp", meta_path)
+    os.replace(model_path + ".tmp", model_path)
+    return version
+
+
+# Function to load a version (latest by default) as (pipeline, metadata)
+def load_model(version=None, models_dir=MODELS_DIR):
+    if version is None:
+        versions = list_versions(models_dir)
+        if not versions:
+            raise FileNotFoundError(f"No saved injury model in {models_dir}")
+        version = versions[-1]
+    model_path, meta_path = _paths(version, models_dir)
+    with open(meta_path) as f:
+        meta = json.load(f)
+    return joblib.load(model_path), meta
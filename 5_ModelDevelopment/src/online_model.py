@@ -0,0 +1,296 @@
+"""
+# Online Model - weekly incremental updates of the injury model instead of a full retrain
+# The model is the same encoder + classifier Pipeline as train_model.py, with an SGD logistic
+# regression so it can learn with partial_fit. Each week's player-week rows are streamed in
+# chunks and the classifier takes one partial_fit step per chunk, so an update costs the size
+# of the week, not the history. The encoder (and its StandardScaler) stays frozen at the
+# bootstrap snapshot, since moving the scaling would put stale weights on shifted inputs;
+# rebuild the features and bootstrap again to pick up a new scaling. Before learning, the
+# current checkpoint scores the week (prequential log loss). Every update is saved as a new
+# version in models/online through model_store, CURRENT.json names the active one and
+# rollback moves it back without deleting anything.
+## Run from 5_ModelDevelopment: python src/online_model.py bootstrap
+##   python src/online_model.py update week.parquet --season 2023 --week 5
+##   python src/online_model.py rollback [--to N]
+"""
+import os
+import json
+import time
+import argparse
+
+import numpy as np
+from sklearn.pipeline import Pipeline
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import log_loss
+
+from model_store import save_model, load_model, list_versions
+from score_model import read_chunks
+from train_model import load_training_data, FEATURES_DIR
+
+ONLINE_DIR = "./models/online"
+CURRENT_JSON = "CURRENT.json"
+
+CHUNK_ROWS = 50_000
+BOOTSTRAP_EPOCHS = 5
+KEEP_CHECKPOINTS = 20
+CLASSES = np.array([0, 1])
+# Fields save_model stamps itself; inherited copies would overwrite the fresh values
+STAMPED_FIELDS = ("version", "features", "saved_at", "sklearn_version")
+
+
+def build_online_model(random_state=42):
+    return SGDClassifier(loss="log_loss", alpha=1e-3, random_state=random_state)
+
+
+##########################################
+##  Checkpoints                         ##
+##########################################
+
+
+def current_version(online_dir=ONLINE_DIR):
+    path = os.path.join(online_dir, CURRENT_JSON)
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)["version"]
+    versions = list_versions(online_dir)
+    return versions[-1] if versions else None
+
+
+def set_current(version, online_dir=ONLINE_DIR):
+    path = os.path.join(online_dir, CURRENT_JSON)
+    with open(path + ".tmp", "w") as f:
+        json.dump({"version": version, "set_at": time.strftime("%Y-%m-%dT%H:%M:%S")}, f)
+    os.replace(path + ".tmp", path)
+
+
+def load_current(online_dir=ONLINE_DIR):
+    version = current_version(online_dir)
+    if version is None:
+        raise FileNotFoundError(
+            f"No online checkpoint in {online_dir}, run bootstrap first"
+        )
+    return load_model(version, online_dir)
+
+
+def _checkpoint(pipeline, meta, online_dir, keep):
+    version = save_model(
+        pipeline,
+        meta["features"],
+        {k: v for k, v in meta.items() if k not in STAMPED_FIELDS},
+        online_dir,
+    )
+    set_current(version, online_dir)
+    prune_checkpoints(keep, online_dir)
+    return version
+
+
+# Function to drop the oldest checkpoints beyond `keep`, never the active one
+def prune_checkpoints(keep=KEEP_CHECKPOINTS, online_dir=ONLINE_DIR):
+    current = current_version(online_dir)
+    for version in list_versions(online_dir)[:-keep]:
+        if version == current:
+            continue
+        base = os.path.join(online_dir, f"injury_model_v{version}")
+        for path in [base + ".joblib", base + ".json"]:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+# Function to make an earlier checkpoint active again (the previous one by default)
+def rollback(to=None, online_dir=ONLINE_DIR):
+    versions = list_versions(online_dir)
+    current = current_version(online_dir)
+    if to is None:
+        earlier = [v for v in versions if v < current]
+        if not earlier:
+            raise ValueError(f"No checkpoint before v{current} to roll back to")
+        to = earlier[-1]
+    if to not in versions:
+        raise ValueError(f"No online checkpoint v{to} in {online_dir}")
+    set_current(to, online_dir)
+    return to
+
+
+##########################################
+##  Learning                            ##
+##########################################
+
+
+# Function to start the online model from the current training snapshot
+def bootstrap(
+    features_dir=FEATURES_DIR,
+    online_dir=ONLINE_DIR,
+    epochs=BOOTSTRAP_EPOCHS,
+    random_state=42,
+    keep=KEEP_CHECKPOINTS,
+):
+    X, y, encoder, info = load_training_data(features_dir)
+    model = build_online_model(random_state)
+    rng = np.random.default_rng(random_state)
+    for _ in range(epochs):
+        order = rng.permutation(X.shape[0])
+        for start in range(0, len(order), CHUNK_ROWS):
+            rows = order[start : start + CHUNK_ROWS]
+            model.partial_fit(X[rows], y[rows], classes=CLASSES)
+
+    # the snapshot's encoder is kept as fitted; updates never refit or extend it
+    pipeline = Pipeline([("encode", encoder), ("logr", model)])
+    meta = {
+        "features": info["categorical"] + info["numeric"],
+        "numeric_features": info["numeric"],
+        "target": info["target"],
+        "parent_version": None,
+        "rows": X.shape[0],
+        "rows_seen": X.shape[0],
+        "weeks_applied": [],
+        "random_state": random_state,
+    }
+    return _checkpoint(pipeline, meta, online_dir, keep)
+
+
+def _week_loss(pipeline, X, y):
+    probability = pipeline.predict_proba(X)[:, 1]
+    return (
+        log_loss(y, probability, labels=CLASSES) * len(y),
+        ((probability >= 0.5) == y).sum(),
+    )
+
+
+# Function to learn one week of player-week rows and save the result as a new checkpoint
+def update_week(
+    path,
+    season,
+    week,
+    online_dir=ONLINE_DIR,
+    target=None,
+    force=False,
+    chunk_rows=CHUNK_ROWS,
+    keep=KEEP_CHECKPOINTS,
+):
+    start_time = time.perf_counter()
+    pipeline, meta = load_current(online_dir)
+    if [season, week] in meta["weeks_applied"] and not force:
+        raise ValueError(
+            f"{season} week {week} is already in v{meta['version']}, "
+            "use --force to apply it again"
+        )
+
+    features = meta["features"]
+    numeric = meta["numeric_features"]
+    categorical = [c for c in features if c not in numeric]
+    target = target or meta["target"]
+    model = pipeline.named_steps["logr"]
+
+    rows = skipped = correct = 0
+    loss = 0.0
+    for chunk in read_chunks(path, features + [target], chunk_rows):
+        missing = set(features + [target]) - set(chunk.columns)
+        if missing:
+            raise KeyError(f"{path} is missing columns: {sorted(missing)}")
+        complete = chunk[numeric + [target]].notna().all(axis=1)
+        skipped += int((~complete).sum())
+        chunk = chunk[complete].copy()
+        if chunk.empty:
+            continue
+        chunk[categorical] = chunk[categorical].astype(object)
+        y = chunk[target].astype(int).to_numpy()
+
+        # prequential: score each chunk before the model learns from it
+        chunk_loss, chunk_correct = _week_loss(pipeline, chunk[features], y)
+        loss += chunk_loss
+        correct += chunk_correct
+
+        model.partial_fit(
+            pipeline.named_steps["encode"].transform(chunk[features]),
+            y,
+            classes=CLASSES,
+        )
+        rows += len(chunk)
+
+    if rows == 0:
+        raise ValueError(f"No complete player-week rows in {path}")
+
+    meta.update(
+        {
+            "parent_version": meta["version"],
+            "target": target,
+            "season": season,
+            "week": week,
+            "rows": rows,
+            "rows_skipped": skipped,
+            "rows_seen": meta.get("rows_seen", 0) + rows,
+            "weeks_applied": meta["weeks_applied"] + [[season, week]],
+            "prequential": {"log_loss": loss / rows, "accuracy": correct / rows},
+            "update_seconds": round(time.perf_counter() - start_time, 3),
+        }
+    )
+    meta.pop("metrics", None)
+    return _checkpoint(pipeline, meta, online_dir, keep), meta
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Weekly online updates of the injury model"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    start = commands.add_parser("bootstrap", help="start from the training snapshot")
+    start.add_argument("--features", default=FEATURES_DIR)
+    start.add_argument("--epochs", type=int, default=BOOTSTRAP_EPOCHS)
+    start.add_argument("--seed", type=int, default=42)
+
+    update = commands.add_parser("update", help="learn one week of player-week rows")
+    update.add_argument("input", help="CSV or Parquet of the week's rows")
+    update.add_argument("--season", type=int, required=True)
+    update.add_argument("--week", type=int, required=True)
+    update.add_argument("--target", help="label column (default: the model's target)")
+    update.add_argument("--force", action="store_true")
+
+    back = commands.add_parser("rollback", help="make an earlier checkpoint active")
+    back.add_argument("--to", type=int)
+
+    commands.add_parser("status", help="list checkpoints")
+    for command in commands.choices.values():
+        command.add_argument("--dir", default=ONLINE_DIR)
+        command.add_argument("--keep", type=int, default=KEEP_CHECKPOINTS)
+    args = parser.parse_args()
+
+    # refusals (week already applied, no checkpoint, missing columns) print just the message
+    try:
+        if args.command == "bootstrap":
+            version = bootstrap(
+                args.features, args.dir, args.epochs, args.seed, args.keep
+            )
+            print(f"Bootstrapped online injury_model_v{version}")
+        elif args.command == "update":
+            version, meta = update_week(
+                args.input,
+                args.season,
+                args.week,
+                args.dir,
+                args.target,
+                args.force,
+                keep=args.keep,
+            )
+            print(
+                f"Saved online injury_model_v{version} from v{meta['parent_version']}: "
+                f"{meta['rows']:,} rows in {meta['update_seconds']}s, "
+                f"prequential log loss {meta['prequential']['log_loss']:.4f}"
+            )
+        elif args.command == "rollback":
+            print(f"Active online model is now v{rollback(args.to, args.dir)}")
+        else:
+            current = current_version(args.dir)
+            for version in list_versions(args.dir):
+                _, meta = load_model(version, args.dir)
+                week = (
+                    f"{meta['season']} wk {meta['week']}"
+                    if "season" in meta
+                    else "bootstrap"
+                )
+                print(
+                    f"{'*' if version == current else ' '} v{version:<4} {week:<14} "
+                    f"{meta['rows_seen']:>10,} rows seen  {meta['saved_at']}"
+                )
+    except (ValueError, KeyError, FileNotFoundError) as e:
+        raise SystemExit(f"Error: {e.args[0] if e.args else e}")
@@ -0,0 +1,125 @@
+"""
+# Score Model - batch injury probabilities from a saved model version
+# Loads the pipeline once, streams the input (CSV or Parquet) in chunks, scores each chunk
+# with one vectorized predict_proba call and appends it to a Parquet file the app reads.
+## Run from 5_ModelDevelopment: python src/score_model.py [--input ...] [--version N]
+"""
+import os
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from model_store import load_model
+
+INPUT_CSV = "./src/player_modeling_data.csv"
+OUTPUT_PARQUET = "../7_Deployment/configs/injury_predictions.parquet"
+CHUNK_ROWS = 250_000
+
+OUTPUT_SCHEMA = pa.schema(
+    [
+        ("gsis_id", pa.string()),
+        ("full_name", pa.string()),
+        ("Injury_Probability", pa.float32()),
+        ("model_version", pa.int32()),
+    ]
+)
+
+
+# Function to yield DataFrame chunks from a CSV or Parquet file
+def read_chunks(path, columns=None, chunk_rows=CHUNK_ROWS):
+    if path.endswith((".parquet", ".parq")):
+        parquet_file = pq.ParquetFile(path)
+        available = set(parquet_file.schema_arrow.names)
+        if columns is not None:
+            columns = [c for c in columns if c in available]
+        for batch in parquet_file.iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pandas()
+    else:
+        usecols = None
+        if columns is not None:
+            wanted = set(columns)
+            usecols = lambda c: c in wanted
+        yield from pd.read_csv(path, usecols=usecols, chunksize=chunk_rows)
+
+
+# Function to score one chunk; rows with missing numeric features get a NaN probability
+def score_chunk(pipeline, features, chunk, numeric_features=None):
+    # an absent column is a schema problem, not a row to score with made-up values
+    missing = [c for c in features if c not in chunk.columns]
+    if missing:
+        raise KeyError(f"Input is missing feature columns: {missing}")
+    X = chunk[features].copy()
+    required = X
+    if numeric_features is not None:
+        required = X[numeric_features]
+        # Missing categories are fine, the encoder maps them like any unseen value
+        categorical = [c for c in features if c not in numeric_features]
+        X[categorical] = X[categorical].astype(object)
+    complete = required.notna().all(axis=1).to_numpy()
+    probability = np.full(len(X), np.nan, dtype=np.float32)
+    if complete.any():
+        probability[complete] = pipeline.predict_proba(X[complete])[:, 1]
+    return probability
+
+
+def score_file(
+    input_path=INPUT_CSV,
+    output_path=OUTPUT_PARQUET,
+    version=None,
+    chunk_rows=CHUNK_ROWS,
+):
+    pipeline, meta = load_model(version)
+    features = meta["features"]
+    columns = ["gsis_id", "full_name"] + features
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    tmp_path = output_path + ".tmp"
+    rows = 0
+    start = time.perf_counter()
+    with pq.ParquetWriter(tmp_path, OUTPUT_SCHEMA) as writer:
+        for chunk in read_chunks(input_path, columns, chunk_rows):
+            probability = score_chunk(
+                pipeline, features, chunk, meta.get("numeric_features")
+            )
+            table = pa.table(
+                {
+                    "gsis_id": chunk["gsis_id"].astype(str).to_numpy(),
+                    "full_name": chunk["full_name"].astype(str).to_numpy(),
+                    "Injury_Probability": probability,
+                    "model_version": np.full(len(chunk), meta["version"], np.int32),
+                },
+                schema=OUTPUT_SCHEMA,
+            )
+            writer.write_table(table)
+            rows += len(chunk)
+    os.replace(tmp_path, output_path)
+
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "seconds": elapsed,
+        "rows_per_sec": rows / elapsed if elapsed else float("inf"),
+        "model_version": meta["version"],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch score players")
+    parser.add_argument("--input", default=INPUT_CSV)
+    parser.add_argument("--output", default=OUTPUT_PARQUET)
+    parser.add_argument("--version", type=int)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+
+    try:
+        stats = score_file(args.input, args.output, args.version, args.chunk_rows)
+    except (KeyError, FileNotFoundError) as e:
+        raise SystemExit(f"Error: {e.args[0] if e.args else e}")
+    print(
+        f"Scored {stats['rows']:,} rows with model v{stats['model_version']} in "
+        f"{stats['seconds']:.2f}s ({stats['rows_per_sec']:,.0f} rows/sec)"
+    )
@@ -0,0 +1,285 @@
+"""
+# Search Model - cross-validated model selection for the injury model
+# Candidates (regularized logistic regression, random forest, gradient boosting) are scored with
+# seeded stratified K-fold.
+# Each fold's encoder is fit once on its training rows and the encoded matrices are cached on disk,
+# so candidates only fit the model. Folds run in rounds on all cores and after each round the
+# weakest candidates are dropped (successive halving). The winner is refit on every row and saved
+# through model_store, with the leaderboard written next to it.
+## Run from 5_ModelDevelopment: python src/search_model.py [--folds 5]
+"""
+import os
+import json
+import hashlib
+import argparse
+import itertools
+
+import joblib
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.pipeline import Pipeline
+from sklearn.linear_model import LogisticRegression
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
+from sklearn.metrics import roc_auc_score, log_loss, f1_score
+from sklearn.model_selection import StratifiedKFold
+
+from model_store import save_model, MODELS_DIR
+
+MODELING_CSV = "./src/player_modeling_data.csv"
+FEATURES_DIR = "../4_FeatureEngineering/features"
+CACHE_DIR = "./cache/folds"
+LEADERBOARD_CSV = os.path.join(MODELS_DIR, "leaderboard.csv")
+
+SCORING = "roc_auc"
+
+
+##########################################
+##  Candidates                          ##
+##########################################
+
+
+# Model families and their grids; 'dense' families get a dense encoder output
+SEARCH_SPACE = {
+    "logistic_l2": (
+        lambda **p: LogisticRegression(max_iter=2000, **p),
+        {"C": [0.01, 0.1, 1.0, 10.0], "class_weight": [None, "balanced"]},
+        False,
+    ),
+    "logistic_l1": (
+        lambda **p: LogisticRegression(l1_ratio=1.0, solver="liblinear", **p),
+        {"C": [0.05, 0.5, 5.0], "class_weight": [None, "balanced"]},
+        False,
+    ),
+    "random_forest": (
+        lambda **p: RandomForestClassifier(n_estimators=300, n_jobs=1, **p),
+        {"max_depth": [4, 8, None], "min_samples_leaf": [1, 5]},
+        False,
+    ),
+    "gradient_boosting": (
+        lambda **p: HistGradientBoostingClassifier(
+            max_iter=300, early_stopping=True, **p
+        ),
+        {"learning_rate": [0.03, 0.1], "max_depth": [3, None]},
+        True,
+    ),
+}
+
+
+def candidates(space=SEARCH_SPACE):
+    out = []
+    for family, (_, grid, dense) in space.items():
+        keys = sorted(grid)
+        for values in itertools.product(*(grid[k] for k in keys)):
+            params = dict(zip(keys, values))
+            settings = ", ".join(f"{k}={v}" for k, v in params.items())
+            out.append(
+                {
+                    "name": f"{family}({settings})",
+                    "family": family,
+                    "params": params,
+                    "dense": dense,
+                }
+            )
+    return out
+
+
+def build_estimator(candidate, random_state=42):
+    factory = SEARCH_SPACE[candidate["family"]][0]
+    return factory(random_state=random_state, **candidate["params"])
+
+
+##########################################
+##  Data and Folds                      ##
+##########################################
+
+
+# Function to read the raw modeling rows the same way encode_features.py does
+def load_search_data(modeling_csv=MODELING_CSV, features_dir=FEATURES_DIR):
+    encoder = joblib.load(os.path.join(features_dir, "encoder.joblib"))
+    with open(os.path.join(features_dir, "encoder.json")) as f:
+        info = json.load(f)
+
+    df = pd.read_csv(modeling_csv).drop(columns=["Unnamed: 0"], errors="ignore")
+    df = df.dropna(subset=info["numeric"] + [info["target"]]).reset_index(drop=True)
+    df[info["categorical"]] = df[info["categorical"]].astype(object)
+    y = df[info["target"]].astype(int).to_numpy()
+    return df, y, encoder, info
+
+
+# Folds are stratified: the modeling table has one row per player and no season
+def make_folds(y, n_folds=5, random_state=42):
+    splitter = StratifiedKFold(n_folds, shuffle=True, random_state=random_state)
+    return list(splitter.split(np.zeros(len(y)), y))
+
+
+def _cache_key(df, folds, encoder):
+    digest = hashlib.sha256(pd.util.hash_pandas_object(df, index=False).values)
+    for train_idx, valid_idx in folds:
+        digest.update(train_idx.tobytes())
+        digest.update(valid_idx.tobytes())
+    digest.update(repr(encoder.get_params()).encode())
+    return digest.hexdigest()[:16]
+
+
+# Function to encode every fold once (encoder fit on the fold's training rows only)
+def cache_folds(df, folds, encoder, info, cache_dir=CACHE_DIR):
+    columns = info["categorical"] + info["numeric"]
+    fold_dir = os.path.join(cache_dir, _cache_key(df[columns], folds, encoder))
+    paths = []
+    for i, (train_idx, valid_idx) in enumerate(folds):
+        train_path = os.path.join(fold_dir, f"fold{i}_train.npz")
+        valid_path = os.path.join(fold_dir, f"fold{i}_valid.npz")
+        if not (os.path.exists(train_path) and os.path.exists(valid_path)):
+            os.makedirs(fold_dir, exist_ok=True)
+            fold_encoder = clone(encoder)
+            X_train = fold_encoder.fit_transform(df.iloc[train_idx][columns])
+            X_valid = fold_encoder.transform(df.iloc[valid_idx][columns])
+            for path, X in [(train_path, X_train), (valid_path, X_valid)]:
+                sp.save_npz(path + ".tmp.npz", sp.csr_matrix(X))
+                os.replace(path + ".tmp.npz", path)
+        paths.append((train_path, valid_path))
+    return paths
+
+
+##########################################
+##  Search                              ##
+##########################################
+
+
+# Worker: fit one candidate on one cached fold and score it
+def evaluate(candidate, fold, fold_paths, train_idx, valid_idx, y, random_state):
+    X_train = sp.load_npz(fold_paths[0])
+    X_valid = sp.load_npz(fold_paths[1])
+    if candidate["dense"]:
+        X_train, X_valid = X_train.toarray(), X_valid.toarray()
+    y_train, y_valid = y[train_idx], y[valid_idx]
+
+    model = build_estimator(candidate, random_state).fit(X_train, y_train)
+    probability = model.predict_proba(X_valid)[:, 1]
+    return {
+        "name": candidate["name"],
+        "fold": fold,
+        "roc_auc": roc_auc_score(y_valid, probability),
+        "log_loss": log_loss(y_valid, probability, labels=[0, 1]),
+        "f1": f1_score(y_valid, probability >= 0.5, zero_division=0),
+    }
+
+
+def search(
+    df,
+    y,
+    encoder,
+    info,
+    n_folds=5,
+    keep=0.5,
+    min_candidates=3,
+    n_jobs=-1,
+    random_state=42,
+    cache_dir=CACHE_DIR,
+):
+    folds = make_folds(y, n_folds, random_state)
+    fold_paths = cache_folds(df, folds, encoder, info, cache_dir)
+
+    alive = candidates()
+    results = []
+    with Parallel(n_jobs=n_jobs) as parallel:
+        for fold, (train_idx, valid_idx) in enumerate(folds):
+            results += parallel(
+                delayed(evaluate)(
+                    candidate,
+                    fold,
+                    fold_paths[fold],
+                    train_idx,
+                    valid_idx,
+                    y,
+                    random_state,
+                )
+                for candidate in alive
+            )
+            # early stopping: after each fold keep the better half of the candidates
+            if fold < len(folds) - 1 and len(alive) > min_candidates:
+                means = pd.DataFrame(results).groupby("name")[SCORING].mean()
+                survivors = max(min_candidates, int(np.ceil(len(alive) * keep)))
+                best = set(means[[c["name"] for c in alive]].nlargest(survivors).index)
+                alive = [c for c in alive if c["name"] in best]
+
+    scores = pd.DataFrame(results)
+    leaderboard = (
+        scores.groupby("name")
+        .agg(
+            roc_auc=("roc_auc", "mean"),
+            roc_auc_std=("roc_auc", "std"),
+            log_loss=("log_loss", "mean"),
+            f1=("f1", "mean"),
+            folds=("fold", "count"),
+        )
+        .reset_index()
+    )
+    # rank candidates that finished every fold ahead of the ones stopped early
+    leaderboard = leaderboard.sort_values(
+        ["folds", SCORING], ascending=[False, False]
+    ).reset_index(drop=True)
+    return leaderboard, {c["name"]: c for c in candidates()}
+
+
+# Function to refit the winning candidate on all rows and save it with model_store
+def save_winner(df, y, encoder, info, leaderboard, by_name, random_state=42):
+    winner = by_name[leaderboard["name"].iloc[0]]
+    final_encoder = clone(encoder)
+    if winner["dense"]:
+        final_encoder.set_params(sparse_threshold=0.0)
+    pipeline = Pipeline(
+        [("encode", final_encoder), ("model", build_estimator(winner, random_state))]
+    )
+    features = info["categorical"] + info["numeric"]
+    pipeline.fit(df[features], y)
+
+    top = leaderboard.iloc[0]
+    return save_model(
+        pipeline,
+        features,
+        {
+            "numeric_features": info["numeric"],
+            "target": info["target"],
+            "model": winner["name"],
+            "cv": "stratified",
+            "metrics": {
+                "roc_auc": float(top["roc_auc"]),
+                "roc_auc_std": float(top["roc_auc_std"]),
+                "log_loss": float(top["log_loss"]),
+                "f1": float(top["f1"]),
+            },
+            "random_state": random_state,
+            "rows": len(df),
+        },
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cross-validated injury model search")
+    parser.add_argument("--input", default=MODELING_CSV)
+    parser.add_argument("--features", default=FEATURES_DIR)
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--jobs", type=int, default=-1)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    df, y, encoder, info = load_search_data(args.input, args.features)
+    leaderboard, by_name = search(
+        df,
+        y,
+        encoder,
+        info,
+        args.folds,
+        n_jobs=args.jobs,
+        random_state=args.seed,
+    )
+    os.makedirs(MODELS_DIR, exist_ok=True)
+    leaderboard.to_csv(LEADERBOARD_CSV, index=False)
+    print(leaderboard.head(10).to_string(index=False))
+
+    version = save_winner(df, y, encoder, info, leaderboard, by_name, args.seed)
+    print(f"Saved injury_model_v{version}: {leaderboard['name'].iloc[0]}")
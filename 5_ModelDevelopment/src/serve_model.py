@@ -0,0 +1,319 @@
+"""
+# Serve Model - local HTTP injury-risk scoring with micro-batching
+# Loads a saved pipeline (encoder + logistic model) once and scores on demand: a known player by
+# gsis_id, the same player with changed inputs (weight, age, position, ...) or a raw feature row.
+# Concurrent requests are queued and coalesced into one vectorized predict_proba call per
+# micro-batch (up to MAX_BATCH rows or MAX_WAIT_MS). Player feature rows and recent scores sit
+# in LRU caches, and GET /metrics reports latency percentiles, throughput and batch sizes.
+## Run from 5_ModelDevelopment: python src/serve_model.py [--port 8765] [--version N]
+##   curl -d '{"gsis_id": "00-0023459", "overrides": {"weight": 240}}' localhost:8765/score
+"""
+import json
+import time
+import queue
+import argparse
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import numpy as np
+import pandas as pd
+
+from model_store import load_model
+from score_model import score_chunk
+
+PLAYERS_CSV = "./src/player_modeling_data.csv"
+
+MAX_BATCH = 256
+MAX_WAIT_MS = 2.0
+CACHE_SIZE = 10_000
+LATENCY_WINDOW = 10_000
+
+
+class LRUCache:
+    def __init__(self, max_size=CACHE_SIZE):
+        self.max_size = max_size
+        self.items = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self.items:
+                self.items.move_to_end(key)
+                self.hits += 1
+                return self.items[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self.items[key] = value
+            self.items.move_to_end(key)
+            while len(self.items) > self.max_size:
+                self.items.popitem(last=False)
+
+
+##########################################
+##  Scorer                              ##
+##########################################
+
+
+class BatchScorer:
+    """Queue of feature rows scored by one background thread in micro-batches."""
+
+    def __init__(
+        self,
+        version=None,
+        players_csv=PLAYERS_CSV,
+        max_batch=MAX_BATCH,
+        max_wait_ms=MAX_WAIT_MS,
+        cache_size=CACHE_SIZE,
+    ):
+        self.pipeline, self.meta = load_model(version)
+        self.features = self.meta["features"]
+        self.numeric = self.meta.get("numeric_features") or []
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+
+        players = pd.read_csv(players_csv, usecols=lambda c: c != "Unnamed: 0")
+        self.players = players.drop_duplicates("gsis_id", keep="last").set_index(
+            "gsis_id"
+        )
+        self.vectors = LRUCache(cache_size)  # gsis_id -> feature dict
+        self.scores = LRUCache(cache_size)  # feature tuple -> probability
+
+        self.requests = queue.Queue()
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.batch_sizes = deque(maxlen=LATENCY_WINDOW)
+        self.scored = 0
+        self.started = time.time()
+        self._worker = threading.Thread(target=self._run, name="scorer", daemon=True)
+        self._worker.start()
+
+    # Function to build the model input for one request
+    def feature_row(self, gsis_id=None, overrides=None, features=None):
+        if features is not None:
+            row = {c: features.get(c) for c in self.features}
+        else:
+            row = self.vectors.get(gsis_id)
+            if row is None:
+                if gsis_id not in self.players.index:
+                    raise KeyError(f"Unknown gsis_id: {gsis_id}")
+                record = self.players.loc[gsis_id]
+                row = {c: record.get(c) for c in self.features}
+                self.vectors.put(gsis_id, row)
+        unknown = set(overrides or {}) - set(self.features)
+        if unknown:
+            raise KeyError(f"Not model features: {sorted(unknown)}")
+        row = {**row, **(overrides or {})}
+        return {
+            c: (None if pd.isna(v) else float(v) if c in self.numeric else v)
+            for c, v in row.items()
+        }
+
+    def submit(self, row):
+        key = tuple(row[c] for c in self.features)
+        cached = self.scores.get(key)
+        future = Future()
+        if cached is not None:
+            future.set_result(cached)
+        else:
+            self.requests.put((key, row, future))
+        return future
+
+    def _next_batch(self):
+        batch = [self.requests.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(
+                    self.requests.get(timeout=remaining)
+                    if remaining > 0
+                    else self.requests.get_nowait()
+                )
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                frame = pd.DataFrame(
+                    [row for _, row, _ in batch], columns=self.features
+                )
+                probability = score_chunk(
+                    self.pipeline, self.features, frame, self.numeric
+                )
+            except Exception as e:
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (key, _, future), p in zip(batch, probability):
+                value = None if np.isnan(p) else float(p)
+                if value is not None:
+                    self.scores.put(key, value)
+                future.set_result(value)
+            self.batch_sizes.append(len(batch))
+            self.scored += len(batch)
+
+    def score(self, items, timeout=5.0):
+        start = time.perf_counter()
+        for item in items:
+            _check_item(item)
+        rows = [
+            self.feature_row(i.get("gsis_id"), i.get("overrides"), i.get("features"))
+            for i in items
+        ]
+        futures = [self.submit(row) for row in rows]
+        results = [future.result(timeout) for future in futures]
+        self.latencies.append(time.perf_counter() - start)
+        return results
+
+    def metrics(self):
+        latencies = np.array(self.latencies) * 1e3
+        batches = np.array(self.batch_sizes)
+        uptime = time.time() - self.started
+        percentiles = (
+            np.percentile(latencies, [50, 95, 99]) if len(latencies) else [None] * 3
+        )
+        return {
+            "model_version": self.meta["version"],
+            "uptime_s": round(uptime, 1),
+            "requests": len(latencies),
+            "rows_scored": self.scored,
+            "rows_per_sec": round(self.scored / uptime, 1) if uptime else None,
+            "latency_ms": dict(zip(["p50", "p95", "p99"], map(_round, percentiles))),
+            "batch_size": {
+                "mean": _round(batches.mean()) if len(batches) else None,
+                "max": int(batches.max()) if len(batches) else None,
+            },
+            "queue_depth": self.requests.qsize(),
+            "score_cache": {"hits": self.scores.hits, "misses": self.scores.misses},
+            "vector_cache": {"hits": self.vectors.hits, "misses": self.vectors.misses},
+        }
+
+
+def _round(value):
+    return None if value is None else round(float(value), 3)
+
+
+# Function to reject request items the scorer cannot read, before anything is queued
+def _check_item(item):
+    if not isinstance(item, dict):
+        raise ValueError(
+            f"Each player must be a JSON object, got {type(item).__name__}"
+        )
+    for field in ["overrides", "features"]:
+        if item.get(field) is not None and not isinstance(item[field], dict):
+            raise ValueError(f"'{field}' must be a JSON object")
+    if item.get("gsis_id") is None and item.get("features") is None:
+        raise ValueError("Each player needs a gsis_id or features")
+
+
+##########################################
+##  HTTP                                ##
+##########################################
+
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    # keep-alive, so a client reuses its connection between requests
+    protocol_version = "HTTP/1.1"
+    # headers and body are separate small writes; with Nagle on, the body waits for the
+    # client's delayed ACK (~40 ms) on every keep-alive response
+    disable_nagle_algorithm = True
+    scorer = None
+
+    def _send(self, status, body):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            self._send(200, self.scorer.metrics())
+        elif self.path == "/health":
+            self._send(
+                200, {"status": "ok", "model_version": self.scorer.meta["version"]}
+            )
+        else:
+            self._send(404, {"error": f"Unknown path {self.path}"})
+
+    # POST /score with one request object, or {"players": [...]} for several
+    def do_POST(self):
+        if self.path != "/score":
+            self._send(404, {"error": f"Unknown path {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(body, dict):
+                raise ValueError("The request body must be a JSON object")
+            items = body["players"] if "players" in body else [body]
+            if not isinstance(items, list):
+                raise ValueError("'players' must be a list")
+            probabilities = self.scorer.score(items)
+        except KeyError as e:
+            self._send(404, {"error": str(e.args[0] if e.args else e)})
+            return
+        except (ValueError, TypeError) as e:
+            self._send(400, {"error": str(e)})
+            return
+        except TimeoutError:
+            self._send(503, {"error": "Scoring timed out, try again"})
+            return
+        except Exception as e:
+            self._send(500, {"error": f"Scoring failed: {e}"})
+            return
+        results = [
+            {"gsis_id": item.get("gsis_id"), "Injury_Probability": p}
+            for item, p in zip(items, probabilities)
+        ]
+        self._send(200, results[0] if "players" not in body else {"results": results})
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ScoringServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # the default backlog of 5 refuses connections under a burst of clients
+    request_queue_size = 128
+
+
+def serve(port=8765, version=None, host="127.0.0.1", **scorer_options):
+    ScoringHandler.scorer = BatchScorer(version, **scorer_options)
+    return ScoringServer((host, port), ScoringHandler)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local injury-risk scoring service")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--version", type=int)
+    parser.add_argument("--players", default=PLAYERS_CSV)
+    parser.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    server = serve(
+        args.port,
+        args.version,
+        args.host,
+        players_csv=args.players,
+        max_batch=args.max_batch,
+        max_wait_ms=args.max_wait_ms,
+    )
+    meta = ScoringHandler.scorer.meta
+    print(f"Serving injury_model_v{meta['version']} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
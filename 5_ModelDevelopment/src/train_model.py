@@ -0,0 +1,77 @@
+"""
+# Train Model - fits the notebook's logistic regression on the sparse encoded features
+# Reads the CSR matrix and fitted encoder written by 4_FeatureEngineering/src/encode_features.py,
+# fits LogisticRegression on a seeded stratified split and saves encoder + model as one
+# Pipeline through model_store, so scoring takes raw player rows.
+## Run from 5_ModelDevelopment: python src/train_model.py
+"""
+import os
+import json
+import argparse
+
+import joblib
+import pandas as pd
+import scipy.sparse as sp
+from sklearn.pipeline import Pipeline
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
+
+from model_store import save_model
+
+FEATURES_DIR = "../4_FeatureEngineering/features"
+
+
+# Function to load the encoded matrix, ids/target and the fitted encoder
+def load_training_data(features_dir=FEATURES_DIR):
+    X = sp.load_npz(os.path.join(features_dir, "player_features.npz")).tocsr()
+    meta = pd.read_parquet(os.path.join(features_dir, "player_features_meta.parquet"))
+    encoder = joblib.load(os.path.join(features_dir, "encoder.joblib"))
+    with open(os.path.join(features_dir, "encoder.json")) as f:
+        info = json.load(f)
+    y = meta[info["target"]].astype(int).to_numpy()
+    return X, y, encoder, info
+
+
+def build_model():
+    return LogisticRegression(max_iter=1000)
+
+
+def train(features_dir=FEATURES_DIR, random_state=42):
+    X, y, encoder, info = load_training_data(features_dir)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, stratify=y, random_state=random_state
+    )
+
+    preds = build_model().fit(X_train, y_train).predict(X_test)
+    metrics = {
+        "accuracy": accuracy_score(y_test, preds),
+        "precision": precision_score(y_test, preds, zero_division=0),
+        "recall": recall_score(y_test, preds, zero_division=0),
+        "f1": f1_score(y_test, preds, zero_division=0),
+    }
+
+    # Refit on all rows for the saved artifact, the held-out metrics are kept as metadata
+    pipeline = Pipeline([("encode", encoder), ("logr", build_model().fit(X, y))])
+    version = save_model(
+        pipeline,
+        info["categorical"] + info["numeric"],
+        {
+            "numeric_features": info["numeric"],
+            "target": info["target"],
+            "metrics": metrics,
+            "random_state": random_state,
+            "rows": X.shape[0],
+        },
+    )
+    return version, metrics
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train and save the injury model")
+    parser.add_argument("--features", default=FEATURES_DIR)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    version, metrics = train(args.features, args.seed)
+    print(f"Saved injury_model_v{version}: {metrics}")
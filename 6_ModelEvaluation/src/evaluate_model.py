@@ -0,0 +1,281 @@
+"""
+# Evaluate Model - vectorized evaluation of injury predictions, stored apart from the metrics
+# Predictions are sorted by probability once; ROC/PR curves, average precision, the threshold
+# sweep and calibration bins all come from cumulative sums over that order. Bootstrap intervals
+# reuse the same order with resampling weights (no re-sorting) and run on a process pool.
+# Per-row predictions, summary metrics and curve points go to separate typed Parquet files, so
+# a dashboard only reads the small metrics file. Reads the old mixed results.csv layout too.
+## Run from 6_ModelEvaluation: python src/evaluate_model.py [--input ../3_DataExploration/reports/results.csv]
+"""
+import os
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+LEGACY_RESULTS = "../3_DataExploration/reports/results.csv"
+RESULTS_DIR = "./results"
+
+THRESHOLDS = np.round(np.arange(0.05, 1.0, 0.05), 2)
+CALIBRATION_BINS = 10
+BOOTSTRAP_METRICS = ["roc_auc", "average_precision", "brier"]
+
+
+##########################################
+##  Input                               ##
+##########################################
+
+
+def _as_bool(column):
+    return column.astype(str).str.lower().eq("true").to_numpy()
+
+
+# Function to split the old results.csv (prediction rows + Metric/Value rows) in two
+def read_legacy_results(path=LEGACY_RESULTS):
+    df = pd.read_csv(path)
+    summary = df["Metric"].notna()
+    rows = df[~summary]
+    predictions = pd.DataFrame(
+        {
+            "actual": _as_bool(rows["Actual"]),
+            "predicted": _as_bool(rows["Predicted"]),
+            "probability": rows["Probability_1"].astype("float32").to_numpy(),
+        }
+    )
+    legacy_metrics = df.loc[summary, ["Metric", "Value"]].reset_index(drop=True)
+    return predictions, legacy_metrics
+
+
+def read_predictions(path):
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path), None
+    return read_legacy_results(path)
+
+
+##########################################
+##  Metrics                             ##
+##########################################
+
+
+# Function to order the scores once; ties are collapsed to one threshold each
+def sort_scores(y_true, probability):
+    order = np.argsort(-probability, kind="stable")
+    scores = probability[order]
+    labels = y_true[order].astype(np.float64)
+    # last position of each distinct score, so tied scores move together along the curves
+    ends = np.r_[np.flatnonzero(np.diff(scores)), len(scores) - 1]
+    return scores, labels, ends
+
+
+def _curves(labels, ends, weights=None):
+    w = np.ones_like(labels) if weights is None else weights
+    tp = np.cumsum(labels * w)[ends]
+    fp = np.cumsum((1 - labels) * w)[ends]
+    return tp, fp
+
+
+def _summary(tp, fp):
+    positives, negatives = tp[-1], fp[-1]
+    tpr = np.r_[0.0, tp / positives] if positives else np.zeros(len(tp) + 1)
+    fpr = np.r_[0.0, fp / negatives] if negatives else np.zeros(len(fp) + 1)
+    roc_auc = np.trapezoid(tpr, fpr) if hasattr(np, "trapezoid") else np.trapz(tpr, fpr)
+    precision = tp / np.maximum(tp + fp, 1e-12)
+    # average precision: precision weighted by each step in recall
+    recall_steps = np.diff(np.r_[0.0, tpr[1:]])
+    average_precision = float(np.sum(recall_steps * precision))
+    return float(roc_auc), average_precision, tpr, fpr, precision
+
+
+def threshold_sweep(scores, labels, thresholds=THRESHOLDS):
+    # rows with probability >= t are the first k rows of the descending order
+    k = len(scores) - np.searchsorted(scores[::-1], thresholds, side="left")
+    tp_all = np.r_[0.0, np.cumsum(labels)]
+    tp = tp_all[k]
+    fp = k - tp
+    positives = tp_all[-1]
+    fn = positives - tp
+    tn = len(scores) - positives - fp
+    precision = np.divide(tp, tp + fp, out=np.zeros_like(tp), where=(tp + fp) > 0)
+    recall = tp / positives if positives else np.zeros_like(tp)
+    f1 = np.divide(
+        2 * precision * recall,
+        precision + recall,
+        out=np.zeros_like(tp),
+        where=(precision + recall) > 0,
+    )
+    return pd.DataFrame(
+        {
+            "threshold": thresholds.astype("float32"),
+            "tp": tp.astype("int64"),
+            "fp": fp.astype("int64"),
+            "fn": fn.astype("int64"),
+            "tn": tn.astype("int64"),
+            "precision": precision,
+            "recall": recall,
+            "f1": f1,
+            "accuracy": (tp + tn) / len(scores),
+        }
+    )
+
+
+def calibration_bins(y_true, probability, n_bins=CALIBRATION_BINS):
+    bins = np.minimum((probability * n_bins).astype(np.int64), n_bins - 1)
+    count = np.bincount(bins, minlength=n_bins)
+    mean_predicted = np.bincount(bins, weights=probability, minlength=n_bins)
+    observed = np.bincount(bins, weights=y_true.astype(np.float64), minlength=n_bins)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return pd.DataFrame(
+            {
+                "bin": np.arange(n_bins, dtype="int16"),
+                "lower": np.arange(n_bins, dtype="float32") / n_bins,
+                "count": count.astype("int64"),
+                "mean_predicted": mean_predicted / count,
+                "observed_rate": observed / count,
+            }
+        )
+
+
+# Worker: AUC / AP / Brier for a batch of bootstrap replicates as sample weights
+def _bootstrap_batch(labels, ends, squared_error, seed, replicates):
+    rng = np.random.default_rng(seed)
+    n = len(labels)
+    out = np.empty((replicates, len(BOOTSTRAP_METRICS)))
+    for i in range(replicates):
+        weights = np.bincount(rng.integers(0, n, n), minlength=n).astype(np.float64)
+        tp, fp = _curves(labels, ends, weights)
+        roc_auc, average_precision = _summary(tp, fp)[:2]
+        out[i] = [roc_auc, average_precision, np.dot(weights, squared_error) / n]
+    return out
+
+
+def bootstrap(labels, ends, squared_error, n_boot=200, workers=None, seed=42):
+    if n_boot <= 0:
+        return None
+    workers = workers or os.cpu_count() or 1
+    batches = [b for b in np.array_split(np.arange(n_boot), workers) if len(b)]
+    seeds = np.random.SeedSequence(seed).spawn(len(batches))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(_bootstrap_batch, labels, ends, squared_error, s, len(b))
+            for s, b in zip(seeds, batches)
+        ]
+        return np.vstack([future.result() for future in futures])
+
+
+# Function to compute every metric and curve for one set of predictions
+def evaluate(y_true, probability, n_boot=200, workers=None, seed=42):
+    y_true = np.asarray(y_true, dtype=bool)
+    probability = np.asarray(probability, dtype=np.float64)
+
+    scores, labels, ends = sort_scores(y_true, probability)
+    tp, fp = _curves(labels, ends)
+    roc_auc, average_precision, tpr, fpr, precision = _summary(tp, fp)
+    brier = float(np.mean((probability - y_true) ** 2))
+
+    sweep = threshold_sweep(scores, labels)
+    at_half = sweep.loc[np.isclose(sweep["threshold"], 0.5)].iloc[0]
+    values = {
+        "roc_auc": roc_auc,
+        "average_precision": average_precision,
+        "brier": brier,
+        "accuracy": at_half["accuracy"],
+        "precision": at_half["precision"],
+        "recall": at_half["recall"],
+        "f1": at_half["f1"],
+        "positives": float(y_true.sum()),
+        "rows": float(len(y_true)),
+    }
+    metrics = pd.DataFrame(
+        {"metric": list(values), "value": np.array(list(values.values()))}
+    )
+    metrics["ci_low"] = np.nan
+    metrics["ci_high"] = np.nan
+
+    # squared error in the sorted order, to match the bootstrap weights
+    squared_error = (scores - labels) ** 2
+    replicates = bootstrap(labels, ends, squared_error, n_boot, workers, seed)
+    if replicates is not None:
+        low, high = np.nanpercentile(replicates, [2.5, 97.5], axis=0)
+        for i, name in enumerate(BOOTSTRAP_METRICS):
+            metrics.loc[metrics["metric"] == name, ["ci_low", "ci_high"]] = [
+                low[i],
+                high[i],
+            ]
+
+    thresholds = scores[ends]
+    curves = pd.concat(
+        [
+            pd.DataFrame(
+                {
+                    "curve": "roc",
+                    "threshold": np.r_[np.inf, thresholds],
+                    "x": fpr,
+                    "y": tpr,
+                }
+            ),
+            pd.DataFrame(
+                {"curve": "pr", "threshold": thresholds, "x": tpr[1:], "y": precision}
+            ),
+        ],
+        ignore_index=True,
+    )
+    curves["curve"] = curves["curve"].astype("category")
+    curves[["threshold", "x", "y"]] = curves[["threshold", "x", "y"]].astype("float32")
+    return {
+        "metrics": metrics,
+        "curves": curves,
+        "thresholds": sweep,
+        "calibration": calibration_bins(y_true, probability),
+    }
+
+
+##########################################
+##  Output                              ##
+##########################################
+
+
+def save_results(predictions, results, results_dir=RESULTS_DIR, name="injury_model"):
+    os.makedirs(results_dir, exist_ok=True)
+    tables = {"predictions": predictions, **results}
+    paths = {}
+    for table, df in tables.items():
+        path = os.path.join(results_dir, f"{name}_{table}.parquet")
+        df.to_parquet(path + ".tmp", index=False)
+        os.replace(path + ".tmp", path)
+        paths[table] = path
+    return paths
+
+
+# Dashboards read only the summary table
+def load_metrics(results_dir=RESULTS_DIR, name="injury_model"):
+    return pd.read_parquet(os.path.join(results_dir, f"{name}_metrics.parquet"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate injury model predictions")
+    parser.add_argument(
+        "--input",
+        default=LEGACY_RESULTS,
+        help="legacy results.csv or a Parquet file with actual/probability columns",
+    )
+    parser.add_argument("--output-dir", default=RESULTS_DIR)
+    parser.add_argument("--name", default="injury_model")
+    parser.add_argument("--bootstrap", type=int, default=200)
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    predictions, legacy_metrics = read_predictions(args.input)
+    if "predicted" not in predictions.columns:
+        predictions["predicted"] = predictions["probability"] >= 0.5
+    results = evaluate(
+        predictions["actual"].to_numpy(),
+        predictions["probability"].to_numpy(),
+        n_boot=args.bootstrap,
+        workers=args.workers,
+    )
+    save_results(predictions, results, args.output_dir, args.name)
+    print(results["metrics"].to_string(index=False))
+    if legacy_metrics is not None and not legacy_metrics.empty:
+        print("Stored in the input file:")
+        print(legacy_metrics.to_string(index=False))
@@ -0,0 +1,166 @@
+"""
+# Assets - local, right-sized copies of the images the player card serves
+# The sidebar background is base64-encoded once into a data URI file, player headshots from
+# team_rosters.csv are downloaded through the remote cache, resized and stored as WebP (with a
+# placeholder when a player has no photo or the download fails). The app asks for headshots
+# without waiting: a miss returns the placeholder and downloads in the background, so the
+# photo shows up on a later rerun instead of blocking the render.
+## Run from 7_Deployment: python assets.py [--skip-headshots]
+"""
+import os
+import time
+import base64
+import hashlib
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from PIL import Image, ImageDraw
+
+from remote_cache import cached_path
+
+ASSET_DIR = "./configs/assets"
+ROSTERS_CSV = "./src/team_rosters.csv"
+SIDEBAR_BG = "./src/vertical-background-posters-night-american-600nw-245578828.webp"
+
+HEADSHOT_SIZE = (240, 240)  # the sidebar shows headshots at ~240px
+HEADSHOT_TTL = 30 * 24 * 60 * 60  # headshots rarely change
+# how long a failed background download serves the placeholder before it is retried
+PLACEHOLDER_RETRY_TTL = 5 * 60
+
+logger = logging.getLogger(__name__)
+
+# Background headshot downloads for the app, one per file at a time
+_downloads = ThreadPoolExecutor(max_workers=4, thread_name_prefix="headshot")
+_downloads_lock = threading.Lock()
+_pending = set()
+_failed_at = {}
+
+
+def _is_fresh(output, source):
+    return os.path.exists(output) and os.path.getmtime(output) >= os.path.getmtime(
+        source
+    )
+
+
+def _save_image(image, path, **options):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"  # export workers may write the same file
+    image.save(tmp_path, format=options.pop("format"), **options)
+    os.replace(tmp_path, path)
+
+
+##########################################
+##  Sidebar Background                  ##
+##########################################
+
+
+# Function to return the background as a data URI, encoded once and kept on disk
+def background_data_uri(path=SIDEBAR_BG, asset_dir=ASSET_DIR):
+    ext = os.path.splitext(path)[1].lstrip(".")
+    uri_path = os.path.join(asset_dir, f"{os.path.basename(path)}.datauri")
+    if not _is_fresh(uri_path, path):
+        with open(path, "rb") as f:
+            encoded = base64.b64encode(f.read()).decode()
+        os.makedirs(asset_dir, exist_ok=True)
+        with open(uri_path + ".tmp", "w") as f:
+            f.write(f"data:image/{ext};base64,{encoded}")
+        os.replace(uri_path + ".tmp", uri_path)
+    with open(uri_path) as f:
+        return f.read()
+
+
+##########################################
+##  Headshots                           ##
+##########################################
+
+
+def placeholder_headshot(asset_dir=ASSET_DIR, size=HEADSHOT_SIZE):
+    path = os.path.join(asset_dir, "headshots", "placeholder.webp")
+    if not os.path.exists(path):
+        # grey silhouette: head and shoulders
+        image = Image.new("RGB", size, "#3a3a3a")
+        draw = ImageDraw.Draw(image)
+        w, h = size
+        draw.ellipse([w * 0.35, h * 0.18, w * 0.65, h * 0.5], fill="#8a8a8a")
+        draw.ellipse([w * 0.18, h * 0.55, w * 0.82, h * 1.2], fill="#8a8a8a")
+        _save_image(image, path, format="WEBP", quality=80)
+    return path
+
+
+def _headshot_path(url, asset_dir):
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return os.path.join(asset_dir, "headshots", f"{key}.webp")
+
+
+# Function to get a local, resized headshot for url (placeholder when unavailable)
+def headshot_path(url, asset_dir=ASSET_DIR, size=HEADSHOT_SIZE):
+    if pd.isna(url) or not str(url).strip():
+        return placeholder_headshot(asset_dir, size)
+    path = _headshot_path(url, asset_dir)
+    if os.path.exists(path):
+        return path
+    try:
+        with Image.open(cached_path(url, ttl=HEADSHOT_TTL)) as image:
+            image = image.convert("RGB")
+            image.thumbnail(size)
+            _save_image(image, path, format="WEBP", quality=80)
+        return path
+    except Exception as e:
+        logger.warning("Headshot %s unavailable (%s), using placeholder", url, e)
+        return placeholder_headshot(asset_dir, size)
+
+
+def _download_headshot(url, path, asset_dir, size):
+    try:
+        if headshot_path(url, asset_dir, size) != path:
+            with _downloads_lock:
+                _failed_at[path] = time.time()
+    finally:
+        with _downloads_lock:
+            _pending.discard(path)
+
+
+# Function to return the headshot if it is on disk, else the placeholder while it downloads
+def headshot_path_nowait(url, asset_dir=ASSET_DIR, size=HEADSHOT_SIZE):
+    placeholder = placeholder_headshot(asset_dir, size)
+    if pd.isna(url) or not str(url).strip():
+        return placeholder
+    path = _headshot_path(url, asset_dir)
+    if os.path.exists(path):
+        return path
+    with _downloads_lock:
+        retry_at = _failed_at.get(path, 0) + PLACEHOLDER_RETRY_TTL
+        if path not in _pending and time.time() >= retry_at:
+            _pending.add(path)
+            _downloads.submit(_download_headshot, url, path, asset_dir, size)
+    return placeholder
+
+
+# Function to download and resize every roster headshot ahead of time
+def prefetch_headshots(rosters_csv=ROSTERS_CSV, asset_dir=ASSET_DIR, workers=8):
+    urls = pd.read_csv(rosters_csv, usecols=["headshot_url"])["headshot_url"]
+    urls = urls.dropna().drop_duplicates().tolist()
+    placeholder = placeholder_headshot(asset_dir)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        paths = list(pool.map(lambda url: headshot_path(url, asset_dir), urls))
+    missing = sum(path == placeholder for path in paths)
+    return len(urls), missing
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Build the player card image assets")
+    parser.add_argument("--asset-dir", default=ASSET_DIR)
+    parser.add_argument("--skip-headshots", action="store_true")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    background_data_uri(asset_dir=args.asset_dir)
+    if not args.skip_headshots:
+        total, missing = prefetch_headshots(
+            asset_dir=args.asset_dir, workers=args.workers
+        )
+        print(f"Headshots cached: {total - missing}/{total} ({missing} placeholders)")
@@ -0,0 +1,107 @@
+"""
+# Benchmark App - headless render latency of the player card using Streamlit's AppTest
+# Drives both pages for a number of players per team and reports p50/p95 per page plus the
+# median time of each timed section. Exits non-zero when a page's p95 exceeds --max-p95-ms.
+## Run from 7_Deployment: python benchmark_app.py --players-per-team 5 --output bench.json
+"""
+import sys
+import json
+import argparse
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+import render_timing
+
+PAGES = ["Player Info and Prediction", "Season Schedule and Injury Indicator"]
+
+
+def _sidebar_selectbox(at, label):
+    for selectbox in at.sidebar.selectbox:
+        if selectbox.label == label:
+            return selectbox
+    raise LookupError(f"No sidebar selectbox labelled {label!r}")
+
+
+def _timed_run(at, samples, page):
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    summary = at.session_state[render_timing.SUMMARY_KEY]
+    samples[page]["total_ms"].append(summary["total_ms"])
+    for record in summary["sections"]:
+        samples[page]["sections"].setdefault(record["section"], []).append(
+            record["wall_ms"]
+        )
+
+
+def _percentiles(values):
+    return {
+        "n": len(values),
+        "p50_ms": float(np.percentile(values, 50)),
+        "p95_ms": float(np.percentile(values, 95)),
+        "max_ms": float(np.max(values)),
+    }
+
+
+# Function to render every page for up to players_per_team players of each team
+def run_benchmark(script="player_card.py", teams=None, players_per_team=3, timeout=60):
+    samples = {page: {"total_ms": [], "sections": {}} for page in PAGES}
+
+    at = AppTest.from_file(script, default_timeout=timeout)
+    at.run()
+    team_options = _sidebar_selectbox(at, "Select a team").options
+    for team in teams or team_options:
+        _sidebar_selectbox(at, "Select a team").select(team)
+        at.run()
+        players = _sidebar_selectbox(at, "Select a player").options[:players_per_team]
+        for player in players:
+            _sidebar_selectbox(at, "Select a player").select(player)
+            for page in PAGES:
+                _sidebar_selectbox(at, "Choose a Page").select(page)
+                _timed_run(at, samples, page)
+
+    report = {}
+    for page, page_samples in samples.items():
+        report[page] = _percentiles(page_samples["total_ms"])
+        report[page]["sections_p50_ms"] = {
+            section: float(np.median(values))
+            for section, values in page_samples["sections"].items()
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--script", default="player_card.py")
+    parser.add_argument("--teams", nargs="*", help="team codes (default: all)")
+    parser.add_argument("--players-per-team", type=int, default=3)
+    parser.add_argument("--output", help="write the report as JSON")
+    parser.add_argument("--max-p95-ms", type=float, help="fail if any page is slower")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.script, args.teams, args.players_per_team)
+
+    for page, stats in report.items():
+        print(
+            f"{page}: n={stats['n']} p50={stats['p50_ms']:.0f} ms "
+            f"p95={stats['p95_ms']:.0f} ms max={stats['max_ms']:.0f} ms"
+        )
+        for section, p50 in sorted(
+            stats["sections_p50_ms"].items(), key=lambda item: -item[1]
+        ):
+            print(f"    {section:<36} {p50:8.1f} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.max_p95_ms is not None:
+        slow = [page for page, s in report.items() if s["p95_ms"] > args.max_p95_ms]
+        if slow:
+            print(f"p95 above {args.max_p95_ms} ms on: {', '.join(slow)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+# Data Cache - one process-wide, memory-budgeted cache for the player card's data loaders
+# Loaders are wrapped with `@cached("name", ttl=..., deps=[paths])`. Entries are kept in LRU order
+# and evicted once their estimated size pushes the total over the budget (NFL_CARD_CACHE_MB,
+# default 512), when their TTL runs out, or when a file they depend on changes (mtime/size, or
+# a content hash with hash_deps=True). Hits, misses and sizes are kept per entry, and preload()
+# warms every registered zero-argument loader on a background thread (run_card.py does this
+# at server start).
+"""
+import os
+import sys
+import time
+import hashlib
+import logging
+import threading
+import functools
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_BUDGET_MB = 512
+
+logger = logging.getLogger(__name__)
+
+
+# Function to estimate the memory held by a cached value (frames, arrays and plain objects)
+def estimate_size(value, _seen=None):
+    _seen = set() if _seen is None else _seen
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (str, bytes)):
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(v, _seen) for v in value)
+    if hasattr(value, "__dict__"):
+        return sys.getsizeof(value) + estimate_size(vars(value), _seen)
+    return sys.getsizeof(value)
+
+
+def file_stamp(paths, hash_contents=False):
+    stamp = {}
+    for path in paths:
+        if not os.path.exists(path):
+            stamp[path] = None
+        elif hash_contents:
+            digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+            stamp[path] = digest.hexdigest()
+        else:
+            info = os.stat(path)
+            stamp[path] = (info.st_mtime_ns, info.st_size)
+    return stamp
+
+
+class _Entry:
+    __slots__ = ["value", "size", "created", "ttl", "deps", "stamp", "hits"]
+
+    def __init__(self, value, size, ttl, deps, stamp):
+        self.value = value
+        self.size = size
+        self.created = time.time()
+        self.ttl = ttl
+        self.deps = deps
+        self.stamp = stamp
+        self.hits = 0
+
+
+class DataCache:
+    """LRU cache with a byte budget, per-entry TTL and file-change invalidation."""
+
+    def __init__(self, budget_bytes=None):
+        if budget_bytes is None:
+            mb = float(os.environ.get("NFL_CARD_CACHE_MB", DEFAULT_BUDGET_MB))
+            budget_bytes = int(mb * 1024 * 1024)
+        self.budget_bytes = budget_bytes
+        self.entries = OrderedDict()
+        self.loaders = {}
+        self.counters = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+        self._lock = threading.RLock()
+        self._key_locks = {}
+
+    @property
+    def total_bytes(self):
+        return sum(entry.size for entry in self.entries.values())
+
+    def _expired(self, entry, hash_deps):
+        if entry.ttl is not None and time.time() - entry.created > entry.ttl:
+            return True
+        return bool(entry.deps) and file_stamp(entry.deps, hash_deps) != entry.stamp
+
+    def _evict(self):
+        while self.entries and self.total_bytes > self.budget_bytes:
+            key, entry = self.entries.popitem(last=False)
+            self.counters["evictions"] += 1
+            logger.info("Evicted %s (%.1f MB)", key, entry.size / 1e6)
+
+    def get_or_load(self, key, load, ttl=None, deps=(), hash_deps=False):
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None and not self._expired(entry, hash_deps):
+                entry.hits += 1
+                self.counters["hits"] += 1
+                self.entries.move_to_end(key)
+                return entry.value
+            if entry is not None:
+                del self.entries[key]
+                self.counters["invalidations"] += 1
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # one loader per key at a time; a concurrent caller waits and then hits
+        with key_lock:
+            with self._lock:
+                entry = self.entries.get(key)
+                if entry is not None:
+                    entry.hits += 1
+                    self.counters["hits"] += 1
+                    self.entries.move_to_end(key)
+                    return entry.value
+                self.counters["misses"] += 1
+            try:
+                deps = list(deps)
+                stamp = file_stamp(deps, hash_deps)
+                value = load()
+                size = estimate_size(value)
+                with self._lock:
+                    # values larger than the whole budget are returned but not kept
+                    if size <= self.budget_bytes:
+                        self.entries[key] = _Entry(value, size, ttl, deps, stamp)
+                        self._evict()
+            finally:
+                # the lock is only needed while a load is running; waiters still hold it
+                with self._lock:
+                    if self._key_locks.get(key) is key_lock:
+                        del self._key_locks[key]
+            return value
+
+    def invalidate(self, name=None):
+        with self._lock:
+            keys = [k for k in self.entries if name is None or k[0] == name]
+            for key in keys:
+                del self.entries[key]
+            self.counters["invalidations"] += len(keys)
+            return len(keys)
+
+    def stats(self):
+        with self._lock:
+            now = time.time()
+            rows = [
+                {
+                    "loader": key[0],
+                    "args": repr(key[1:]) if len(key) > 1 else "",
+                    "size_mb": entry.size / 1e6,
+                    "hits": entry.hits,
+                    "age_s": now - entry.created,
+                    "ttl_s": entry.ttl,
+                }
+                for key, entry in reversed(self.entries.items())
+            ]
+            summary = dict(self.counters)
+            summary["entries"] = len(rows)
+            summary["total_mb"] = self.total_bytes / 1e6
+            summary["budget_mb"] = self.budget_bytes / 1e6
+        return pd.DataFrame(rows), summary
+
+    # Decorator: cache a loader's return value per argument tuple
+    def cached(self, name, ttl=None, deps=(), hash_deps=False, preload=False):
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args):
+                key = (name,) + args
+                paths = deps(*args) if callable(deps) else deps
+                return self.get_or_load(key, lambda: func(*args), ttl, paths, hash_deps)
+
+            wrapper.invalidate = lambda: self.invalidate(name)
+            if preload:
+                self.loaders[name] = wrapper
+            return wrapper
+
+        return decorator
+
+    # Function to warm every preload loader; in the background unless wait=True
+    def preload(self, wait=False):
+        def run():
+            for name, loader in list(self.loaders.items()):
+                start = time.perf_counter()
+                try:
+                    loader()
+                    logger.info(
+                        "Preloaded %s in %.0f ms",
+                        name,
+                        (time.perf_counter() - start) * 1e3,
+                    )
+                except Exception as e:
+                    logger.warning("Preload of %s failed: %s", name, e)
+
+        if wait:
+            run()
+            return None
+        thread = threading.Thread(target=run, name="data-cache-preload", daemon=True)
+        thread.start()
+        return thread
+
+
+# The app's shared cache; modules stay imported for the life of the Streamlit server
+data_cache = DataCache()
+cached = data_cache.cached
+
+_preload_started = False
+
+
+# Function to start the warm-up once per server process
+def preload_once(wait=False):
+    global _preload_started
+    with data_cache._lock:
+        if _preload_started:
+            return None
+        _preload_started = True
+    return data_cache.preload(wait)
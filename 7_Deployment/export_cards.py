@@ -0,0 +1,301 @@
+"""
+# Export Cards - batch render of every player card to static HTML (and optionally PDF)
+# Uses the same lookups as the app (player store, game table, headshot assets) to write one file
+# per player: roster info, injury history, prediction and the team schedule with weather/stadium.
+# Teams are spread over a process pool whose workers open the store and game table once, and a
+# card is skipped when a hash of its input rows matches the last export.
+## Run from 7_Deployment: python export_cards.py [--team BAL] [--format html pdf]
+"""
+import os
+import json
+import html
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from player_store import open_player_store, normalize_name
+from game_table import open_game_table, team_games
+from assets import headshot_path
+
+EXPORT_DIR = "./exports/cards"
+MANIFEST = "manifest.json"
+
+# Bump when the card layout changes so every card is re-rendered
+TEMPLATE_VERSION = 1
+
+SCHEDULE_COLUMNS = [
+    "Week",
+    "Season",
+    "Home Team",
+    "Home Final Score",
+    "Visitor Team",
+    "Visitor Final Score",
+    "Temperature",
+    "Weather_Condition",
+    "StadiumName",
+    "RoofType",
+]
+
+# Shared data, loaded once per worker process by _init_worker
+_store = None
+_game_table = None
+
+
+##########################################
+##  Card Data                           ##
+##########################################
+
+
+# Function to gather everything one card shows, keyed the same way as the app; players
+# without a player_key are looked up by name only (see PlayerStore.for_player)
+def card_data(store, game_table, player):
+    key, name = player["player_key"], player["player_name"]
+    injuries = store.for_player("injuries", key, name)
+    prediction = store.for_player("predictions", key, name)
+    schedule = team_games(game_table, player["team"]).reset_index(drop=True)
+    schedule = schedule[[c for c in SCHEDULE_COLUMNS if c in schedule.columns]]
+    return {
+        "player": player,
+        "history_title": store.injury_history_title(),
+        "injuries": injuries[["Injury Category", "Counts"]].reset_index(drop=True),
+        "prediction": prediction.reset_index(drop=True),
+        "schedule": schedule.sort_values("Week").reset_index(drop=True),
+    }
+
+
+# Function to hash the inputs of a card, so unchanged cards can be skipped
+def card_fingerprint(data):
+    digest = hashlib.sha256(str(TEMPLATE_VERSION).encode())
+    digest.update(data["history_title"].encode())
+    digest.update(data["player"].to_json(date_format="iso").encode())
+    for key in ["injuries", "prediction", "schedule"]:
+        digest.update(pd.util.hash_pandas_object(data[key], index=False).values)
+        digest.update(",".join(data[key].columns).encode())
+    return digest.hexdigest()
+
+
+def card_filename(player):
+    key = player.get("gsis_id") or player.get("player_id")
+    if pd.isna(key) or not key:
+        key = normalize_name(player["player_name"]).replace(" ", "_")
+    return f"{player['team']}_{key}"
+
+
+##########################################
+##  Rendering                           ##
+##########################################
+
+
+def _prediction_fields(prediction):
+    if prediction.empty:
+        return "No prediction data available for this player.", None
+    likelihood = prediction["Injured_in_2022"].iloc[0]
+    text = "Highly Likely" if likelihood else "Unlikely"
+    probability = None
+    if "Injury_Probability" in prediction.columns:
+        probability = prediction["Injury_Probability"].iloc[0]
+        if pd.isna(probability):
+            probability = None
+    return text, probability
+
+
+def _table_html(df, empty_text):
+    if df.empty:
+        return f"<p>{html.escape(empty_text)}</p>"
+    return df.to_html(index=False, na_rep="", border=0, classes="card-table")
+
+
+def render_html(data, headshot):
+    player = data["player"]
+    name = html.escape(str(player["player_name"]))
+    prediction_text, probability = _prediction_fields(data["prediction"])
+    probability_html = (
+        f"<p>Injury Probability: {probability:.1%}</p>"
+        if probability is not None
+        else ""
+    )
+    details = [
+        ("Age", player.get("age")),
+        ("Status", player.get("status")),
+        ("Height", player.get("height")),
+        ("Weight", player.get("weight")),
+        ("Team", player.get("team")),
+        ("Jersey Number", player.get("jersey_number")),
+        ("College", player.get("college")),
+        ("Years Exp", player.get("years_exp")),
+    ]
+    details_html = "".join(
+        f"<li>{label}: {html.escape(str(value))}</li>"
+        for label, value in details
+        if pd.notna(value)
+    )
+    # Headshot is embedded relative to the card so the export folder is self-contained
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{name} - 2022 NFL Injury Player Card</title>
+<style>
+body {{ font-family: Arial, sans-serif; max-width: 900px; margin: 0 auto; }}
+.card-table {{ border-collapse: collapse; font-size: 13px; }}
+.card-table td, .card-table th {{ padding: 2px 8px; border-bottom: 1px solid #ddd; }}
+.risk {{ font-size: 18px; font-weight: bold; }}
+</style>
+</head>
+<body>
+<h1>{name}</h1>
+<img src="{html.escape(headshot)}" width="160" alt="{name}">
+<h2>Player Information</h2>
+<ul>{details_html}</ul>
+<h2>{html.escape(data['history_title'])}</h2>
+{_table_html(data["injuries"], f"No injury data available for {player['player_name']}.")}
+<h2>Injury Prediction for This Year</h2>
+<p class="risk">Injury Prediction: {prediction_text}</p>
+{probability_html}
+<h2>Season Schedule</h2>
+{_table_html(data["schedule"], "Schedule not available.")}
+</body>
+</html>
+"""
+
+
+# Function to write the card as a one-page PDF with matplotlib (no extra dependency)
+def render_pdf(data, path):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    player = data["player"]
+    prediction_text, probability = _prediction_fields(data["prediction"])
+    lines = [
+        f"{player['player_name']} - {player['team']} #{player.get('jersey_number')}",
+        f"Age: {player.get('age')}   Status: {player.get('status')}   "
+        f"Height: {player.get('height')}   Weight: {player.get('weight')}",
+        f"College: {player.get('college')}   Years Exp: {player.get('years_exp')}",
+        "",
+        f"Injury Prediction: {prediction_text}"
+        + (f" ({probability:.1%})" if probability is not None else ""),
+        "",
+        f"{data['history_title']}:",
+        data["injuries"].to_string(index=False) if not data["injuries"].empty else "-",
+        "",
+        "Season Schedule:",
+        data["schedule"].to_string(index=False) if not data["schedule"].empty else "-",
+    ]
+    fig = plt.figure(figsize=(8.5, 11))
+    fig.text(0.04, 0.97, "\n".join(lines), va="top", family="monospace", size=6.5)
+    fig.savefig(path + ".tmp", format="pdf")
+    plt.close(fig)
+    os.replace(path + ".tmp", path)
+
+
+##########################################
+##  Batch Export                        ##
+##########################################
+
+
+def _init_worker():
+    global _store, _game_table
+    _store = open_player_store(rebuild_if_stale=False)
+    _game_table = open_game_table(refresh_if_stale=False)
+
+
+# Worker: render every card of one team whose fingerprint changed
+def export_team(team, export_dir, formats, previous):
+    rendered, skipped, fingerprints = 0, 0, {}
+    for _, player in _store.team_players(team).iterrows():
+        data = card_data(_store, _game_table, player)
+        filename = card_filename(player)
+        fingerprint = card_fingerprint(data)
+        fingerprints[filename] = fingerprint
+
+        paths = {fmt: os.path.join(export_dir, f"{filename}.{fmt}") for fmt in formats}
+        if previous.get(filename) == fingerprint and all(
+            os.path.exists(p) for p in paths.values()
+        ):
+            skipped += 1
+            continue
+
+        if "html" in paths:
+            headshot = os.path.relpath(
+                headshot_path(player.get("headshot_url")), export_dir
+            )
+            with open(paths["html"] + ".tmp", "w", encoding="utf-8") as f:
+                f.write(render_html(data, headshot))
+            os.replace(paths["html"] + ".tmp", paths["html"])
+        if "pdf" in paths:
+            render_pdf(data, paths["pdf"])
+        rendered += 1
+    return team, rendered, skipped, fingerprints
+
+
+def export_cards(teams=None, export_dir=EXPORT_DIR, formats=("html",), workers=None):
+    # Refresh the shared inputs once here, workers then open them read-only
+    store = open_player_store()
+    open_game_table()
+    full_run = not teams
+    teams = teams or store.teams()
+
+    os.makedirs(export_dir, exist_ok=True)
+    manifest_path = os.path.join(export_dir, MANIFEST)
+    previous = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            previous = json.load(f)
+
+    totals = {"rendered": 0, "skipped": 0, "removed": 0}
+    # The manifest keeps this run's cards, plus the other teams' entries on a --team run
+    prefixes = tuple(f"{team}_" for team in teams)
+    fingerprints = {
+        k: v for k, v in previous.items() if not full_run and not k.startswith(prefixes)
+    }
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = [
+            pool.submit(
+                export_team,
+                team,
+                export_dir,
+                list(formats),
+                {k: v for k, v in previous.items() if k.startswith(f"{team}_")},
+            )
+            for team in teams
+        ]
+        for future in as_completed(futures):
+            team, rendered, skipped, team_fingerprints = future.result()
+            totals["rendered"] += rendered
+            totals["skipped"] += skipped
+            fingerprints.update(team_fingerprints)
+            print(f"{team}: {rendered} rendered, {skipped} unchanged")
+
+    # Cards that were not exported again (players who left a roster) are deleted
+    for filename in set(previous) - set(fingerprints):
+        for fmt in ["html", "pdf"]:
+            path = os.path.join(export_dir, f"{filename}.{fmt}")
+            if os.path.exists(path):
+                os.remove(path)
+        totals["removed"] += 1
+
+    with open(manifest_path + ".tmp", "w") as f:
+        json.dump(fingerprints, f, indent=2, sort_keys=True)
+    os.replace(manifest_path + ".tmp", manifest_path)
+    return totals
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export static player cards")
+    parser.add_argument("--team", nargs="*", help="only these teams (default: all)")
+    parser.add_argument(
+        "--format", nargs="+", default=["html"], choices=["html", "pdf"]
+    )
+    parser.add_argument("--export-dir", default=EXPORT_DIR)
+    parser.add_argument("--workers", type=int)
+    args = parser.parse_args()
+
+    totals = export_cards(args.team, args.export_dir, args.format, args.workers)
+    print(
+        f"Cards rendered: {totals['rendered']}, unchanged: {totals['skipped']}, "
+        f"removed: {totals['removed']}"
+    )
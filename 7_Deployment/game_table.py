@@ -0,0 +1,313 @@
+"""
+# Game Table - schedule, weather and stadium joined once into one game-level table
+# One row per (Game ID, Team) so a team's season is a single indexed slice for the app.
+# The table is versioned on disk; each row keeps a hash of its game's weather inputs, so a
+# refresh only re-joins games that are new or whose weather rows changed instead of redoing
+# the whole merge.
+## Run from 7_Deployment: python game_table.py [--full]
+"""
+import os
+import sys
+import json
+import time
+
+import pandas as pd
+
+from remote_cache import cached_path
+
+GAMES_PARQ = "../data/games.parq"
+WEATHER_CSV = "./src/nfl_weather_data.csv"
+# Kickoff-window weather per game, built by weather_features.py from meteostat
+GAME_WEATHER_PARQUET = "../data/game_weather.parquet"
+STADIUM_URL = "https://raw.githubusercontent.com/ThompsonJamesBliss/WeatherData/master/data/stadium_coordinates.csv"
+TABLE_DIR = "./configs/game_table"
+
+# Bump when the columns below change so existing tables are rebuilt from scratch
+SCHEMA_VERSION = 3
+KEEP_VERSIONS = 2
+
+TEAM_NAME_MAPPING = {
+    "ARI": "Cardinals",
+    "ATL": "Falcons",
+    "BAL": "Ravens",
+    "BUF": "Bills",
+    "CAR": "Panthers",
+    "CHI": "Bears",
+    "CIN": "Bengals",
+    "CLE": "Browns",
+    "DAL": "Cowboys",
+    "DEN": "Broncos",
+    "DET": "Lions",
+    "GB": "Packers",
+    "HOU": "Texans",
+    "IND": "Colts",
+    "JAX": "Jaguars",
+    "KC": "Chiefs",
+    "LAC": "Chargers",
+    "LAR": "Rams",
+    "LV": "Raiders",
+    "MIA": "Dolphins",
+    "MIN": "Vikings",
+    "NE": "Patriots",
+    "NO": "Saints",
+    "NYG": "Giants",
+    "NYJ": "Jets",
+    "PHI": "Eagles",
+    "PIT": "Steelers",
+    "SF": "49ers",
+    "SEA": "Seahawks",
+    "TB": "Buccaneers",
+    "TEN": "Titans",
+    "WAS": "Washington",
+}
+
+WEATHER_COLUMNS = ["Temperature", "Weather_Condition"]
+STADIUM_COLUMNS = ["StadiumName", "RoofType", "Latitude", "Longitude"]
+KICKOFF_WEATHER_COLUMNS = [
+    "Kickoff_Temp_F",
+    "Kickoff_Precip_mm",
+    "Kickoff_Wind_mph",
+    "Indoors",
+]
+
+
+##########################################
+##  Sources                             ##
+##########################################
+
+
+def read_schedule(path=GAMES_PARQ):
+    schedule = pd.read_parquet(
+        path,
+        columns=[
+            "season",
+            "week",
+            "homeTeamAbbr",
+            "visitorTeamAbbr",
+            "homeFinalScore",
+            "visitorFinalScore",
+            "gameId",
+        ],
+    )
+    schedule = schedule.rename(
+        columns={
+            "season": "Season",
+            "week": "Week",
+            "homeTeamAbbr": "Home Team",
+            "visitorTeamAbbr": "Visitor Team",
+            "homeFinalScore": "Home Final Score",
+            "visitorFinalScore": "Visitor Final Score",
+            "gameId": "Game ID",
+        }
+    )
+    # Convert 'Season' to string to avoid formatting with commas
+    schedule["Season"] = schedule["Season"].astype(int).astype(str)
+    # The first 8 digits of the game id are the game date
+    schedule["Game_Date"] = pd.to_datetime(
+        schedule["Game ID"].astype(str).str[:8], format="%Y%m%d"
+    )
+    return schedule
+
+
+def read_weather(path=WEATHER_CSV):
+    weather = pd.read_csv(path)
+    # Drop the timezone ('EDT') before parsing, only the calendar date is joined on
+    date_time = weather["Date_Time"].str.rsplit(" ", n=1).str[0]
+    weather["Game_Date"] = pd.to_datetime(
+        date_time, format="%m/%d/%y %I:%M %p"
+    ).dt.normalize()
+    weather = weather.drop_duplicates(["Game_Date", "Home_Team", "Away_Team"])
+    return weather[["Game_Date", "Home_Team", "Away_Team"] + WEATHER_COLUMNS]
+
+
+def read_stadiums(url=STADIUM_URL):
+    stadiums = pd.read_csv(cached_path(url))
+    # Some teams have more than one stadium row, keep one so the join can't fan out
+    stadiums = stadiums.drop_duplicates("HomeTeam", keep="last")
+    return stadiums[["HomeTeam"] + STADIUM_COLUMNS]
+
+
+def read_game_weather(path=GAME_WEATHER_PARQUET):
+    if not os.path.exists(path):
+        return None
+    return pd.read_parquet(path, columns=["Game ID"] + KICKOFF_WEATHER_COLUMNS)
+
+
+##########################################
+##  Build                               ##
+##########################################
+
+
+# Function to attach the weather CSV row and the kickoff weather to each scheduled game
+def attach_weather(games, weather, game_weather=None):
+    games = games.copy()
+    games["Home_Team_Full"] = games["Home Team"].map(TEAM_NAME_MAPPING)
+    games["Visitor_Team_Full"] = games["Visitor Team"].map(TEAM_NAME_MAPPING)
+
+    games = games.merge(
+        weather,
+        left_on=["Game_Date", "Home_Team_Full", "Visitor_Team_Full"],
+        right_on=["Game_Date", "Home_Team", "Away_Team"],
+        how="left",
+    ).drop(columns=["Home_Team", "Away_Team"])
+    if game_weather is not None:
+        return games.merge(game_weather, on="Game ID", how="left")
+    return games.assign(**{c: pd.NA for c in KICKOFF_WEATHER_COLUMNS})
+
+
+def _hash_weather(games):
+    columns = games[WEATHER_COLUMNS + KICKOFF_WEATHER_COLUMNS].astype(object)
+    return pd.util.hash_pandas_object(columns, index=False).to_numpy()
+
+
+# Function to hash each game's weather inputs, so a refresh can tell which games changed
+def weather_stamps(schedule, weather, game_weather=None):
+    keys = schedule[["Game ID", "Game_Date", "Home Team", "Visitor Team"]]
+    games = attach_weather(keys, weather, game_weather)
+    return pd.Series(_hash_weather(games), index=games["Game ID"])
+
+
+# Function to join schedule rows with weather and stadium info, one row per team
+def join_games(schedule, weather, stadiums, game_weather=None):
+    games = attach_weather(schedule, weather, game_weather)
+    games = games.merge(
+        stadiums, left_on="Home_Team_Full", right_on="HomeTeam", how="left"
+    ).drop(columns=["HomeTeam"])
+    games["Weather_Stamp"] = _hash_weather(games)
+
+    # Each game appears once for the home team and once for the visitors
+    home = games.assign(Team=games["Home Team"], Is_Home=True)
+    away = games.assign(Team=games["Visitor Team"], Is_Home=False)
+    return pd.concat([home, away], ignore_index=True)
+
+
+def _manifest_path(table_dir):
+    return os.path.join(table_dir, "manifest.json")
+
+
+def read_manifest(table_dir=TABLE_DIR):
+    path = _manifest_path(table_dir)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _source_stamp(paths):
+    return {path: os.path.getmtime(path) for path in paths if os.path.exists(path)}
+
+
+def _write_manifest(manifest, table_dir, sources):
+    manifest["sources"] = _source_stamp(sources)
+    tmp_path = _manifest_path(table_dir) + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, _manifest_path(table_dir))
+    return manifest
+
+
+def _write_table(table, table_dir, manifest, sources):
+    version = (manifest or {}).get("version", 0) + 1
+    table = table.sort_values(["Team", "Season", "Week"], kind="stable")
+    table = table.reset_index(drop=True)
+    table["Team"] = table["Team"].astype("category")
+    file_name = f"games_v{version}.parquet"
+    table.to_parquet(os.path.join(table_dir, file_name), index=False)
+
+    new_manifest = {
+        "version": version,
+        "schema_version": SCHEMA_VERSION,
+        "file": file_name,
+        "built_at": time.time(),
+        "rows": len(table),
+    }
+    # Point the manifest at the new file atomically, then drop old versions
+    _write_manifest(new_manifest, table_dir, sources)
+
+    for old in range(1, version - KEEP_VERSIONS + 1):
+        old_path = os.path.join(table_dir, f"games_v{old}.parquet")
+        if os.path.exists(old_path):
+            os.remove(old_path)
+    return new_manifest
+
+
+# Function to build (full=True) or incrementally refresh the game table
+def refresh_game_table(
+    table_dir=TABLE_DIR,
+    full=False,
+    games_parq=GAMES_PARQ,
+    weather_csv=WEATHER_CSV,
+    game_weather_parquet=GAME_WEATHER_PARQUET,
+):
+    sources = [games_parq, weather_csv, game_weather_parquet]
+    os.makedirs(table_dir, exist_ok=True)
+    manifest = read_manifest(table_dir)
+    if manifest is None or manifest.get("schema_version") != SCHEMA_VERSION:
+        full = True
+
+    schedule = read_schedule(games_parq)
+    weather = read_weather(weather_csv)
+    stadiums = read_stadiums()
+    game_weather = read_game_weather(game_weather_parquet)
+
+    if full:
+        table = join_games(schedule, weather, stadiums, game_weather)
+        return _write_table(table, table_dir, manifest, sources)
+
+    current = pd.read_parquet(os.path.join(table_dir, manifest["file"]))
+    current["Team"] = current["Team"].astype(str)
+
+    # Only new games, and games whose weather rows hash differently now, get re-joined
+    stamps = weather_stamps(schedule, weather, game_weather)
+    previous = current.drop_duplicates("Game ID").set_index("Game ID")["Weather_Stamp"]
+    # nullable ints so unknown games compare as NA instead of a float-rounded hash
+    previous = previous.astype("UInt64").reindex(stamps.index)
+    changed = stamps.ne(previous).fillna(True).to_numpy(dtype=bool)
+    redo = schedule["Game ID"].isin(stamps.index[changed])
+    if not redo.any():
+        return _write_manifest(manifest, table_dir, sources)
+
+    fresh = join_games(schedule[redo], weather, stadiums, game_weather)
+    kept = current[~current["Game ID"].isin(fresh["Game ID"])]
+    return _write_table(
+        pd.concat([kept, fresh], ignore_index=True), table_dir, manifest, sources
+    )
+
+
+def game_table_is_stale(
+    table_dir=TABLE_DIR,
+    games_parq=GAMES_PARQ,
+    weather_csv=WEATHER_CSV,
+    game_weather_parquet=GAME_WEATHER_PARQUET,
+):
+    manifest = read_manifest(table_dir)
+    if manifest is None or manifest.get("schema_version") != SCHEMA_VERSION:
+        return True
+    return manifest.get("sources") != _source_stamp(
+        [games_parq, weather_csv, game_weather_parquet]
+    )
+
+
+##########################################
+##  Read                                ##
+##########################################
+
+
+# Function to load the current table indexed by team, refreshing it if the sources changed
+def open_game_table(table_dir=TABLE_DIR, refresh_if_stale=True):
+    if refresh_if_stale and game_table_is_stale(table_dir):
+        refresh_game_table(table_dir)
+    manifest = read_manifest(table_dir)
+    table = pd.read_parquet(os.path.join(table_dir, manifest["file"]))
+    return table.set_index("Team").sort_index()
+
+
+def team_games(game_table, team):
+    if team not in game_table.index:
+        return game_table.iloc[0:0]
+    return game_table.loc[[team]]
+
+
+if __name__ == "__main__":
+    manifest = refresh_game_table(full="--full" in sys.argv)
+    print(f"Game table v{manifest['version']}: {manifest['rows']} rows")
@@ -0,0 +1,165 @@
+"""
+# Injury Cube - precomputed injury counts behind the Injury Indicator charts
+# inj_ind.csv (one row per lower body injury play) is grouped once into a dense count array over
+# Surface x BodyPart x PlayType x PositionGroup x Severe x play number bin and saved as .npz.
+# Any filtered chart from the EDA notebook is then a sum over cube cells, not a regroup of rows.
+## Run from 7_Deployment: python injury_cube.py
+"""
+import os
+import json
+import numpy as np
+import pandas as pd
+
+INJURY_PLAYS_CSV = "./src/inj_ind.csv"
+CUBE_PATH = "./configs/injury_cube.npz"
+
+DIMENSIONS = ["Surface", "BodyPart", "PlayType", "PositionGroup", "Severe", "PlayBin"]
+# PlayerGamePlay is binned so the play number histogram comes from the cube as well
+PLAY_BIN_WIDTH = 5
+
+# Roster positions -> PositionGroup used in the injury data
+POSITION_GROUPS = {
+    "CB": "DB",
+    "S": "DB",
+    "SS": "DB",
+    "FS": "DB",
+    "DB": "DB",
+    "T": "OL",
+    "G": "OL",
+    "C": "OL",
+    "OT": "OL",
+    "OG": "OL",
+    "OL": "OL",
+    "DE": "DL",
+    "DT": "DL",
+    "NT": "DL",
+    "DL": "DL",
+    "LB": "LB",
+    "ILB": "LB",
+    "OLB": "LB",
+    "MLB": "LB",
+    "WR": "WR",
+    "RB": "RB",
+    "FB": "RB",
+    "TE": "TE",
+}
+
+
+def position_group(position):
+    if pd.isna(position):
+        return None
+    return POSITION_GROUPS.get(str(position).strip().upper())
+
+
+def _play_bins(plays):
+    start = (plays // PLAY_BIN_WIDTH) * PLAY_BIN_WIDTH
+    return start.astype(str) + "-" + (start + PLAY_BIN_WIDTH - 1).astype(str)
+
+
+class InjuryCube:
+    def __init__(self, counts, labels):
+        self.counts = counts
+        self.labels = labels
+        self._positions = {
+            dim: {label: i for i, label in enumerate(values)}
+            for dim, values in labels.items()
+        }
+
+    @property
+    def total(self):
+        return int(self.counts.sum())
+
+    # Function to sum the cube down to `by`, keeping only cells matching the filters
+    # filters: {dimension: value or list of values}, e.g. {"Severe": 1, "Surface": "Synthetic"}
+    def slice(self, by=(), **filters):
+        by = [by] if isinstance(by, str) else list(by)
+        selection = []
+        for dim in DIMENSIONS:
+            if dim in filters and filters[dim] is not None:
+                wanted = filters[dim]
+                if not isinstance(wanted, (list, tuple, set)):
+                    wanted = [wanted]
+                positions = self._positions[dim]
+                selection.append([positions[w] for w in wanted if w in positions])
+            else:
+                selection.append(slice(None))
+
+        # Index one axis at a time so list selections don't broadcast against each other
+        counts = self.counts
+        for axis, sel in enumerate(selection):
+            if not isinstance(sel, slice):
+                counts = np.take(counts, sel, axis=axis)
+
+        drop_axes = tuple(i for i, dim in enumerate(DIMENSIONS) if dim not in by)
+        counts = counts.sum(axis=drop_axes)
+        if not by:
+            return int(counts)
+
+        # Label the remaining axes (in cube order) and return a long count table
+        kept = [dim for dim in DIMENSIONS if dim in by]
+        axes = []
+        for dim, sel in zip(DIMENSIONS, selection):
+            if dim in kept:
+                values = np.asarray(self.labels[dim], dtype=object)
+                axes.append(values if isinstance(sel, slice) else values[sel])
+        index = pd.MultiIndex.from_product(axes, names=kept)
+        table = pd.Series(counts.ravel(), index=index, name="Count").reset_index()
+        return table[by + ["Count"]]
+
+
+##########################################
+##  Build / Load                        ##
+##########################################
+
+
+# Function to group the injury plays once into the dense count array
+def build_injury_cube(source=INJURY_PLAYS_CSV, cube_path=CUBE_PATH):
+    plays = pd.read_csv(source)
+    plays = plays.dropna(subset=["Surface", "BodyPart", "PlayType", "PositionGroup"])
+    plays["Severe"] = plays["Severe"].astype(int)
+    plays["PlayBin"] = _play_bins(plays["PlayerGamePlay"].astype(int))
+
+    labels, codes = {}, []
+    for dim in DIMENSIONS:
+        if dim == "PlayBin":
+            # keep bins in play order, not string order
+            order = plays.drop_duplicates("PlayBin").sort_values("PlayerGamePlay")
+            categories = order["PlayBin"].tolist()
+        else:
+            categories = sorted(plays[dim].unique().tolist())
+        codes.append(pd.Categorical(plays[dim], categories=categories).codes)
+        labels[dim] = categories
+
+    shape = tuple(len(labels[dim]) for dim in DIMENSIONS)
+    counts = np.zeros(shape, dtype=np.int32)
+    np.add.at(counts, tuple(codes), 1)
+
+    os.makedirs(os.path.dirname(cube_path), exist_ok=True)
+    tmp_path = cube_path + ".tmp.npz"
+    np.savez_compressed(
+        tmp_path,
+        counts=counts,
+        labels=json.dumps(labels),
+        source_mtime=os.path.getmtime(source),
+    )
+    os.replace(tmp_path, cube_path)
+    return InjuryCube(counts, labels)
+
+
+def _load_cube(cube_path):
+    with np.load(cube_path) as data:
+        labels = json.loads(str(data["labels"]))
+        return InjuryCube(data["counts"], labels), float(data["source_mtime"])
+
+
+def open_injury_cube(source=INJURY_PLAYS_CSV, cube_path=CUBE_PATH):
+    if os.path.exists(cube_path):
+        cube, source_mtime = _load_cube(cube_path)
+        if not os.path.exists(source) or os.path.getmtime(source) == source_mtime:
+            return cube
+    return build_injury_cube(source, cube_path)
+
+
+if __name__ == "__main__":
+    cube = build_injury_cube()
+    print(f"Built {CUBE_PATH}: {cube.counts.shape} cells, {cube.total} injuries")
@@ -0,0 +1,112 @@
+"""
+# Injury History - filtered reads of the season/week-partitioned injury report store
+# 2_DataCleaning/src/ingest_injuries.py keeps the latest revision of every weekly report under
+# ../data/injury_reports/latest/season=<year>/week=<n>, each file sorted by gsis_id in small
+# row groups. Filters on player, team, season, week and status are handed to pyarrow, so
+# season/week directories outside the filter are never opened and row groups whose gsis_id
+# range misses the player are skipped; only the requested columns are decoded.
+## Run from 7_Deployment: python injury_history.py --player 00-0034796 [--seasons 2021 2022]
+"""
+import os
+import time
+import argparse
+from functools import reduce
+
+import pyarrow.dataset as ds
+
+REPORTS_DIR = "../data/injury_reports/latest"
+# every ingested drop adds a file here, so its mtime changes whenever the reports do
+REPORTS_LOG_DIR = "../data/injury_reports/log"
+
+HISTORY_COLUMNS = [
+    "season",
+    "week",
+    "team",
+    "report_primary_injury",
+    "report_status",
+    "practice_status",
+]
+
+
+def history_available(reports_dir=REPORTS_DIR):
+    return os.path.isdir(reports_dir)
+
+
+def open_reports(reports_dir=REPORTS_DIR):
+    return ds.dataset(reports_dir, format="parquet", partitioning="hive")
+
+
+def _isin(field, values):
+    if values is None:
+        return None
+    values = [values] if isinstance(values, (str, int)) else list(values)
+    return ds.field(field).isin(values)
+
+
+# Function to turn the query arguments into one pyarrow filter expression
+def report_filter(players=None, teams=None, seasons=None, weeks=None, statuses=None):
+    expressions = [
+        _isin("gsis_id", players),
+        _isin("team", teams),
+        _isin("season", seasons),
+        _isin("week", weeks),
+        _isin("report_status", statuses),
+    ]
+    expressions = [e for e in expressions if e is not None]
+    return reduce(lambda a, b: a & b, expressions) if expressions else None
+
+
+# Function to read only the report rows (and columns) matching the filters
+def query_reports(
+    players=None,
+    teams=None,
+    seasons=None,
+    weeks=None,
+    statuses=None,
+    columns=None,
+    reports_dir=REPORTS_DIR,
+):
+    dataset = open_reports(reports_dir)
+    if columns is not None:
+        columns = [c for c in columns if c in dataset.schema.names]
+    table = dataset.to_table(
+        columns=columns,
+        filter=report_filter(players, teams, seasons, weeks, statuses),
+    )
+    reports = table.to_pandas()
+    sort_keys = [c for c in ["season", "week", "gsis_id"] if c in reports.columns]
+    return reports.sort_values(sort_keys, kind="stable").reset_index(drop=True)
+
+
+# Function to get one player's weekly reports, oldest first
+def player_history(gsis_id, seasons=None, reports_dir=REPORTS_DIR):
+    return query_reports(
+        players=gsis_id,
+        seasons=seasons,
+        columns=HISTORY_COLUMNS,
+        reports_dir=reports_dir,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the injury report history")
+    parser.add_argument("--player", nargs="+", help="gsis_id(s)")
+    parser.add_argument("--team", nargs="+")
+    parser.add_argument("--seasons", nargs="+", type=int)
+    parser.add_argument("--weeks", nargs="+", type=int)
+    parser.add_argument("--status", nargs="+", help="e.g. Out Doubtful")
+    parser.add_argument("--reports-dir", default=REPORTS_DIR)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    reports = query_reports(
+        args.player,
+        args.team,
+        args.seasons,
+        args.weeks,
+        args.status,
+        reports_dir=args.reports_dir,
+    )
+    elapsed = time.perf_counter() - start
+    print(reports.to_string(index=False))
+    print(f"{len(reports):,} reports in {elapsed * 1e3:.0f} ms")
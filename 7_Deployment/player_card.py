@@ -8,13 +8,28 @@
 """
 import streamlit as st
 import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
-import seaborn as sns
-import time
-from meteostat import Point, Daily, Hourly
-from datetime import datetime
-import base64
+from player_store import (
+    ROSTERS_CSV,
+    INJURIES_CSV,
+    PREDICTIONS_CSV,
+    PROBABILITIES_PARQUET,
+    INJURY_COUNTS_PARQUET,
+    open_player_store,
+)
+from game_table import (
+    GAMES_PARQ,
+    WEATHER_CSV,
+    GAME_WEATHER_PARQUET,
+    open_game_table,
+    team_games,
+)
+from assets import background_data_uri, headshot_path_nowait
+from injury_cube import INJURY_PLAYS_CSV, open_injury_cube, position_group
+from season_sim import N_SIMS, simulate_team, team_seasons, default_season
+from injury_history import REPORTS_LOG_DIR, history_available, player_history
+from data_cache import cached, data_cache, preload_once
+from render_timing import timed, timed_call, start_run, finish_run, show_timing_panel
 
 st.set_page_config(
     page_title="2022 NFL Injury Player Card",
@@ -27,178 +42,92 @@ st.set_page_config(
 ##########################################
 
 
-@st.cache_data
+# All loaders share one memory-budgeted cache (see data_cache.py); entries are dropped
+# when the files they were built from change, and preload=True ones are warmed at server
+# start when the app is launched with run_card.py
+STORE_SOURCES = [
+    ROSTERS_CSV,
+    INJURIES_CSV,
+    PREDICTIONS_CSV,
+    PROBABILITIES_PARQUET,
+    INJURY_COUNTS_PARQUET,
+]
+
+
+# Columnar store with gsis_id / name indexes, rebuilt when the CSVs change
+@timed_call("load_player_store")
+@cached("player_store", deps=STORE_SOURCES, preload=True)
+def load_player_store():
+    return open_player_store()
+
+
 def load_data():
-    nflplayer = pd.read_csv("../7_Deployment/src/team_rosters.csv")
+    nflplayer = load_player_store().rosters
 
     return nflplayer
 
 
-@st.cache_data
 def load_injuries():
-    nflinjury = pd.read_csv("../7_Deployment/src/clean_merged_data.csv")
-    nflinjury["full_name_lower"] = nflinjury["full_name"].str.lower()
-
-    # Grouping and counting injuries
-    injury_counts = (
-        nflinjury.groupby(["full_name_lower", "injury_category"])
-        .size()
-        .reset_index(name="counts")
-    )
-
-    # Renaming columns but keeping 'full_name_lower' unchanged
-    injury_counts = injury_counts.rename(
-        columns={
-            "full_name_lower": "Full Name Lower",
-            "injury_category": "Injury Category",
-            "counts": "Counts",
-        }
-    )
+    # Injury counts per 'Full Name Lower' and 'Injury Category' are prebuilt in the store
+    injury_counts = load_player_store().injuries
 
     return injury_counts
 
 
-@st.cache_data
 def load_predictions():
-    predictions = pd.read_csv("./configs/player_modeling_data.csv")
-    # Ensure that the player name is in the same format as used in player_info
-    predictions["Player Name"] = predictions["full_name"].str.lower()  # If needed
+    # 'Player Name' is stored lower-cased, the same format as used in player_info
+    predictions = load_player_store().predictions
     return predictions
 
 
-def load_schedule():
-    try:
-        schedule = pd.read_parquet("../data/games.parq")
-        # Select only the required columns
-        schedule = schedule[
-            [
-                "season",
-                "week",
-                "homeTeamAbbr",
-                "visitorTeamAbbr",
-                "homeFinalScore",
-                "visitorFinalScore",
-                "gameId",
-            ]
-        ]
-
-        # Rename columns to proper format
-        schedule = schedule.rename(
-            columns={
-                "season": "Season",
-                "week": "Week",
-                "homeTeamAbbr": "Home Team",
-                "visitorTeamAbbr": "Visitor Team",
-                "homeFinalScore": "Home Final Score",
-                "visitorFinalScore": "Visitor Final Score",
-                "gameId": "Game ID",
-            }
-        )
-
-        # Convert 'Season' to string to avoid formatting with commas
-        schedule["Season"] = schedule["Season"].astype(int).astype(str)
+# Injury counts over surface/body part/play type/position/severity (see injury_cube.py)
+@timed_call("load_injury_cube")
+@cached("injury_cube", deps=[INJURY_PLAYS_CSV], preload=True)
+def load_injury_cube():
+    return open_injury_cube()
 
-        return extract_date_from_game_id(schedule)  # Call the date extraction function
-    except Exception as e:
-        st.error(f"Error loading schedule data: {e}")
-        return pd.DataFrame()  # Return an empty DataFrame in case of error
 
+# Local resized headshot; a miss shows the placeholder and downloads in the background, so
+# the render never waits on the network and the photo appears on a later rerun
+def load_headshot(headshot_url):
+    return headshot_path_nowait(headshot_url)
 
-# Function to extract date from game_id
-def extract_date_from_game_id(schedule):
-    try:
-        # Convert game_id to string
-        schedule["game_id_str"] = schedule["Game ID"].astype(str)
 
-        # Extract the date part (first 8 characters) and convert to datetime
-        schedule["Game_Date"] = pd.to_datetime(
-            schedule["game_id_str"].str[:8], format="%Y%m%d"
-        )
+# Schedule, weather and stadium info joined once per game and team (see game_table.py)
+@cached(
+    "game_table", deps=[GAMES_PARQ, WEATHER_CSV, GAME_WEATHER_PARQUET], preload=True
+)
+def _load_game_table():
+    return open_game_table()
 
-        if "Game_Date" not in schedule.columns:
-            raise ValueError("Game_Date column not added to schedule")
 
-        return schedule
+@timed_call("load_game_table")
+def load_game_table():
+    # Failures are shown but not cached, so the next rerun tries again
+    try:
+        return _load_game_table()
     except Exception as e:
-        st.error(f"Error extracting dates from game_id: {e}")
-        return pd.DataFrame()
+        st.error(f"Error loading schedule data: {e}")
+        return pd.DataFrame()  # Return an empty DataFrame in case of error
 
 
-# Load Game Data
-@st.cache_data
-def load_game():
-    url = "https://raw.githubusercontent.com/ThompsonJamesBliss/WeatherData/master/data/games.csv"
-    games_df = pd.read_csv(url)
-    filtered_games_df = games_df[games_df["Season"].isin([2020, 2021, 2022])]
-    return filtered_games_df
-
-
-# Load Weather Data
-@st.cache_data
-def load_stadium_weather():
-    csv_path = "./src/nfl_weather_data.csv"  # Adjust the path if necessary
-    weather_df = pd.read_csv(csv_path)
-    # Removing timezone information from the 'Date_Time' column
-    weather_df["Date_Time"] = weather_df["Date_Time"].str.rsplit(" ", 1).str[0]
-    # Convert the 'Date_Time' column to datetime objects
-    weather_df["Game_Date"] = pd.to_datetime(
-        weather_df["Date_Time"], format="%m/%d/%y %I:%M %p"
+# Monte Carlo roster availability for one team (see season_sim.py); seeded so reruns agree
+@timed_call("load_season_simulation")
+@cached("season_simulation", deps=STORE_SOURCES + [GAMES_PARQ, INJURY_PLAYS_CSV])
+def load_season_simulation(team, season, n_sims):
+    return simulate_team(
+        load_player_store(), _load_game_table(), team, n_sims, seed=42, season=season
     )
 
-    # Extract the year from TimeMeasure and filter based on the year
-    weather_df["Year"] = weather_df["Game_Date"].dt.year
-    weather_df["game_id"] = weather_df["Game_Date"].dt.strftime("%Y%m%d")
-    # weather_df["game_id"] = weather_df["Game_Date"].astype(str).str[:10]
-    weather_df = weather_df[weather_df["Year"].isin([2020, 2021, 2022])]
-
-    return weather_df
-
-
-# Load Stadium Coordinates
-@st.cache_data
-def load_stadium_coordinates():
-    url = "https://raw.githubusercontent.com/ThompsonJamesBliss/WeatherData/master/data/stadium_coordinates.csv"
-    stadium_data = pd.read_csv(url)
-    return stadium_data
-
-
-@st.cache_data
-def get_team_name_mapping():
-    team_name_mapping = {
-        "ARI": "Cardinals",
-        "ATL": "Falcons",
-        "BAL": "Ravens",
-        "BUF": "Bills",
-        "CAR": "Panthers",
-        "CHI": "Bears",
-        "CIN": "Bengals",
-        "CLE": "Browns",
-        "DAL": "Cowboys",
-        "DEN": "Broncos",
-        "DET": "Lions",
-        "GB": "Packers",
-        "HOU": "Texans",
-        "IND": "Colts",
-        "JAX": "Jaguars",
-        "KC": "Chiefs",
-        "LAC": "Chargers",
-        "LAR": "Rams",
-        "LV": "Raiders",
-        "MIA": "Dolphins",
-        "MIN": "Vikings",
-        "NE": "Patriots",
-        "NO": "Saints",
-        "NYG": "Giants",
-        "NYJ": "Jets",
-        "PHI": "Eagles",
-        "PIT": "Steelers",
-        "SF": "49ers",
-        "SEA": "Seahawks",
-        "TB": "Buccaneers",
-        "TEN": "Titans",
-        "WAS": "Washington",
-    }
-    return team_name_mapping
+
+# One player's weekly reports, read with pushed-down filters from the partitioned report
+# store (see injury_history.py); empty when the store has not been built
+@timed_call("load_player_history")
+@cached("player_history", deps=[REPORTS_LOG_DIR])
+def load_player_history(gsis_id):
+    if not history_available():
+        return pd.DataFrame()
+    return player_history(gsis_id)
 
 
 ##########################################
@@ -241,15 +170,19 @@ st.markdown(
 )
 
 
+# Background encoded once per process (and kept on disk) instead of on every rerun
+@cached("background", deps=lambda side_bg: [side_bg])
+def load_background(side_bg):
+    return background_data_uri(side_bg)
+
+
 # Add a football field image to the sidebar
 def sidebar_bg(side_bg):
-    side_bg_ext = "webp"
-
     st.markdown(
         f"""
       <style>
       [data-testid="stSidebar"] > div:first-child {{
-          background: url(data:image/{side_bg_ext};base64,{base64.b64encode(open(side_bg, "rb").read()).decode()});
+          background: url({load_background(side_bg)});
           background-repeat: no-repeat; 
           background-size: cover; 
       }}
@@ -294,17 +227,17 @@ customize_sidebar()
 # Function to show player information
 def show_player_info():
     st.header("Player Information")
-    nflplayer = load_data()
+    store = load_player_store()
 
     # Sidebar for Team and Player Selection
-    teams = nflplayer["team"].unique()
-    default_team_index = teams.tolist().index("BAL") if "BAL" in teams else 0
+    teams = store.teams()
+    default_team_index = teams.index("BAL") if "BAL" in teams else 0
     selected_team = st.sidebar.selectbox(
         "Select a team", teams, index=default_team_index
     )
 
-    # Filter players based on selected team
-    team_players = nflplayer[nflplayer["team"] == selected_team]
+    # Players for the selected team (one contiguous slice of the store)
+    team_players = store.team_players(selected_team)
 
     # Player Selection with Lamar Jackson as default (if available)
     player_names = team_players["player_name"].unique()
@@ -319,13 +252,9 @@ def show_player_info():
 
     # Display selected player's information
     if selected_player:
-        player_info = team_players[team_players["player_name"] == selected_player]
+        player_info = store.roster_by_name(selected_player, team=selected_team).copy()
         player_info["player_name_lower"] = player_info["player_name"].str.lower()
 
-    with st.spinner(text="In progress"):
-        time.sleep(2)
-        # st.success("Done")
-
     # 2x2 Grid Layout
     col1, col2, col3, col4 = st.columns(4)
 
@@ -357,8 +286,8 @@ def show_player_info():
     # Display player headshot in the sidebar if URL exists
     if not player_info["headshot_url"].empty:
         headshot_url = player_info["headshot_url"].iloc[0]
-        if headshot_url:
-            st.sidebar.image(headshot_url, caption=selected_player)
+        # Served from the local resized copy, or a placeholder when there is no photo
+        st.sidebar.image(load_headshot(headshot_url), caption=selected_player)
     # Sidebar for Page Selection - Moved here to be under the player's photo
     page = st.sidebar.selectbox(
         "Choose a Page",
@@ -374,13 +303,36 @@ def show_player_info():
 ########################################################
 
 
+# Function to list a player's weekly injury reports by season
+def show_weekly_reports(player_info, player_injuries):
+    for frame in [player_info, player_injuries]:
+        if "gsis_id" in frame.columns and frame["gsis_id"].notna().any():
+            gsis_id = str(frame["gsis_id"].dropna().iloc[0])
+            break
+    else:
+        return
+
+    history = load_player_history(gsis_id)
+    if history.empty:
+        return
+    with st.expander(f"Weekly Injury Reports ({len(history)})"):
+        history = history.rename(
+            columns={
+                "season": "Season",
+                "week": "Week",
+                "team": "Team",
+                "report_primary_injury": "Injury",
+                "report_status": "Game Status",
+                "practice_status": "Practice",
+            }
+        )
+        st.dataframe(history, hide_index=True)
+
+
 # Function to show injury prediction visualization
-def show_injury_prediction(player_info, injury_data):
+def show_injury_prediction(player_info, store):
     st.header("Injury Prediction Visualization")
 
-    # Load predictions
-    predictions = load_predictions()
-
     col1, col2 = st.columns(2)
 
     with col1:
@@ -388,15 +340,12 @@ def show_injury_prediction(player_info, injury_data):
 
         if not player_info.empty:
             player_name = player_info["player_name"].iloc[0]
-            player_name_lower = player_name.lower()  # Convert to lowercase for matching
-
-            # Filter the injury data for the selected player
-            player_injuries = injury_data[
-                injury_data["Full Name Lower"] == player_name_lower
-            ]
+            # Integer-keyed lookup of the injury counts for the selected player
+            player_key = player_info["player_key"].iloc[0]
+            player_injuries = store.for_player("injuries", player_key, player_name)
 
             if not player_injuries.empty:
-                st.write(f"2020-2022 Injury History for {player_name}:")
+                st.write(f"{store.injury_history_title()} for {player_name}:")
                 # Set 'Season' as the index
                 if (
                     "Season" in player_injuries.columns
@@ -409,6 +358,8 @@ def show_injury_prediction(player_info, injury_data):
                 )
             else:
                 st.write(f"No injury data available for {player_name}.")
+
+            show_weekly_reports(player_info, player_injuries)
         else:
             st.write("Please select a player.")
 
@@ -416,26 +367,35 @@ def show_injury_prediction(player_info, injury_data):
         st.subheader("Injury Prediction for This Year")
 
         if not player_info.empty:
-            player_name = player_info["player_name"].iloc[0].lower()
-            prediction = predictions[predictions["Player Name"] == player_name]
+            player_name = player_info["player_name"].iloc[0]
+            player_key = player_info["player_key"].iloc[0]
+            prediction = store.for_player("predictions", player_key, player_name)
 
             if not prediction.empty:
                 # Example: Assuming prediction has a column 'Injury Likelihood' with boolean values
                 likelihood = prediction["Injured_in_2022"].iloc[0]
 
                 # Custom bar chart using Matplotlib
-                fig, ax = plt.subplots()
-                bars = ax.bar(
-                    ["Injury Prediction"], [1], color="red" if likelihood else "green"
-                )
-                ax.set_yticks([])
-                ax.set_xticks([])
-                plt.box(False)
-                st.pyplot(fig)
+                with timed("prediction_figure"):
+                    fig, ax = plt.subplots()
+                    bars = ax.bar(
+                        ["Injury Prediction"],
+                        [1],
+                        color="red" if likelihood else "green",
+                    )
+                    ax.set_yticks([])
+                    ax.set_xticks([])
+                    plt.box(False)
+                    st.pyplot(fig)
 
                 # Textual Prediction
                 prediction_text = "Highly Likely" if likelihood else "Unlikely"
                 st.write(f"Injury Prediction: {prediction_text}")
+                # Probability from the batch-scored model, when it has been run
+                if "Injury_Probability" in prediction.columns:
+                    probability = prediction["Injury_Probability"].iloc[0]
+                    if pd.notna(probability):
+                        st.write(f"Injury Probability: {probability:.1%}")
             else:
                 st.write("No prediction data available for this player.")
         else:
@@ -446,22 +406,11 @@ def show_injury_prediction(player_info, injury_data):
 ## Season Schedule Section              ##
 ##########################################
 # Functin to get player schedule
-def get_player_schedule(player_info, schedule):
-    if not player_info.empty:
+def get_player_schedule(player_info, game_table):
+    if not player_info.empty and not game_table.empty:
         player_team = player_info["team"].iloc[0]
-        player_schedule = schedule.loc[
-            (schedule["Home Team"] == player_team)
-            | (schedule["Visitor Team"] == player_team),
-            [
-                "Week",
-                "Season",
-                "Home Team",
-                "Visitor Team",
-                "Home Final Score",
-                "Visitor Final Score",
-                "Game ID",
-            ],
-        ].copy()
+        # The game table is indexed by team, so this is a slice rather than a scan
+        player_schedule = team_games(game_table, player_team).reset_index(drop=True)
         # Set 'Week' as the index
         player_schedule.set_index("Week", inplace=True)
         return player_schedule
@@ -470,12 +419,10 @@ def get_player_schedule(player_info, schedule):
 
 
 # Function to show season schedule
-def show_season_schedule(
-    player_info, schedule, weather_data, stadium_data, team_name_mapping
-):
+def show_season_schedule(player_info, game_table):
     st.header("Season Schedule")
 
-    player_schedule = get_player_schedule(player_info, schedule)
+    player_schedule = get_player_schedule(player_info, game_table)
 
     if not player_schedule.empty:
         # Resetting index if 'Week' is set as index
@@ -523,58 +470,56 @@ def show_season_schedule(
             st.write("Selected week not available in schedule.")
 
 
-##########################################
-## Weather Stadium Section              ##
-##########################################
-def merge_data(schedule, weather_data, stadium_data, team_name_mapping):
-    # Convert team abbreviations to full names in schedule
-    schedule["Home_Team_Full"] = schedule["Home Team"].map(team_name_mapping)
-    schedule["Away_Team_Full"] = schedule["Visitor Team"].map(team_name_mapping)
-
-    # Merge schedule with weather data
-    merged_schedule = pd.merge(
-        schedule,
-        weather_data,
-        left_on=["Game Date", "Home_Team_Full", "Away_Team_Full"],
-        right_on=["Game Date", "Home_Team", "Away_Team"],
-        how="left",
-    )
-
-    # Merge with stadium data
-    merged_schedule = pd.merge(
-        merged_schedule,
-        stadium_data,
-        left_on="Home_Team_Full",
-        right_on="HomeTeam",
-        how="left",
+# Function to show the simulated games missed for the player's team
+def show_season_simulation(player_info):
+    st.header("Season Availability Simulation")
+    if player_info.empty:
+        st.write("Please select a player.")
+        return
+    team = player_info["team"].iloc[0]
+    if not st.checkbox(f"Simulate {team}'s roster availability"):
+        return
+    game_table = load_game_table()
+    seasons = team_seasons(game_table, team)
+    if not seasons:
+        st.write(f"No roster or schedule available for {team}.")
+        return
+    season = st.selectbox(
+        "Schedule season",
+        seasons,
+        index=seasons.index(default_season(load_player_store(), game_table, team)),
     )
-
-    return merged_schedule
-
-
-def merge_schedule_with_weather_data(schedule, weather_data, team_name_mapping):
-    # Convert team abbreviations to full names
-    schedule["Home_Team_Full"] = schedule["Home Team"].map(team_name_mapping)
-    schedule["Visitor_Team_Full"] = schedule["Visitor Team"].map(team_name_mapping)
-
-    # Ensure date formats are consistent
-    schedule["Game_Date"] = pd.to_datetime(schedule["Game_Date"])
-    weather_data["Game_Date"] = pd.to_datetime(weather_data["Date_Time"]).dt.strftime(
-        "%Y%m%d"
+    n_sims = st.select_slider(
+        "Simulated seasons", options=[5_000, 10_000, 20_000, 50_000], value=N_SIMS
     )
-    weather_data["Game_Date"] = pd.to_datetime(weather_data["Game_Date"])
-
-    # Merge the dataframes
-    merged_data = pd.merge(
-        schedule,
-        weather_data,
-        left_on=["Game_Date", "Home_Team_Full", "Visitor_Team_Full"],
-        right_on=["Game_Date", "Home_Team", "Away_Team"],
-        how="left",
+    try:
+        results = load_season_simulation(team, season, n_sims)
+    except Exception as e:
+        st.error(f"Error running the season simulation: {e}")
+        return
+    if results is None:
+        st.write(f"No roster or schedule available for {team}.")
+        return
+
+    total = results["total"].iloc[0]
+    st.write(
+        f"Games missed across the roster: {total['mean']:.1f} on average "
+        f"(10th-90th percentile {total['p10']:.0f}-{total['p90']:.0f})"
     )
-    return merged_data
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Games Missed by Position Group")
+        st.dataframe(results["by_group"].round(1), hide_index=True)
+    with col2:
+        st.subheader("Players Out by Week")
+        st.line_chart(results["by_week"].set_index("Week")[["mean", "p90"]])
+    st.subheader("Most Games Missed")
+    st.dataframe(results["players"].head(10).round(3), hide_index=True)
 
 
+##########################################
+## Weather Stadium Section              ##
+##########################################
 def display_weather_stadium_info(week_games):
     for _, week_game in week_games.iterrows():
         # Display game details
@@ -587,17 +532,28 @@ def display_weather_stadium_info(week_games):
 
         with col1:
             st.subheader("Weather Information")
-            if "Temperature" in week_game and "Weather_Condition" in week_game:
+            # Games with no scraped weather come through the left join as NaN
+            if pd.notna(week_game.get("Temperature")):
                 temperature = week_game["Temperature"]
                 weather_condition = week_game["Weather_Condition"]
                 st.write(f"Temperature: {temperature}")
                 st.write(f"Weather Condition: {weather_condition}")
-            else:
+            # Kickoff-window observations from meteostat (weather_features.py)
+            indoors = week_game.get("Indoors")
+            if pd.notna(indoors) and bool(indoors):
+                st.write("Kickoff: indoors")
+            elif pd.notna(week_game.get("Kickoff_Temp_F")):
+                st.write(
+                    f"Kickoff: {week_game['Kickoff_Temp_F']:.0f} °F, "
+                    f"wind {week_game['Kickoff_Wind_mph']:.0f} mph, "
+                    f"precipitation {week_game['Kickoff_Precip_mm']:.1f} mm"
+                )
+            elif pd.isna(week_game.get("Temperature")):
                 st.write("Weather information not available")
 
         with col2:
             st.subheader("Stadium Information")
-            if "StadiumName" in week_game and "RoofType" in week_game:
+            if pd.notna(week_game.get("StadiumName")):
                 stadium_name = week_game["StadiumName"]
                 roof_type = week_game["RoofType"]
                 st.write(f"Stadium: {stadium_name}")
@@ -611,36 +567,80 @@ def display_weather_stadium_info(week_games):
 ##########################################
 
 
-# Function to show another injury indicator
-def show_injury_indicator():
+# Chart settings: x axis, hue and fixed filters for each of the EDA notebook's charts
+INDICATOR_CHARTS = {
+    "Severe Lower Body Injuries by Surface Type": (
+        "BodyPart",
+        "Surface",
+        {"Severe": 1},
+    ),
+    "Lower Body Injuries per Play Type and Surface": ("PlayType", "Surface", {}),
+    "Lower Body Injuries per Position by Surface Type": (
+        "PositionGroup",
+        "Surface",
+        {},
+    ),
+    "Lower Body Injuries by Surface Type": ("BodyPart", "Surface", {}),
+    "Distribution of Play Number": ("PlayBin", None, {}),
+}
+
+
+# Function to show another injury indicator, drawn live from the injury cube
+def show_injury_indicator(player_info=None, cube=None):
     st.header("Injury Indicator")
+    cube = cube if cube is not None else load_injury_cube()
 
-    # Create a dropdown to select the image
-    selected_image = st.selectbox(
-        "Select an Injury Indicator Image",
-        [
-            "Severe Lower Body Injuries by Surface Type",
-            "Lower Body Injuries per Play Type and Surface",
-            "Lower Body Injuries per Position by Surface Type",
-            "Lower Body Injuries by Surface Type",
-            "Distribution of Play Number",
-        ],
+    # Create a dropdown to select the chart
+    selected_chart = st.selectbox(
+        "Select an Injury Indicator Chart", list(INDICATOR_CHARTS)
     )
+    x, hue, filters = INDICATOR_CHARTS[selected_chart]
+    filters = dict(filters)
 
-    # Define a dictionary to map the selected option to the corresponding image path
-    image_paths = {
-        "Severe Lower Body Injuries by Surface Type": "./src/severe_inj_by_surface.jpeg",
-        "Lower Body Injuries per Play Type and Surface": "./src/play_type_injs.jpeg",
-        "Lower Body Injuries per Position by Surface Type": "./src/inj_position_surface.jpeg",
-        "Lower Body Injuries by Surface Type": "./src/inj_by_surface.jpeg",
-        "Distribution of Play Number": "./src/distribution_play_num.jpeg",
-    }
-
-    # Display the selected image
-    if selected_image in image_paths:
-        st.image(image_paths[selected_image], caption=selected_image)
-    else:
-        st.write("Please select an image from the dropdown menu.")
+    # Optional filters, each one only narrows the cube cells that get summed
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        surfaces = st.multiselect(
+            "Surface", cube.labels["Surface"], default=cube.labels["Surface"]
+        )
+        filters["Surface"] = surfaces
+    with col2:
+        body_parts = st.multiselect(
+            "Body Part", cube.labels["BodyPart"], default=cube.labels["BodyPart"]
+        )
+        filters["BodyPart"] = body_parts
+    with col3:
+        if "Severe" not in filters and st.checkbox("Severe only (42+ days missed)"):
+            filters["Severe"] = 1
+        group = None
+        if player_info is not None and not player_info.empty:
+            group = position_group(player_info["position"].iloc[0])
+        if group and x != "PositionGroup":
+            if st.checkbox(f"Only {group} injuries (player's position group)"):
+                filters["PositionGroup"] = group
+
+    counts = cube.slice([x] if hue is None else [x, hue], **filters)
+    if counts.empty or counts["Count"].sum() == 0:
+        st.write("No injuries match the selected filters.")
+        return
+
+    # Rendered at screen resolution from the summed counts
+    with timed("indicator_figure"):
+        fig, ax = plt.subplots(figsize=(8, 5), dpi=100)
+        if hue is None:
+            ax.bar(counts[x].astype(str), counts["Count"])
+        else:
+            table = counts.pivot(index=x, columns=hue, values="Count").fillna(0)
+            table.plot.bar(ax=ax, rot=0)
+            ax.legend(loc="upper right")
+        ax.set_title(selected_chart, size=12)
+        ax.set_ylabel("Count")
+        ax.set_xlabel(x)
+        if x in ("PlayType", "PlayBin"):
+            plt.setp(ax.get_xticklabels(), rotation=45, ha="right")
+        fig.tight_layout()
+        st.pyplot(fig)
+        plt.close(fig)
 
 
 ##########################################
@@ -648,38 +648,60 @@ def show_injury_indicator():
 ##########################################
 
 
+# Debug panel with the data cache's entries and hit/miss counters
+def show_cache_panel():
+    entries, summary = data_cache.stats()
+    with st.sidebar.expander("Data cache", expanded=False):
+        st.write(
+            f"{summary['entries']} entries, {summary['total_mb']:.1f} of "
+            f"{summary['budget_mb']:.0f} MB, {summary['hits']} hits / "
+            f"{summary['misses']} misses, {summary['evictions']} evictions"
+        )
+        st.dataframe(entries, hide_index=True)
+
+
 # Main App
 def main():
-    st.title("2022 NFL Injury Player Cards")
+    # Render timings are recorded every run; memory only when the debug panel is on
+    show_timings = st.session_state.get("show_render_timings", False)
+    start_run(track_memory=show_timings or None)
+    # Without run_card.py nothing warmed the cache at server start, so the first run starts it
+    preload_once()
 
-    # Retrieve the team name mapping
-    team_name_mapping = get_team_name_mapping()
+    st.title("2022 NFL Injury Player Cards")
 
     # Retrieve player info and the selected page
-    player_info, page = show_player_info()
+    with timed("show_player_info"):
+        player_info, page = show_player_info()
 
     # Load various datasets
-    injury_data = load_injuries()
-    schedule = load_schedule()
-    weather_data = load_stadium_weather()
-    stadium_data = load_stadium_coordinates()
+    store = load_player_store()
 
     # Display content based on the selected page
     if page == "Player Info and Prediction":
-        show_injury_prediction(player_info, injury_data)
+        with timed("show_injury_prediction"):
+            show_injury_prediction(player_info, store)
     elif page == "Season Schedule and Injury Indicator":
-        # Merge schedule with weather data
-        merged_schedule = merge_schedule_with_weather_data(
-            schedule, weather_data, team_name_mapping
-        )
+        # Schedule already joined with weather and stadium data
+        game_table = load_game_table()
 
-        # Display the season schedule, including the team name mapping
-        show_season_schedule(
-            player_info, merged_schedule, weather_data, stadium_data, team_name_mapping
-        )
+        # Display the season schedule with weather and stadium info per week
+        with timed("show_season_schedule"):
+            show_season_schedule(player_info, game_table)
+
+        with timed("show_season_simulation"):
+            show_season_simulation(player_info)
 
         # Show additional injury indicator if needed
-        show_injury_indicator()
+        with timed("show_injury_indicator"):
+            show_injury_indicator(player_info)
+
+    # Optional debug panel with this run's section timings
+    st.sidebar.checkbox("Show render timings", key="show_render_timings")
+    summary = finish_run(page)
+    if show_timings:
+        show_timing_panel(summary)
+        show_cache_panel()
 
 
 if __name__ == "__main__":
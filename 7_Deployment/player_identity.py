@@ -0,0 +1,232 @@
+"""
+# Player Identity - resolves any spelling of a player's name to a gsis_id
+# Names are canonicalized (accents, punctuation, case and Jr./Sr./II-V suffixes removed) and
+# looked up in an exact-key table built from the rosters plus a persistent alias table. Names
+# that still miss go through a character trigram index, where a match must also agree with the
+# team/position hints; unresolved names get no player_key (-1) rather than a best guess.
+# Every gsis_id also gets a small integer player_key, so the store's joins are integer-keyed.
+## Run from 7_Deployment: python player_identity.py "Odell Beckham Jr." [--team BAL]
+"""
+import os
+import re
+import argparse
+import unicodedata
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+ROSTERS_CSV = "./src/team_rosters.csv"
+IDENTITY_DIR = "./configs/identity"
+# Hand-maintained name -> gsis_id overrides, merged with the aliases learned from the sources
+ALIASES_PARQUET = os.path.join(IDENTITY_DIR, "aliases.parquet")
+
+SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
+MIN_SIMILARITY = 0.5
+
+
+##########################################
+##  Name Keys                           ##
+##########################################
+
+
+# Function to reduce a name to its canonical key: 'D.J. Moore Jr.' -> 'dj moore'
+@lru_cache(maxsize=65536)
+def canonical_name(name):
+    if name is None or (isinstance(name, float) and np.isnan(name)):
+        return ""
+    text = unicodedata.normalize("NFKD", str(name))
+    text = text.encode("ascii", "ignore").decode().lower()
+    text = re.sub(r"[.'`]", "", text)  # D.J. -> dj, O'Shea -> oshea
+    tokens = re.sub(r"[^a-z0-9]+", " ", text).split()
+    while len(tokens) > 1 and tokens[-1] in SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+##########################################
+##  Resolver                            ##
+##########################################
+
+
+class IdentityResolver:
+    """Name variants -> gsis_id, exact through the key table, fuzzy through trigrams."""
+
+    def __init__(self, players, aliases=None):
+        # players: one row per gsis_id with name, team and position
+        players = players.drop_duplicates("gsis_id", keep="last").reset_index(drop=True)
+        self.gsis_ids = players["gsis_id"].astype(str).to_numpy()
+        self.player_keys = {gsis_id: key for key, gsis_id in enumerate(self.gsis_ids)}
+        self.teams = players["team"].astype(str).to_numpy()
+        self.positions = players["position"].astype(str).to_numpy()
+
+        keys = players["player_name"].map(canonical_name)
+        self.exact = {}
+        for key, code in zip(keys, range(len(players))):
+            self.exact.setdefault(key, []).append(code)
+        if aliases is not None:
+            for alias, gsis_id in zip(aliases["alias"], aliases["gsis_id"]):
+                code = self.player_keys.get(gsis_id)
+                if code is not None:
+                    codes = self.exact.setdefault(canonical_name(alias), [])
+                    if code not in codes:
+                        codes.append(code)
+
+        # trigram -> array of name ids, over every key (roster names and aliases)
+        self.names = list(self.exact)
+        postings = {}
+        for name_id, key in enumerate(self.names):
+            for gram in trigrams(key):
+                postings.setdefault(gram, []).append(name_id)
+        self.postings = {
+            g: np.array(ids, dtype=np.int32) for g, ids in postings.items()
+        }
+        self.gram_counts = np.array([len(trigrams(k)) for k in self.names])
+        self._cache = {}
+
+    def _pick(self, codes, team=None, position=None):
+        if len(codes) == 1:
+            return codes[0]
+        # duplicate names: narrow down with the hints, give up if still ambiguous
+        for hint, values in [(team, self.teams), (position, self.positions)]:
+            if hint is not None:
+                narrowed = [c for c in codes if values[c] == str(hint)]
+                if narrowed:
+                    codes = narrowed
+        return codes[0] if len(codes) == 1 else None
+
+    def _fuzzy(self, key):
+        grams = [self.postings[g] for g in trigrams(key) if g in self.postings]
+        if not grams:
+            return []
+        shared = np.bincount(np.concatenate(grams), minlength=len(self.names))
+        similarity = shared / (len(trigrams(key)) + self.gram_counts - shared)
+        best = similarity.max()
+        if best < MIN_SIMILARITY:
+            return []
+        return [
+            c
+            for i in np.flatnonzero(similarity == best)
+            for c in self.exact[self.names[i]]
+        ]
+
+    # A near-miss spelling only counts when it also agrees with every hint given, so a
+    # similarly named player on another team/position never takes over someone's rows
+    def _fuzzy_match(self, key, team=None, position=None):
+        if team is None and position is None:
+            return []
+        return [
+            c
+            for c in self._fuzzy(key)
+            if (team is None or self.teams[c] == str(team))
+            and (position is None or self.positions[c] == str(position))
+        ]
+
+    def resolve_code(self, name, team=None, position=None):
+        cache_key = (name, team, position)
+        if cache_key in self._cache:
+            return self._cache[cache_key]
+        key = canonical_name(name)
+        codes = self.exact.get(key) or (
+            self._fuzzy_match(key, team, position) if key else []
+        )
+        code = self._pick(codes, team, position) if codes else None
+        self._cache[cache_key] = code
+        return code
+
+    def resolve(self, name, team=None, position=None):
+        code = self.resolve_code(name, team, position)
+        return None if code is None else self.gsis_ids[code]
+
+    # Function to resolve a whole column; each distinct (name, team, position) once
+    def resolve_many(self, names, teams=None, positions=None):
+        def hints(values):
+            if values is None:
+                return [None] * len(names)
+            return [v if pd.notna(v) else None for v in values]
+
+        rows = list(zip(names, hints(teams), hints(positions)))
+        resolved = {row: self.resolve(*row) for row in set(rows)}
+        return np.array([resolved[row] for row in rows], dtype=object)
+
+    def player_key(self, gsis_id):
+        return self.player_keys.get(gsis_id, -1)
+
+    # Integer keys for a gsis_id column (-1 where unknown)
+    def player_keys_for(self, gsis_ids):
+        return (
+            pd.Series(gsis_ids, dtype=object)
+            .map(self.player_keys)
+            .fillna(-1)
+            .astype("int32")
+            .to_numpy()
+        )
+
+
+##########################################
+##  Build / Load                        ##
+##########################################
+
+
+def read_aliases(path=ALIASES_PARQUET):
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=["alias", "gsis_id", "source"])
+    return pd.read_parquet(path)
+
+
+# Function to add the name variants a source table pairs with a gsis_id to `aliases`
+def merge_aliases(aliases, df, name_column, source):
+    seen = df[[name_column, "gsis_id"]].dropna().drop_duplicates()
+    seen = seen.rename(columns={name_column: "alias"}).assign(source=source)
+    aliases = pd.concat([aliases, seen], ignore_index=True)
+    return aliases.drop_duplicates(["alias", "gsis_id"], keep="first")
+
+
+def write_aliases(aliases, path=ALIASES_PARQUET):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    aliases.to_parquet(path + ".tmp", index=False)
+    os.replace(path + ".tmp", path)
+
+
+# Function to record name variants seen in a source table against their gsis_id
+def learn_aliases(df, name_column, source, path=ALIASES_PARQUET):
+    aliases = merge_aliases(read_aliases(path), df, name_column, source)
+    write_aliases(aliases, path)
+    return aliases
+
+
+def add_alias(alias, gsis_id, path=ALIASES_PARQUET):
+    return learn_aliases(
+        pd.DataFrame({"alias": [alias], "gsis_id": [gsis_id]}), "alias", "manual", path
+    )
+
+
+def roster_players(rosters):
+    id_column = "gsis_id" if "gsis_id" in rosters.columns else "player_id"
+    players = rosters.rename(columns={id_column: "gsis_id"})
+    return players.dropna(subset=["gsis_id"])[
+        ["gsis_id", "player_name", "team", "position"]
+    ]
+
+
+def build_resolver(rosters, aliases_path=ALIASES_PARQUET, aliases=None):
+    if aliases is None:
+        aliases = read_aliases(aliases_path)
+    return IdentityResolver(roster_players(rosters), aliases)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resolve player names to gsis_id")
+    parser.add_argument("names", nargs="+")
+    parser.add_argument("--team")
+    parser.add_argument("--position")
+    args = parser.parse_args()
+
+    resolver = build_resolver(pd.read_csv(ROSTERS_CSV))
+    for name in args.names:
+        print(f"{name}: {resolver.resolve(name, args.team, args.position)}")
@@ -0,0 +1,383 @@
+"""
+# Player Store - columnar copy of the player card data with persistent lookup indexes
+# Builds Parquet tables (dictionary encoded team/position/name columns) from the roster,
+# injury and prediction CSVs once, plus hash indexes keyed on gsis_id, normalized name and the
+# integer player_key (rows without an id are resolved by name in player_identity.py), so the
+# app can pull a single player's rows without reparsing or scanning the CSVs. Injury counts
+# come from the incrementally maintained ../data/injury_reports/injury_counts.parquet when
+# it exists, so a weekly report drop does not mean regrouping the whole injury history; the
+# manifest records which seasons the counts cover so the card can label them.
+## Run from 7_Deployment: python player_store.py
+"""
+import os
+import json
+import pickle
+import numpy as np
+import pandas as pd
+
+from player_identity import (
+    ALIASES_PARQUET,
+    build_resolver,
+    merge_aliases,
+    read_aliases,
+    write_aliases,
+)
+
+ROSTERS_CSV = "../7_Deployment/src/team_rosters.csv"
+INJURIES_CSV = "../7_Deployment/src/clean_merged_data.csv"
+PREDICTIONS_CSV = "./configs/player_modeling_data.csv"
+# Kept up to date drop by drop by 2_DataCleaning/src/ingest_injuries.py
+INJURY_COUNTS_PARQUET = "../data/injury_reports/injury_counts.parquet"
+# Written by 5_ModelDevelopment/src/score_model.py
+PROBABILITIES_PARQUET = "./configs/injury_predictions.parquet"
+STORE_DIR = "./configs/player_store"
+# clean_merged_data.csv holds the scraped 2020/2021 reports and the 2022 injury report
+MERGED_INJURY_SEASONS = [2020, 2021, 2022]
+
+# Bump when the table layout changes so older stores get rebuilt
+STORE_VERSION = 4
+
+CATEGORY_COLUMNS = {
+    "rosters": ["team", "position", "status", "college", "player_name"],
+    "injuries": ["Full Name Lower", "Injury Category"],
+    "predictions": ["team_x", "position_x_x", "injury_category", "full_name"],
+}
+
+
+##########################################
+##  Helpers                             ##
+##########################################
+
+
+# Function to normalize a player name the same way the app matches names
+def normalize_name(name):
+    if pd.isna(name):
+        return ""
+    return str(name).strip().lower()
+
+
+# Function to list the seasons ingested next to injury_counts.parquet (latest/season=<year>)
+def ingested_seasons(injury_counts_parquet=INJURY_COUNTS_PARQUET):
+    latest = os.path.join(os.path.dirname(injury_counts_parquet), "latest")
+    if not os.path.isdir(latest):
+        return []
+    return sorted(
+        int(name.split("=", 1)[1])
+        for name in os.listdir(latest)
+        if name.startswith("season=")
+    )
+
+
+# Function to label a list of seasons, e.g. '2020-2022' or '2022'
+def season_span(seasons):
+    if not seasons:
+        return ""
+    first, last = min(seasons), max(seasons)
+    return str(first) if first == last else f"{first}-{last}"
+
+
+# Rosters from nfl_data_py call the gsis id 'player_id'
+def _id_column(df):
+    for column in ["gsis_id", "player_id"]:
+        if column in df.columns:
+            return column
+    return None
+
+
+# Function to build a key -> row positions hash index for a sorted table; missing names
+# and the -1 player_key of unresolved rows are left out, they identify nobody
+def _build_index(keys):
+    index = {}
+    for position, key in enumerate(keys):
+        if (
+            pd.isna(key)
+            or key == ""
+            or (isinstance(key, (int, np.integer)) and key < 0)
+        ):
+            continue
+        index.setdefault(key, []).append(position)
+    return index
+
+
+def _encode_categories(df, columns):
+    for column in columns:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    return df
+
+
+# Function to fill in missing gsis_ids by name (+ hints) and add the integer player_key
+def _resolve_ids(df, resolver, team=None, position=None):
+    resolved = resolver.resolve_many(
+        df["full_name"],
+        df[team] if team in df.columns else None,
+        df[position] if position in df.columns else None,
+    )
+    if "gsis_id" in df.columns:
+        df["gsis_id"] = df["gsis_id"].where(df["gsis_id"].notna(), resolved)
+    else:
+        df["gsis_id"] = resolved
+    df["player_key"] = resolver.player_keys_for(df["gsis_id"])
+    return df
+
+
+def _source_stamp(paths):
+    return {path: os.path.getmtime(path) for path in paths if os.path.exists(path)}
+
+
+##########################################
+##  Build                               ##
+##########################################
+
+
+# Function to read the source CSVs once and write the columnar store
+def build_player_store(
+    rosters_csv=ROSTERS_CSV,
+    injuries_csv=INJURIES_CSV,
+    predictions_csv=PREDICTIONS_CSV,
+    store_dir=STORE_DIR,
+    probabilities_parquet=PROBABILITIES_PARQUET,
+    aliases_path=ALIASES_PARQUET,
+    save_aliases=True,
+    injury_counts_parquet=INJURY_COUNTS_PARQUET,
+):
+    os.makedirs(store_dir, exist_ok=True)
+
+    rosters = pd.read_csv(rosters_csv)
+    predictions = pd.read_csv(predictions_csv)
+    # The ingested per-player injury counts replace regrouping the merged injury CSV
+    if os.path.exists(injury_counts_parquet):
+        ingested_counts = pd.read_parquet(injury_counts_parquet)
+        nflinjury = ingested_counts.rename(columns={"Full Name Lower": "full_name"})
+        injury_seasons = ingested_seasons(injury_counts_parquet)
+    else:
+        ingested_counts = None
+        nflinjury = pd.read_csv(injuries_csv)
+        injury_seasons = MERGED_INJURY_SEASONS
+
+    # Names each source already pairs with a gsis_id become aliases (written back to
+    # aliases_path when save_aliases), then every row is resolved to a gsis_id and an
+    # integer player_key (see player_identity.py)
+    aliases = read_aliases(aliases_path)
+    for df, source in [(nflinjury, "injuries"), (predictions, "predictions")]:
+        if "gsis_id" in df.columns:
+            aliases = merge_aliases(aliases, df, "full_name", source)
+    if save_aliases:
+        write_aliases(aliases, aliases_path)
+    resolver = build_resolver(rosters, aliases=aliases)
+    _resolve_ids(predictions, resolver, team="team_x", position="position_x_x")
+    roster_id = _id_column(rosters)
+    rosters["player_key"] = resolver.player_keys_for(rosters[roster_id])
+
+    # Rosters, sorted by team so a team is one contiguous slice
+    rosters = rosters.sort_values(["team", "player_name"], kind="stable")
+    rosters = rosters.reset_index(drop=True)
+    rosters = _encode_categories(rosters, CATEGORY_COLUMNS["rosters"])
+
+    # Injury counts per player and injury category (same shape as load_injuries)
+    if ingested_counts is not None:
+        injury_counts = ingested_counts[
+            ["gsis_id", "Full Name Lower", "Injury Category", "Counts"]
+        ].copy()
+        injury_counts.insert(
+            0, "player_key", resolver.player_keys_for(injury_counts["gsis_id"])
+        )
+    else:
+        _resolve_ids(nflinjury, resolver, team="team")
+        nflinjury["full_name_lower"] = nflinjury["full_name"].map(normalize_name)
+        group_keys = ["player_key", "gsis_id", "full_name_lower", "injury_category"]
+        injury_counts = (
+            nflinjury.groupby(group_keys, dropna=False)
+            .size()
+            .reset_index(name="counts")
+        )
+        injury_counts = injury_counts.rename(
+            columns={
+                "full_name_lower": "Full Name Lower",
+                "injury_category": "Injury Category",
+                "counts": "Counts",
+            }
+        )
+    injury_counts = injury_counts.sort_values("Full Name Lower", kind="stable")
+    injury_counts = injury_counts.reset_index(drop=True)
+    injury_counts = _encode_categories(injury_counts, CATEGORY_COLUMNS["injuries"])
+
+    # Predictions, one row per player
+    predictions = predictions.drop(columns=["Unnamed: 0"], errors="ignore")
+    predictions["Player Name"] = predictions["full_name"].map(normalize_name)
+    if os.path.exists(probabilities_parquet):
+        probabilities = pd.read_parquet(
+            probabilities_parquet, columns=["gsis_id", "Injury_Probability"]
+        ).drop_duplicates("gsis_id", keep="last")
+        predictions = predictions.merge(probabilities, on="gsis_id", how="left")
+    predictions = predictions.sort_values("Player Name", kind="stable")
+    predictions = predictions.reset_index(drop=True)
+    predictions = _encode_categories(predictions, CATEGORY_COLUMNS["predictions"])
+
+    tables = {
+        "rosters": rosters,
+        "injuries": injury_counts,
+        "predictions": predictions,
+    }
+    for name, table in tables.items():
+        table.to_parquet(os.path.join(store_dir, f"{name}.parquet"), index=False)
+
+    # Hash indexes: normalized name, gsis_id and player_key -> row positions
+    team_codes = rosters["team"].astype(str)
+    indexes = {
+        "rosters": {
+            "name": _build_index(rosters["player_name"].map(normalize_name)),
+            "gsis_id": _build_index(rosters[roster_id]) if roster_id else {},
+            "player_key": _build_index(rosters["player_key"]),
+            "team": {
+                team: (positions[0], positions[-1] + 1)
+                for team, positions in _build_index(team_codes).items()
+            },
+        },
+        "injuries": {
+            "name": _build_index(injury_counts["Full Name Lower"].astype(str)),
+            "gsis_id": _build_index(injury_counts["gsis_id"]),
+            "player_key": _build_index(injury_counts["player_key"]),
+        },
+        "predictions": {
+            "name": _build_index(predictions["Player Name"]),
+            "gsis_id": _build_index(predictions["gsis_id"]),
+            "player_key": _build_index(predictions["player_key"]),
+        },
+    }
+    with open(os.path.join(store_dir, "indexes.pkl"), "wb") as f:
+        pickle.dump(indexes, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    # The manifest is written last so a half-built store is never treated as current
+    manifest = {
+        "version": STORE_VERSION,
+        "sources": _source_stamp(
+            [
+                rosters_csv,
+                injuries_csv,
+                predictions_csv,
+                probabilities_parquet,
+                aliases_path,
+                injury_counts_parquet,
+            ]
+        ),
+        "rows": {name: len(table) for name, table in tables.items()},
+        "injury_seasons": injury_seasons,
+    }
+    with open(os.path.join(store_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    return manifest
+
+
+# Function to check whether the store is missing or older than its source CSVs
+def store_is_stale(
+    rosters_csv=ROSTERS_CSV,
+    injuries_csv=INJURIES_CSV,
+    predictions_csv=PREDICTIONS_CSV,
+    store_dir=STORE_DIR,
+    probabilities_parquet=PROBABILITIES_PARQUET,
+    aliases_path=ALIASES_PARQUET,
+    injury_counts_parquet=INJURY_COUNTS_PARQUET,
+):
+    manifest_path = os.path.join(store_dir, "manifest.json")
+    if not os.path.exists(manifest_path):
+        return True
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if manifest.get("version") != STORE_VERSION:
+        return True
+    return manifest.get("sources") != _source_stamp(
+        [
+            rosters_csv,
+            injuries_csv,
+            predictions_csv,
+            probabilities_parquet,
+            aliases_path,
+            injury_counts_parquet,
+        ]
+    )
+
+
+##########################################
+##  Lookups                             ##
+##########################################
+
+
+class PlayerStore:
+    """Read side of the store: tables are loaded once and sliced through the indexes."""
+
+    def __init__(self, store_dir=STORE_DIR):
+        self.store_dir = store_dir
+        self.rosters = self._read("rosters")
+        self.injuries = self._read("injuries")
+        self.predictions = self._read("predictions")
+        with open(os.path.join(store_dir, "indexes.pkl"), "rb") as f:
+            self.indexes = pickle.load(f)
+        with open(os.path.join(store_dir, "manifest.json")) as f:
+            self.injury_seasons = json.load(f).get("injury_seasons", [])
+
+    # e.g. '2020-2022 Injury History', from the seasons the injury counts were built from
+    def injury_history_title(self):
+        return f"{season_span(self.injury_seasons)} Injury History".lstrip()
+
+    def _read(self, name):
+        return pd.read_parquet(
+            os.path.join(self.store_dir, f"{name}.parquet"), memory_map=True
+        )
+
+    def _take(self, table, index, key):
+        positions = self.indexes[table][index].get(key)
+        frame = getattr(self, table)
+        if not positions:
+            return frame.iloc[0:0]
+        return frame.iloc[positions]
+
+    def teams(self):
+        return list(self.indexes["rosters"]["team"].keys())
+
+    def team_players(self, team):
+        start, stop = self.indexes["rosters"]["team"].get(team, (0, 0))
+        return self.rosters.iloc[start:stop]
+
+    def roster_by_name(self, name, team=None):
+        players = self._take("rosters", "name", normalize_name(name))
+        if team is not None and not players.empty:
+            players = players[players["team"] == team]
+        return players
+
+    def roster_by_id(self, gsis_id):
+        return self._take("rosters", "gsis_id", gsis_id)
+
+    def injuries_by_name(self, name):
+        return self._take("injuries", "name", normalize_name(name))
+
+    def injuries_by_id(self, gsis_id):
+        return self._take("injuries", "gsis_id", gsis_id)
+
+    def prediction_by_name(self, name):
+        return self._take("predictions", "name", normalize_name(name))
+
+    def prediction_by_id(self, gsis_id):
+        return self._take("predictions", "gsis_id", gsis_id)
+
+    # Rows of `table` for a player: integer player_key first, the name as fallback
+    # (straight away when the player has no key, -1 is shared by every unresolved row)
+    def for_player(self, table, player_key, name):
+        player_key = -1 if pd.isna(player_key) else int(player_key)
+        rows = self._take(table, "player_key", player_key) if player_key >= 0 else None
+        if rows is None or rows.empty:
+            rows = self._take(table, "name", normalize_name(name))
+        return rows
+
+
+# Function to open the store, rebuilding it first when the CSVs have changed
+def open_player_store(store_dir=STORE_DIR, rebuild_if_stale=True):
+    if rebuild_if_stale and store_is_stale(store_dir=store_dir):
+        build_player_store(store_dir=store_dir)
+    return PlayerStore(store_dir)
+
+
+if __name__ == "__main__":
+    manifest = build_player_store()
+    print(f"Player store written to {STORE_DIR}: {manifest['rows']}")
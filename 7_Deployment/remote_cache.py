@@ -0,0 +1,158 @@
+"""
+# Remote Cache - persistent on-disk cache for the CSVs the app pulls from GitHub
+# Downloads are stored content-addressed (by sha256) under ./configs/remote_cache, refreshed
+# after a TTL using ETag / Last-Modified validators, and served from the last good snapshot
+# when the network is down or offline mode is on (NFL_CARD_OFFLINE=1).
+## The fetcher is pluggable, e.g. point it at a local http.server for testing
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import tempfile
+from dataclasses import dataclass, field
+
+import requests
+
+CACHE_DIR = "./configs/remote_cache"
+DEFAULT_TTL = 24 * 60 * 60  # seconds
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FetchResult:
+    status: int
+    content: bytes = b""
+    headers: dict = field(default_factory=dict)
+
+
+class OfflineCacheMiss(Exception):
+    """Raised when a URL is requested offline (or the fetch failed) and nothing is cached."""
+
+
+# Default fetcher - one pooled session for every remote source
+_session = requests.Session()
+
+
+def http_fetcher(url, headers, timeout=10):
+    response = _session.get(url, headers=headers, timeout=timeout)
+    return FetchResult(response.status_code, response.content, dict(response.headers))
+
+
+def _atomic_write(path, data):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class RemoteCache:
+    def __init__(self, cache_dir=CACHE_DIR, ttl=DEFAULT_TTL, fetcher=None, offline=None):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.fetcher = fetcher or http_fetcher
+        if offline is None:
+            offline = os.environ.get("NFL_CARD_OFFLINE", "") not in ("", "0")
+        self.offline = offline
+
+    # Entries: metadata keyed by the url hash, payloads keyed by the content hash
+    def _meta_path(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, "entries", f"{key}.json")
+
+    def _blob_path(self, digest):
+        return os.path.join(self.cache_dir, "blobs", digest[:2], digest)
+
+    def _read_meta(self, url):
+        meta_path = self._meta_path(url)
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        # A metadata file whose blob has gone missing is treated as a miss
+        if not os.path.exists(self._blob_path(meta["sha256"])):
+            return None
+        return meta
+
+    def _write_meta(self, url, meta):
+        _atomic_write(self._meta_path(url), json.dumps(meta, indent=2).encode("utf-8"))
+
+    def _store(self, url, result):
+        digest = hashlib.sha256(result.content).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not os.path.exists(blob_path):
+            _atomic_write(blob_path, result.content)
+        meta = {
+            "url": url,
+            "sha256": digest,
+            "size": len(result.content),
+            "fetched_at": time.time(),
+            "etag": result.headers.get("ETag"),
+            "last_modified": result.headers.get("Last-Modified"),
+        }
+        self._write_meta(url, meta)
+        return meta
+
+    # Function to return a local path for url, fetching or revalidating when needed
+    def get_path(self, url, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        meta = self._read_meta(url)
+
+        if self.offline:
+            if meta is None:
+                raise OfflineCacheMiss(f"Offline mode and no cached copy of {url}")
+            return self._blob_path(meta["sha256"])
+
+        if meta is not None and time.time() - meta["fetched_at"] < ttl:
+            return self._blob_path(meta["sha256"])
+
+        headers = {}
+        if meta is not None:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        try:
+            result = self.fetcher(url, headers)
+        except Exception as e:
+            if meta is None:
+                raise OfflineCacheMiss(f"Could not fetch {url}: {e}") from e
+            logger.warning("Fetch of %s failed (%s), serving cached copy", url, e)
+            return self._blob_path(meta["sha256"])
+
+        if result.status == 304 and meta is not None:
+            meta["fetched_at"] = time.time()
+            self._write_meta(url, meta)
+        elif result.status == 200:
+            meta = self._store(url, result)
+        elif meta is not None:
+            logger.warning(
+                "Fetch of %s returned %s, serving cached copy", url, result.status
+            )
+        else:
+            raise OfflineCacheMiss(f"Could not fetch {url}: HTTP {result.status}")
+
+        return self._blob_path(meta["sha256"])
+
+
+_default_cache = None
+
+
+# Function to get a path through the shared cache used by the app's loaders
+def cached_path(url, ttl=None):
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = RemoteCache()
+    return _default_cache.get_path(url, ttl=ttl)
@@ -0,0 +1,148 @@
+"""
+# Render Timing - per-section wall time and memory for a player card rerun
+# Sections are recorded with `with timed("name"):` and loaders with `@timed_call("name")`.
+# Memory (tracemalloc) is only tracked when profiling is on, either NFL_CARD_PROFILE=1 or
+# the "Show render timings" sidebar toggle, per session. Each run is also written as one JSON
+# log line and kept in the session state for benchmark_app.py.
+"""
+import os
+import json
+import time
+import logging
+import threading
+import functools
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+
+logger = logging.getLogger("player_card.timing")
+
+# Streamlit runs each session's reruns on their own script thread, so the records of the
+# run in progress are per thread; whether a session is profiling lives in its session state
+_run = threading.local()
+_profilers_lock = threading.Lock()
+_profilers = 0  # sessions with memory tracking on; tracemalloc stops when none are left
+PROFILING_KEY = "_render_timing_profiling"
+SUMMARY_KEY = "_render_timing_summary"
+
+
+def profiling_enabled():
+    return os.environ.get("NFL_CARD_PROFILE", "") not in ("", "0")
+
+
+def _set_profiling(on):
+    global _profilers
+    was_on = st.session_state.get(PROFILING_KEY, False)
+    if on == was_on:
+        return
+    with _profilers_lock:
+        _profilers += 1 if on else -1
+        if _profilers > 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        elif _profilers == 0 and tracemalloc.is_tracing():
+            tracemalloc.stop()
+    st.session_state[PROFILING_KEY] = on
+
+
+# Function to start a new rerun; this session's memory tracking is switched on or off here
+def start_run(track_memory=None):
+    if track_memory is None:
+        track_memory = profiling_enabled()
+    _set_profiling(bool(track_memory))
+    _run.records = []
+    _run.stack = []
+    _run.memory = bool(track_memory)
+    _run.started = time.perf_counter()
+
+
+@contextmanager
+def timed(section):
+    entry = {
+        "section": section,
+        "depth": len(getattr(_run, "stack", [])),
+        "wall_ms": 0.0,
+        "mem_delta_kb": None,
+        "mem_peak_kb": None,
+    }
+    # outside a run (e.g. a background preload) the section is timed but not recorded
+    recording = hasattr(_run, "records")
+    memory = recording and _run.memory and tracemalloc.is_tracing()
+    if memory:
+        start_mem, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        entry["_start_mem"] = start_mem
+        entry["_peak"] = start_mem
+    if recording:
+        _run.stack.append(entry)
+        _run.records.append(entry)
+    start = time.perf_counter()
+    try:
+        yield entry
+    finally:
+        entry["wall_ms"] = (time.perf_counter() - start) * 1000
+        if recording:
+            _run.stack.pop()
+        if memory:
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, entry.pop("_peak"))
+            start_mem = entry.pop("_start_mem")
+            entry["mem_delta_kb"] = (current - start_mem) / 1024
+            entry["mem_peak_kb"] = (peak - start_mem) / 1024
+            # Inner sections reset the tracemalloc peak, so hand it up to the parent
+            if _run.stack:
+                _run.stack[-1]["_peak"] = max(_run.stack[-1]["_peak"], peak)
+
+
+# Decorator to time every call of a loader (put it above @cached to see hits)
+def timed_call(section):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(section):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def run_records():
+    return list(getattr(_run, "records", []))
+
+
+# Function to close the run and write it to the structured log
+def finish_run(page=None):
+    total_ms = None
+    if hasattr(_run, "started"):
+        total_ms = (time.perf_counter() - _run.started) * 1000
+    summary = {
+        "event": "player_card_render",
+        "page": page,
+        "total_ms": total_ms,
+        "sections": run_records(),
+    }
+    if profiling_enabled() and not logger.handlers:
+        logger.addHandler(logging.StreamHandler())
+        logger.setLevel(logging.INFO)
+    logger.info(json.dumps(summary, default=str))
+    st.session_state[SUMMARY_KEY] = summary
+    del _run.records, _run.stack, _run.started
+    return summary
+
+
+# Function to show the timings of the current run in a sidebar expander
+def show_timing_panel(summary):
+    with st.sidebar.expander("Render timings", expanded=True):
+        if summary["total_ms"] is not None:
+            st.write(f"Total: {summary['total_ms']:.0f} ms")
+        timings = pd.DataFrame(summary["sections"])
+        if timings.empty:
+            st.write("No sections recorded.")
+            return
+        timings["section"] = [
+            "  " * depth + section
+            for depth, section in zip(timings["depth"], timings["section"])
+        ]
+        st.dataframe(timings.drop(columns=["depth"]).round(1), hide_index=True)
@@ -0,0 +1,37 @@
+"""
+# Run Card - starts the player card app with its data cache warmed at server start
+# `streamlit run player_card.py` only executes the script when the first session connects, so
+# the first user pays for loading the datasets. This launcher imports player_card in the server
+# process on a background thread, which registers the preload=True loaders with the shared
+# data cache (see data_cache.py), and warms them while the server comes up. The script runs
+# import the same data_cache module, so their first lookups are hits.
+## Run from 7_Deployment: python run_card.py [streamlit run options, e.g. --server.port 8501]
+"""
+import sys
+import logging
+import threading
+
+from streamlit.web import cli as stcli
+
+from data_cache import preload_once
+
+SCRIPT = "player_card.py"
+
+logger = logging.getLogger(__name__)
+
+
+# Function to register the app's loaders and warm them (runs on a background thread)
+def warm_cache():
+    try:
+        import player_card  # registers the loaders; main() only runs as __main__
+
+        preload_once(wait=True)
+    except Exception as e:
+        logger.warning("Cache warm-up failed, loaders will run on first use: %s", e)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    threading.Thread(target=warm_cache, name="card-warmup", daemon=True).start()
+    sys.argv = ["streamlit", "run", SCRIPT] + sys.argv[1:]
+    sys.exit(stcli.main())
@@ -0,0 +1,202 @@
+"""
+# Season Simulation - Monte Carlo roster availability for a team's schedule
+# Each player's season injury probability (the model's Injury_Probability, or the league base
+# rate when a player has none) becomes a per-game hazard. Injury onsets and their lengths are
+# drawn for every simulation, player and game at once as (sims, players, games) arrays, and a
+# running maximum of "out until week" gives who is unavailable in each game. Results are the
+# distributions of games missed per position group and of players out per week. One season's
+# regular-season weeks are simulated (the roster's season, or the latest in the schedule).
+# Injury lengths come from the DM_M7/M28/M42 shares in inj_ind.csv (missed 7+/28+/42+ days).
+## Run from 7_Deployment: python season_sim.py BAL [--season 2022] [--sims 20000]
+"""
+import os
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from game_table import open_game_table, team_games
+from injury_cube import INJURY_PLAYS_CSV, position_group
+from player_store import open_player_store
+
+N_SIMS = 20_000
+# Weeks out for an injury that missed <7, 7-27, 28-41 and 42+ days
+DURATION_WEEKS = np.array([0, 2, 4, 8], dtype=np.int16)
+DEFAULT_DURATION_SHARES = np.array([0.28, 0.37, 0.08, 0.27])
+PERCENTILES = [10, 50, 90]
+# Seasons have 18 regular-season weeks since 2021 (17 before); later weeks are playoffs
+FIRST_18_WEEK_SEASON = 2021
+
+
+##########################################
+##  Inputs                              ##
+##########################################
+
+
+def duration_shares(path=INJURY_PLAYS_CSV):
+    if not os.path.exists(path):
+        return DEFAULT_DURATION_SHARES
+    days = pd.read_csv(path, usecols=["DM_M7", "DM_M28", "DM_M42"]).mean()
+    at_least = np.array([1.0, days["DM_M7"], days["DM_M28"], days["DM_M42"]])
+    return np.clip(at_least - np.r_[at_least[1:], 0.0], 0, None) / at_least[0]
+
+
+# Function to get every rostered player's season injury probability and position group
+def team_probabilities(store, team):
+    roster = store.team_players(team)
+    predictions = store.predictions
+    base_rate = float(predictions["Injured_in_2022"].mean())
+    probability = pd.Series(
+        predictions.get("Injury_Probability", np.nan),
+        index=predictions.index,
+        dtype="float64",
+    ).set_axis(predictions["player_key"].to_numpy())
+    # -1 marks unresolved predictions; those players fall back to the base rate below
+    probability = probability[probability.index >= 0]
+    probability = probability[~probability.index.duplicated(keep="last")]
+
+    players = pd.DataFrame(
+        {
+            "player_name": roster["player_name"].astype(str).to_numpy(),
+            "position": roster["position"].astype(str).to_numpy(),
+            "Injury_Probability": roster["player_key"].map(probability).to_numpy(),
+        }
+    )
+    players["Position Group"] = [position_group(p) or p for p in players["position"]]
+    players["Estimated"] = players["Injury_Probability"].isna()
+    players["Injury_Probability"] = players["Injury_Probability"].fillna(base_rate)
+    return players
+
+
+def team_seasons(game_table, team):
+    return sorted(team_games(game_table, team)["Season"].astype(int).unique().tolist())
+
+
+# Function to pick the season to simulate: the roster's season when scheduled, else the latest
+def default_season(store, game_table, team):
+    seasons = team_seasons(game_table, team)
+    roster = store.team_players(team)
+    if "season" in roster.columns:
+        roster_seasons = pd.to_numeric(roster["season"], errors="coerce").dropna()
+        if not roster_seasons.empty and int(roster_seasons.max()) in seasons:
+            return int(roster_seasons.max())
+    return seasons[-1] if seasons else None
+
+
+# Function to get one season's regular-season weeks for a team (bye weeks are left out)
+def team_weeks(game_table, team, season):
+    games = team_games(game_table, team)
+    weeks = games.loc[games["Season"].astype(int) == int(season), "Week"].astype(int)
+    last_week = 18 if int(season) >= FIRST_18_WEEK_SEASON else 17
+    return np.sort(weeks[weeks <= last_week].unique())
+
+
+##########################################
+##  Simulation                          ##
+##########################################
+
+
+# Function to draw every season at once: (sims, players, games), True where a game is missed
+def simulate(probability, weeks, n_sims=N_SIMS, shares=None, seed=None):
+    rng = np.random.default_rng(seed)
+    shares = DEFAULT_DURATION_SHARES if shares is None else shares
+    probability = np.clip(np.asarray(probability, dtype=np.float64), 0, 0.999)
+    weeks = np.asarray(weeks, dtype=np.int16)
+    n_games = len(weeks)
+
+    # per-game hazard that compounds to the season probability over the schedule
+    hazard = (1 - (1 - probability) ** (1 / n_games)).astype(np.float32)
+    onset = rng.random((n_sims, len(probability), n_games), dtype=np.float32)
+    onset = onset < hazard[None, :, None]
+
+    # an injury in week w keeps the player out until week w + length
+    out_until = np.full(onset.shape, -1, dtype=np.int16)
+    lengths = DURATION_WEEKS[rng.choice(len(shares), size=onset.sum(), p=shares)]
+    out_until[onset] = np.broadcast_to(weeks, onset.shape)[onset] + lengths
+    out_until = np.maximum.accumulate(out_until, axis=2)
+
+    # a game is missed when an earlier injury still runs past its week
+    missed = np.zeros(onset.shape, dtype=bool)
+    missed[:, :, 1:] = out_until[:, :, :-1] >= weeks[1:]
+    return missed
+
+
+def _describe(samples, index, name):
+    # samples: (sims, k) -> one row per column with mean and percentiles
+    table = pd.DataFrame({"mean": samples.mean(axis=0)}, index=index)
+    for p, values in zip(PERCENTILES, np.percentile(samples, PERCENTILES, axis=0)):
+        table[f"p{p}"] = values
+    table.index.name = name
+    return table.reset_index()
+
+
+def summarize(missed, players, weeks):
+    groups = players["Position Group"].to_numpy()
+    group_names, group_codes = np.unique(groups, return_inverse=True)
+    per_player = missed.sum(axis=2)  # (sims, players)
+
+    # games missed per group in each simulation: one matrix product with a 0/1 membership
+    membership = np.eye(len(group_names), dtype=np.int32)[group_codes]
+    by_group = per_player @ membership
+    by_week = missed.sum(axis=1)  # (sims, games)
+
+    expected = players[["player_name", "position", "Position Group"]].copy()
+    expected["Injury_Probability"] = players["Injury_Probability"].to_numpy()
+    expected["Expected Games Missed"] = per_player.mean(axis=0)
+    expected["P(Misses a Game)"] = (per_player > 0).mean(axis=0)
+    return {
+        "by_group": _describe(by_group, group_names, "Position Group"),
+        "by_week": _describe(by_week, weeks, "Week"),
+        "players": expected.sort_values("Expected Games Missed", ascending=False),
+        "total": _describe(per_player.sum(axis=1, keepdims=True), ["All"], "Team"),
+    }
+
+
+# Function to run the whole simulation for one team and season (default_season when None)
+def simulate_team(store, game_table, team, n_sims=N_SIMS, seed=None, season=None):
+    if season is None:
+        season = default_season(store, game_table, team)
+    players = team_probabilities(store, team)
+    if players.empty or season is None:
+        return None
+    weeks = team_weeks(game_table, team, season)
+    if len(weeks) == 0:
+        return None
+    missed = simulate(
+        players["Injury_Probability"].to_numpy(),
+        weeks,
+        n_sims,
+        duration_shares(),
+        seed,
+    )
+    results = summarize(missed, players, weeks)
+    results["season"] = int(season)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Simulate a team's roster availability"
+    )
+    parser.add_argument("team")
+    parser.add_argument("--season", type=int, help="default: the roster's season")
+    parser.add_argument("--sims", type=int, default=N_SIMS)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    store = open_player_store()
+    game_table = open_game_table()
+    start = time.perf_counter()
+    results = simulate_team(
+        store, game_table, args.team, args.sims, args.seed, args.season
+    )
+    elapsed = time.perf_counter() - start
+    if results is None:
+        raise SystemExit(f"No roster or schedule for {args.team}")
+    print(
+        f"{args.sims:,} simulations of {args.team}'s {results['season']} season "
+        f"in {elapsed * 1e3:.0f} ms"
+    )
+    print(results["by_group"].round(2).to_string(index=False))
+    print(results["by_week"].round(2).to_string(index=False))
@@ -0,0 +1,88 @@
+"""
+# Weather Features tests - kickoff averages from the local fixture stand-in for meteostat
+# tests/fixtures/weather holds a two-stadium coordinates table and hourly CSVs per stadium
+# slug, so build_game_weather runs end to end without network access.
+## Run from 7_Deployment: python -m pytest tests
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from weather_features import build_game_weather, csv_fetcher
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "weather")
+
+
+@pytest.fixture
+def schedule(tmp_path):
+    games = pd.DataFrame(
+        {
+            "gameId": [2022091100, 2022091800, 2022091101],
+            "season": [2022, 2022, 2022],
+            "gameDate": ["09/11/2022", "09/18/2022", "09/11/2022"],
+            "gameTimeEastern": ["13:00:00", "13:00:00", "20:20:00"],
+            "homeTeamAbbr": ["BAL", "BAL", "MIN"],
+        }
+    )
+    path = str(tmp_path / "games.parq")
+    games.to_parquet(path, index=False)
+    return path
+
+
+@pytest.fixture
+def stadiums():
+    return pd.read_csv(os.path.join(FIXTURE_DIR, "stadiums.csv"))
+
+
+def _build(schedule, stadiums, tmp_path, fetcher):
+    game_weather = build_game_weather(
+        schedule,
+        str(tmp_path / "game_weather.parquet"),
+        fetcher,
+        cache_dir=str(tmp_path / "weather"),
+        stadiums=stadiums,
+    )
+    return game_weather.set_index("Game ID")
+
+
+def test_kickoff_window_averages(schedule, stadiums, tmp_path):
+    weather = _build(schedule, stadiums, tmp_path, csv_fetcher(FIXTURE_DIR))
+
+    # 13:00 EDT is 17:00 UTC, the window is 17:00-20:00
+    full = weather.loc[2022091100]
+    assert full["Kickoff_UTC"] == pd.Timestamp("2022-09-11 17:00")
+    assert full["Weather_Hours"] == 4
+    assert full["Kickoff_Temp_F"] == pytest.approx(73.4)  # mean 23 degC
+    assert full["Kickoff_Precip_mm"] == pytest.approx(1.5)
+    assert full["Kickoff_Wind_mph"] == pytest.approx(9.3)  # mean 15 km/h
+    assert not full["Indoors"]
+
+    # only two hours observed, the averages use those two
+    partial = weather.loc[2022091800]
+    assert partial["Weather_Hours"] == 2
+    assert partial["Kickoff_Temp_F"] == pytest.approx(51.8)
+    assert partial["Kickoff_Precip_mm"] == pytest.approx(4.0)
+    assert partial["Kickoff_Wind_mph"] == pytest.approx(7.5)
+
+    # no observations in the window: missing, not 0 mm of rain
+    empty = weather.loc[2022091101]
+    assert empty["Weather_Hours"] == 0
+    assert np.isnan(empty["Kickoff_Temp_F"])
+    assert np.isnan(empty["Kickoff_Precip_mm"])
+    assert empty["Indoors"]
+
+    on_disk = pd.read_parquet(tmp_path / "game_weather.parquet")
+    assert len(on_disk) == 3
+
+
+def test_hourly_cache_is_reused(schedule, stadiums, tmp_path):
+    first = _build(schedule, stadiums, tmp_path, csv_fetcher(FIXTURE_DIR))
+    assert len(os.listdir(tmp_path / "weather")) == 2  # one file per stadium
+
+    def offline(*args, **kwargs):
+        raise AssertionError("cached stadiums should not be fetched again")
+
+    second = _build(schedule, stadiums, tmp_path, offline)
+    pd.testing.assert_frame_equal(first, second)
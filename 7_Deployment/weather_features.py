@@ -0,0 +1,212 @@
+"""
+# Weather Features - kickoff-window weather for every game from meteostat hourly data
+# Hourly observations are fetched once per stadium for the whole season range (coordinates
+# from the stadium table) and kept as Parquet under ./configs/weather. Every game then gets the
+# mean temperature, total precipitation and mean wind over its kickoff window in one vectorized
+# merge instead of one request per game. The result (../data/game_weather.parquet) is joined
+# into the game table for the schedule view, and onto every player-week by
+# 4_FeatureEngineering/src/workload_features.py for model features.
+# The fetcher is pluggable, e.g. csv_fetcher(dir) serves hourly CSVs from a local fixture folder
+# (tests/fixtures/weather is the one tests/test_weather_features.py runs against).
+## Run from 7_Deployment: python weather_features.py [--fixture-dir ./tests/fixtures/weather]
+"""
+import os
+import re
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from game_table import (
+    GAMES_PARQ,
+    GAME_WEATHER_PARQUET,
+    TEAM_NAME_MAPPING,
+    read_stadiums,
+)
+
+WEATHER_DIR = "./configs/weather"
+
+WINDOW_HOURS = 3  # kickoff hour plus the next three
+HOURLY_COLUMNS = ["temp", "prcp", "wspd"]  # degC, mm, km/h as meteostat reports them
+INDOOR_ROOFS = {"indoor", "dome", "closed"}
+
+
+##########################################
+##  Fetchers                            ##
+##########################################
+
+
+# Default fetcher: meteostat interpolates nearby stations to the stadium point
+def meteostat_fetcher(latitude, longitude, start, end):
+    from meteostat import Point, Hourly
+
+    hourly = Hourly(Point(latitude, longitude), start, end).fetch()
+    return hourly.reindex(columns=HOURLY_COLUMNS)
+
+
+# Fixture stand-in: <directory>/<stadium slug>.csv with time,temp,prcp,wspd rows
+def csv_fetcher(directory):
+    def fetch(latitude, longitude, start, end, slug=None):
+        hourly = pd.read_csv(
+            os.path.join(directory, f"{slug}.csv"), parse_dates=["time"]
+        )
+        hourly = hourly.set_index("time").sort_index()
+        return hourly.loc[start:end].reindex(columns=HOURLY_COLUMNS)
+
+    fetch.wants_slug = True
+    return fetch
+
+
+def stadium_slug(name):
+    return re.sub(r"[^a-z0-9]+", "_", str(name).lower()).strip("_")
+
+
+##########################################
+##  Hourly Cache                        ##
+##########################################
+
+
+def season_range(seasons):
+    # preseason through the Super Bowl of the last season
+    start = pd.Timestamp(f"{min(seasons)}-08-01")
+    end = pd.Timestamp(f"{max(seasons) + 1}-02-28 23:00")
+    return start, end
+
+
+# Function to get one stadium's hourly observations, from the cache when already fetched
+def stadium_hourly(stadium, start, end, fetcher, cache_dir=WEATHER_DIR):
+    slug = stadium_slug(stadium["StadiumName"])
+    path = os.path.join(cache_dir, f"{slug}_{start:%Y%m%d}_{end:%Y%m%d}.parquet")
+    if os.path.exists(path):
+        return slug, pd.read_parquet(path)
+
+    extra = {"slug": slug} if getattr(fetcher, "wants_slug", False) else {}
+    hourly = fetcher(
+        stadium["Latitude"],
+        stadium["Longitude"],
+        start.to_pydatetime(),
+        end.to_pydatetime(),
+        **extra,
+    )
+    hourly = hourly.reset_index().rename(columns={hourly.index.name or "index": "time"})
+    hourly = hourly[["time"] + HOURLY_COLUMNS].astype(
+        {c: "float32" for c in HOURLY_COLUMNS}
+    )
+    os.makedirs(cache_dir, exist_ok=True)
+    hourly.to_parquet(path + ".tmp", index=False)
+    os.replace(path + ".tmp", path)
+    return slug, hourly
+
+
+##########################################
+##  Game Alignment                      ##
+##########################################
+
+
+# Function to read kickoff times (Eastern in games.parq) as UTC, with the home stadium
+def game_kickoffs(schedule_path=GAMES_PARQ, stadiums=None):
+    games = pd.read_parquet(
+        schedule_path,
+        columns=["gameId", "season", "gameDate", "gameTimeEastern", "homeTeamAbbr"],
+    )
+    kickoff = pd.to_datetime(
+        games["gameDate"].astype(str) + " " + games["gameTimeEastern"].astype(str),
+        format="%m/%d/%Y %H:%M:%S",
+    )
+    games["Kickoff_UTC"] = (
+        kickoff.dt.tz_localize("America/New_York")
+        .dt.tz_convert("UTC")
+        .dt.tz_localize(None)
+    )
+    games["Home_Team_Full"] = games["homeTeamAbbr"].map(TEAM_NAME_MAPPING)
+    stadiums = read_stadiums() if stadiums is None else stadiums
+    games = games.merge(
+        stadiums, left_on="Home_Team_Full", right_on="HomeTeam", how="left"
+    )
+    games["Stadium_Slug"] = games["StadiumName"].map(stadium_slug)
+    return games
+
+
+# Function to average each game's kickoff window: one merge over (stadium, hour) pairs
+def assign_weather(games, hourly, window_hours=WINDOW_HOURS):
+    offsets = np.arange(window_hours + 1)
+    kickoff_hour = games["Kickoff_UTC"].dt.floor("h").to_numpy()
+    windows = pd.DataFrame(
+        {
+            "Game ID": np.repeat(games["gameId"].to_numpy(), len(offsets)),
+            "Stadium_Slug": np.repeat(games["Stadium_Slug"].to_numpy(), len(offsets)),
+            "time": (
+                np.repeat(kickoff_hour, len(offsets))
+                + np.tile(offsets, len(games)).astype("timedelta64[h]")
+            ),
+        }
+    )
+    windows = windows.merge(hourly, on=["Stadium_Slug", "time"], how="left")
+    features = windows.groupby("Game ID").agg(
+        Kickoff_Temp_C=("temp", "mean"),
+        Kickoff_Precip_mm=("prcp", "sum"),
+        Kickoff_Wind_kmh=("wspd", "mean"),
+        Weather_Hours=("temp", "count"),
+    )
+    # a window with no observations at all stays missing rather than 0 mm of rain
+    features.loc[features["Weather_Hours"] == 0, "Kickoff_Precip_mm"] = np.nan
+
+    out = games[["gameId", "Kickoff_UTC", "StadiumName", "RoofType"]].rename(
+        columns={"gameId": "Game ID"}
+    )
+    out = out.merge(features, left_on="Game ID", right_index=True, how="left")
+    out["Kickoff_Temp_F"] = (out["Kickoff_Temp_C"] * 9 / 5 + 32).round(1)
+    out["Kickoff_Wind_mph"] = (out["Kickoff_Wind_kmh"] / 1.609344).round(1)
+    out["Indoors"] = out["RoofType"].astype(str).str.lower().isin(INDOOR_ROOFS)
+    return out.drop(
+        columns=["Kickoff_Temp_C", "Kickoff_Wind_kmh", "StadiumName", "RoofType"]
+    )
+
+
+def build_game_weather(
+    schedule_path=GAMES_PARQ,
+    output=GAME_WEATHER_PARQUET,
+    fetcher=None,
+    cache_dir=WEATHER_DIR,
+    workers=4,
+    stadiums=None,
+):
+    fetcher = fetcher or meteostat_fetcher
+    games = game_kickoffs(schedule_path, stadiums)
+    start, end = season_range(games["season"].astype(int).unique())
+
+    stadiums = games.dropna(subset=["Latitude", "Longitude"]).drop_duplicates(
+        "Stadium_Slug"
+    )
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        fetched = list(
+            pool.map(
+                lambda row: stadium_hourly(row, start, end, fetcher, cache_dir),
+                [row for _, row in stadiums.iterrows()],
+            )
+        )
+    hourly = pd.concat(
+        [frame.assign(Stadium_Slug=slug) for slug, frame in fetched], ignore_index=True
+    )
+
+    game_weather = assign_weather(games, hourly)
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    game_weather.to_parquet(output + ".tmp", index=False)
+    os.replace(output + ".tmp", output)
+    return game_weather
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build kickoff weather per game")
+    parser.add_argument("--games", default=GAMES_PARQ)
+    parser.add_argument("--output", default=GAME_WEATHER_PARQUET)
+    parser.add_argument(
+        "--fixture-dir", help="read hourly CSVs from here instead of meteostat"
+    )
+    args = parser.parse_args()
+
+    fetcher = csv_fetcher(args.fixture_dir) if args.fixture_dir else None
+    game_weather = build_game_weather(args.games, args.output, fetcher)
+    covered = game_weather["Weather_Hours"].gt(0).sum()
+    print(f"{len(game_weather)} games, {covered} with kickoff weather -> {args.output}")
@@ -0,0 +1,322 @@
+"""
+# Run Benchmarks - times and memory-profiles each pipeline stage on synthetic data at several scales
+# For every scale a scratch tree is generated with synthetic_data.py, then the stages run in
+# pipeline order through the repo's own code: injury ingestion, feature building, encoding,
+# model training, the player store build and the schedule/weather/stadium join. Each stage runs
+# --repeats times; the median wall time, the largest peak memory above the stage's starting RSS
+# and rows/sec are appended to a JSON-lines file with the git commit, and each stage's median is
+# compared with its last recorded run from another commit.
+## Run from the repo root: python benchmarks/run_benchmarks.py --scales 1 10 100
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for stage_dir in [
+    "2_DataCleaning/src",
+    "4_FeatureEngineering/src",
+    "5_ModelDevelopment/src",
+    "7_Deployment",
+]:
+    sys.path.insert(0, os.path.join(REPO_ROOT, stage_dir))
+
+from synthetic_data import SEASONS, generate
+from ingest_injuries import ingest_drop
+from build_features import build_player_features
+from encode_features import encode
+from train_model import build_model
+from player_store import build_player_store
+from game_table import read_schedule, read_weather, join_games
+
+RESULTS_FILE = os.path.join(REPO_ROOT, "benchmarks", "results", "pipeline.jsonl")
+DEFAULT_SCALES = [1, 10, 100]
+MAX_SLOWDOWN = 1.25
+# single timings of the short stages vary by more than MAX_SLOWDOWN between identical runs
+REPEATS = 5
+# stages faster than this are too noisy to flag as regressions
+MIN_SECONDS = 0.25
+
+
+##########################################
+##  Measurement                         ##
+##########################################
+
+
+def _rss_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+class PeakMemory:
+    """Peak RSS above the starting RSS, sampled on a thread (tracemalloc without /proc)."""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.use_proc = os.path.exists("/proc/self/statm")
+        self.peak = 0
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, _rss_bytes() - self.start)
+
+    def __enter__(self):
+        if self.use_proc:
+            self.start = _rss_bytes()
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        else:
+            tracemalloc.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self.use_proc:
+            self._stop.set()
+            self._thread.join()
+            self.peak = max(self.peak, _rss_bytes() - self.start)
+        else:
+            self.peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+
+# Function to run a stage `repeats` times and keep its median time and largest peak memory
+def measure(stage, func, ctx, repeats=REPEATS):
+    timings, peaks = [], []
+    for _ in range(repeats):
+        with PeakMemory() as memory:
+            start = time.perf_counter()
+            rows = func(ctx)
+            timings.append(time.perf_counter() - start)
+        peaks.append(memory.peak)
+    seconds = float(np.median(timings))
+    return {
+        "stage": stage,
+        "rows": int(rows),
+        "seconds": seconds,
+        "min_seconds": min(timings),
+        "repeats": repeats,
+        "rows_per_sec": rows / seconds if seconds else None,
+        "peak_mb": max(peaks) / 1e6,
+    }
+
+
+##########################################
+##  Stages                              ##
+##########################################
+
+
+def stage_ingest(ctx):
+    # start from an empty store each repeat, a second ingest of the same drop is a no-op
+    store_dir = os.path.join(ctx["root"], "data/injury_reports")
+    shutil.rmtree(store_dir, ignore_errors=True)
+    stats = ingest_drop(ctx["paths"]["injuries"], store_dir)
+    return stats["rows_in_drop"]
+
+
+def stage_build_features(ctx):
+    merged = pd.read_csv(ctx["paths"]["merged"])
+    ctx["modeling"] = build_player_features(merged, SEASONS)
+    return len(merged)
+
+
+def stage_encode(ctx):
+    _, X, meta, _ = encode(ctx["modeling"])
+    ctx["encoded"] = (X, meta[meta.columns[-1]].astype(int).to_numpy())
+    return X.shape[0]
+
+
+def stage_train(ctx):
+    X, y = ctx["encoded"]
+    build_model().fit(X, y)
+    return X.shape[0]
+
+
+# The store resolves names against the rosters and reads ./configs, so it runs from 7_Deployment
+def stage_player_store(ctx):
+    deployment = os.path.join(ctx["root"], "7_Deployment")
+    predictions_csv = os.path.join(deployment, "configs", "player_modeling_data.csv")
+    os.makedirs(os.path.dirname(predictions_csv), exist_ok=True)
+    ctx["modeling"].to_csv(predictions_csv)
+
+    cwd = os.getcwd()
+    os.chdir(deployment)
+    try:
+        manifest = build_player_store(
+            rosters_csv=ctx["paths"]["rosters"],
+            injuries_csv=ctx["paths"]["merged"],
+            predictions_csv=predictions_csv,
+            store_dir=os.path.join(deployment, "configs", "player_store"),
+        )
+    finally:
+        os.chdir(cwd)
+    return sum(manifest["rows"].values())
+
+
+def stage_game_table(ctx):
+    schedule = read_schedule(ctx["paths"]["games"])
+    weather = read_weather(ctx["paths"]["weather"])
+    stadiums = pd.read_csv(ctx["paths"]["stadiums"])
+    join_games(schedule, weather, stadiums)
+    return len(schedule)
+
+
+STAGES = {
+    "ingest_injuries": stage_ingest,
+    "build_features": stage_build_features,
+    "encode_features": stage_encode,
+    "train_model": stage_train,
+    "player_store": stage_player_store,
+    "game_table": stage_game_table,
+}
+
+
+##########################################
+##  Run and Record                      ##
+##########################################
+
+
+def git_commit():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_scale(scale, stages, seed=42, keep_dir=None, repeats=REPEATS):
+    root = keep_dir or tempfile.mkdtemp(prefix=f"nfl_bench_{scale}x_")
+    try:
+        paths, input_rows = generate(root, scale, seed)
+        ctx = {"root": root, "paths": paths}
+        results = []
+        for stage in stages:
+            record = measure(stage, STAGES[stage], ctx, repeats)
+            record["scale"] = scale
+            results.append(record)
+            print(
+                f"{scale:>6}x {stage:<16} {record['seconds']:8.3f}s "
+                f"{record['rows_per_sec'] or 0:12,.0f} rows/s {record['peak_mb']:9.1f} MB"
+            )
+        return results, input_rows
+    finally:
+        if keep_dir is None:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+def read_results(path=RESULTS_FILE):
+    if not os.path.exists(path):
+        return pd.DataFrame()
+    with open(path) as f:
+        return pd.DataFrame([json.loads(line) for line in f if line.strip()])
+
+
+def append_results(records, path=RESULTS_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+# Function to compare this run with the last run of each stage/scale from another commit
+def compare(current, history):
+    current = pd.DataFrame(current)
+    if history.empty:
+        current["previous_s"] = float("nan")
+    else:
+        history = history[history["commit"] != current["commit"].iloc[0]]
+        previous = (
+            history.sort_values("recorded_at")
+            .groupby(["stage", "scale"])["seconds"]
+            .last()
+            .rename("previous_s")
+        )
+        current = current.join(previous, on=["stage", "scale"])
+    current["slowdown"] = current["seconds"] / current["previous_s"]
+    return current[
+        [
+            "scale",
+            "stage",
+            "seconds",
+            "previous_s",
+            "slowdown",
+            "rows_per_sec",
+            "peak_mb",
+        ]
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the pipeline stages")
+    parser.add_argument("--scales", nargs="+", type=float, default=DEFAULT_SCALES)
+    parser.add_argument(
+        "--stages", nargs="+", choices=list(STAGES), default=list(STAGES)
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--repeats", type=int, default=REPEATS, help="runs per stage, median is kept"
+    )
+    parser.add_argument("--output", default=RESULTS_FILE)
+    parser.add_argument("--keep-data", help="generate into this directory and keep it")
+    parser.add_argument(
+        "--max-slowdown",
+        type=float,
+        default=MAX_SLOWDOWN,
+        help="exit non-zero when a stage is this much slower than its last recorded run",
+    )
+    parser.add_argument("--no-record", action="store_true")
+    args = parser.parse_args()
+
+    history = read_results(args.output)
+    run = {
+        "commit": git_commit(),
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+        "seed": args.seed,
+    }
+    records = []
+    for scale in args.scales:
+        scale = int(scale) if float(scale).is_integer() else scale
+        keep_dir = os.path.join(args.keep_data, f"{scale}x") if args.keep_data else None
+        results, input_rows = run_scale(
+            scale, args.stages, args.seed, keep_dir, args.repeats
+        )
+        records += [{**run, **r, "input_rows": input_rows} for r in results]
+
+    if not args.no_record:
+        append_results(records, args.output)
+    report = compare(records, history)
+    print(report.round(3).to_string(index=False))
+
+    slower = report[
+        (report["slowdown"] > args.max_slowdown) & (report["previous_s"] >= MIN_SECONDS)
+    ]
+    if not slower.empty:
+        print(f"{len(slower)} stage(s) slower than {args.max_slowdown}x their last run")
+        sys.exit(1)
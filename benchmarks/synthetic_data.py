@@ -0,0 +1,387 @@
+"""
+# Synthetic Data - seeded, scalable stand-ins for the pipeline's inputs
+# Writes rosters, weekly injury reports (injuries.csv schema), the merged injury table the
+# feature/store stages read, games (games.parq schema), scraped weather and stadiums into a
+# scratch tree laid out like the repo. Scale 1 is about the size of the real data (1.7k players,
+# 5.7k report rows and 272 games per season); every count grows linearly with the scale.
+## Run from the repo root: python benchmarks/synthetic_data.py --scale 10 --output /tmp/nfl_synth
+"""
+import os
+import argparse
+
+import numpy as np
+import pandas as pd
+
+SEASONS = [2020, 2021, 2022]
+PLAYERS = 1_700
+REPORT_ROWS_PER_SEASON = 5_700
+GAMES_PER_SEASON = 272
+REPORT_WEEKS = 22
+
+TEAMS = {
+    "ARI": "Cardinals",
+    "ATL": "Falcons",
+    "BAL": "Ravens",
+    "BUF": "Bills",
+    "CAR": "Panthers",
+    "CHI": "Bears",
+    "CIN": "Bengals",
+    "CLE": "Browns",
+    "DAL": "Cowboys",
+    "DEN": "Broncos",
+    "DET": "Lions",
+    "GB": "Packers",
+    "HOU": "Texans",
+    "IND": "Colts",
+    "JAX": "Jaguars",
+    "KC": "Chiefs",
+    "LAC": "Chargers",
+    "LAR": "Rams",
+    "LV": "Raiders",
+    "MIA": "Dolphins",
+    "MIN": "Vikings",
+    "NE": "Patriots",
+    "NO": "Saints",
+    "NYG": "Giants",
+    "NYJ": "Jets",
+    "PHI": "Eagles",
+    "PIT": "Steelers",
+    "SF": "49ers",
+    "SEA": "Seahawks",
+    "TB": "Buccaneers",
+    "TEN": "Titans",
+    "WAS": "Washington",
+}
+
+# Shares seen in the 2022 injuries.csv
+POSITIONS = {
+    "WR": 0.13,
+    "CB": 0.12,
+    "LB": 0.11,
+    "T": 0.08,
+    "DE": 0.08,
+    "DT": 0.08,
+    "S": 0.08,
+    "G": 0.07,
+    "RB": 0.06,
+    "TE": 0.06,
+    "QB": 0.04,
+    "C": 0.03,
+    "K": 0.02,
+    "FB": 0.02,
+    "LS": 0.01,
+    "P": 0.01,
+}
+REPORT_STATUS = {None: 0.51, "Questionable": 0.27, "Out": 0.19, "Doubtful": 0.03}
+PRACTICE_STATUS = {
+    "Full Participation in Practice": 0.42,
+    "Did Not Participate In Practice": 0.31,
+    "Limited Participation in Practice": 0.27,
+}
+INJURIES = {
+    "Knee": 0.16,
+    "Ankle": 0.15,
+    "Hamstring": 0.12,
+    "Concussion": 0.06,
+    "Illness": 0.06,
+    "Calf": 0.05,
+    "Shoulder": 0.05,
+    "Back": 0.05,
+    "Groin": 0.05,
+    "Foot": 0.05,
+    "Hip": 0.04,
+    "Neck": 0.03,
+    "Quadricep": 0.03,
+    "Toe": 0.02,
+    "Not injury related - resting player": 0.08,
+}
+FIRST_NAMES = [
+    "Jalen",
+    "Josh",
+    "Justin",
+    "Chris",
+    "Michael",
+    "Tyler",
+    "Derek",
+    "Marcus",
+    "Aaron",
+    "Brandon",
+    "Jordan",
+    "Cameron",
+    "Trey",
+    "Devin",
+    "Isaiah",
+    "Kyle",
+    "D.J.",
+    "A.J.",
+    "T.J.",
+    "Ja'Marr",
+    "Amon-Ra",
+    "Travis",
+    "Patrick",
+    "Lamar",
+]
+LAST_NAMES = [
+    "Smith",
+    "Johnson",
+    "Williams",
+    "Brown",
+    "Jones",
+    "Davis",
+    "Miller",
+    "Wilson",
+    "Moore",
+    "Taylor",
+    "Anderson",
+    "Thomas",
+    "Jackson",
+    "White",
+    "Harris",
+    "Martin",
+    "Thompson",
+    "Robinson",
+    "Clark",
+    "Lewis",
+    "Walker",
+    "Allen",
+    "Young",
+    "St. Brown",
+]
+SUFFIXES = ["", "", "", "", "", "", " Jr.", " II", " III", " Sr."]
+
+
+def _pick(rng, shares, size):
+    values = list(shares)
+    p = np.array(list(shares.values()), dtype=np.float64)
+    return np.array(values, dtype=object)[rng.choice(len(values), size, p=p / p.sum())]
+
+
+##########################################
+##  Tables                              ##
+##########################################
+
+
+def synthetic_rosters(rng, scale):
+    n = int(PLAYERS * scale)
+    first = np.array(FIRST_NAMES, dtype=object)[rng.integers(0, len(FIRST_NAMES), n)]
+    last = np.array(LAST_NAMES, dtype=object)[rng.integers(0, len(LAST_NAMES), n)]
+    suffix = np.array(SUFFIXES, dtype=object)[rng.integers(0, len(SUFFIXES), n)]
+    age = rng.integers(21, 38, n)
+    return pd.DataFrame(
+        {
+            "season": SEASONS[-1],
+            "team": np.array(list(TEAMS), dtype=object)[np.arange(n) % len(TEAMS)],
+            "position": _pick(rng, POSITIONS, n),
+            "jersey_number": rng.integers(0, 100, n),
+            "status": "ACT",
+            "player_name": first + " " + last + suffix,
+            "first_name": first,
+            "last_name": last + suffix,
+            "birth_date": (
+                pd.Timestamp(f"{SEASONS[-1]}-09-01")
+                - pd.to_timedelta(age * 365 + rng.integers(0, 365, n), unit="D")
+            ).strftime("%Y-%m-%d"),
+            "height": rng.normal(74, 2.5, n).round().astype(int),
+            "weight": rng.normal(245, 45, n).clip(160, 360).round().astype(int),
+            "college": "State",
+            "gsis_id": [f"00-{i:07d}" for i in range(n)],
+            "headshot_url": None,
+            "years_exp": np.clip(age - 22 + rng.integers(-1, 2, n), 0, None),
+            "age": age,
+        }
+    )
+
+
+# Weekly report rows: one per (player, season, week) at most, like the real reports
+def synthetic_injuries(rng, rosters, scale):
+    frames = []
+    per_week = int(REPORT_ROWS_PER_SEASON * scale / REPORT_WEEKS)
+    for season in SEASONS:
+        for week in range(1, REPORT_WEEKS + 1):
+            rows = rosters.iloc[rng.choice(len(rosters), per_week, replace=False)]
+            status = _pick(rng, REPORT_STATUS, per_week)
+            injury = _pick(rng, INJURIES, per_week)
+            modified = pd.Timestamp(f"{season}-09-07", tz="UTC") + pd.to_timedelta(
+                (week - 1) * 7 * 86400 + rng.integers(0, 3 * 86400, per_week), unit="s"
+            )
+            frames.append(
+                pd.DataFrame(
+                    {
+                        "season": season,
+                        "game_type": "REG" if week <= 18 else "POST",
+                        "team": rows["team"].to_numpy(),
+                        "week": week,
+                        "gsis_id": rows["gsis_id"].to_numpy(),
+                        "position": rows["position"].to_numpy(),
+                        "full_name": rows["player_name"].to_numpy(),
+                        "first_name": rows["first_name"].to_numpy(),
+                        "last_name": rows["last_name"].to_numpy(),
+                        "report_primary_injury": np.where(
+                            pd.isna(status), None, injury
+                        ),
+                        "report_secondary_injury": None,
+                        "report_status": status,
+                        "practice_primary_injury": injury,
+                        "practice_secondary_injury": None,
+                        "practice_status": _pick(rng, PRACTICE_STATUS, per_week),
+                        "date_modified": modified.strftime("%Y-%m-%d %H:%M:%S+00:00"),
+                    }
+                )
+            )
+    return pd.concat(frames, ignore_index=True)
+
+
+# Same columns as 2_DataCleaning/cleaned_data/clean_merged_data.csv uses downstream
+def synthetic_merged(injuries, rosters):
+    attributes = rosters.set_index("gsis_id")[
+        ["team", "position", "height", "weight", "age", "years_exp"]
+    ]
+    merged = injuries.join(attributes, on="gsis_id", rsuffix="_roster")
+    body = merged["report_primary_injury"]
+    return pd.DataFrame(
+        {
+            "gsis_id": merged["gsis_id"],
+            "full_name": merged["full_name"],
+            "team": merged["team"],
+            "team_x": merged["team"],
+            "position_x_x": merged["position"],
+            "height": merged["height"].astype(float),
+            "weight": merged["weight"].astype(float),
+            "age_at_injury": (merged["age"] - (SEASONS[-1] - merged["season"])).astype(
+                float
+            ),
+            "years_exp": merged["years_exp"].astype(float),
+            "injury_category": np.select(
+                [body.isin(["Shoulder", "Arm"]), body.isin(["Leg", "Knee"])],
+                ["Upper Body", "Lower Body"],
+                default="Other",
+            ),
+            "report_primary_injury_x": body,
+            "season_x": merged["season"],
+            "report_status_x": merged["report_status"],
+        }
+    )
+
+
+# Games with unique (date, home, away), spread over the year so any scale fits in a season
+def synthetic_games(rng, scale):
+    abbrs = np.array(list(TEAMS), dtype=object)
+    home, away = np.meshgrid(np.arange(len(abbrs)), np.arange(len(abbrs)))
+    pairs = np.flatnonzero(home.ravel() != away.ravel())
+    n = int(GAMES_PER_SEASON * scale)
+    if n > 365 * len(pairs):
+        raise ValueError(f"Scale {scale} needs more unique games than a season holds")
+
+    frames = []
+    for season in SEASONS:
+        slots = np.sort(rng.choice(365 * len(pairs), n, replace=False))
+        day, pair = np.divmod(slots, len(pairs))
+        date = pd.Timestamp(f"{season}-09-01") + pd.to_timedelta(day, unit="D")
+        seq = pd.Series(day).groupby(day).cumcount().to_numpy()
+        frames.append(
+            pd.DataFrame(
+                {
+                    # YYYYMMDD first, as read_schedule derives the date from the id
+                    "gameId": date.strftime("%Y%m%d").astype(np.int64) * 10_000 + seq,
+                    "season": season,
+                    "week": np.minimum(day // 7 + 1, 52),
+                    "gameDate": date.strftime("%m/%d/%Y"),
+                    "gameTimeEastern": rng.choice(
+                        ["13:00:00", "16:25:00", "20:20:00"], n
+                    ),
+                    "homeTeamAbbr": abbrs[home.ravel()[pairs[pair]]],
+                    "visitorTeamAbbr": abbrs[away.ravel()[pairs[pair]]],
+                    "homeFinalScore": rng.integers(0, 45, n),
+                    "visitorFinalScore": rng.integers(0, 45, n),
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+# Scraped weather rows (nfl_weather_data.csv schema), one per game
+def synthetic_weather(rng, games):
+    kickoff = pd.to_datetime(
+        games["gameDate"] + " " + games["gameTimeEastern"], format="%m/%d/%Y %H:%M:%S"
+    )
+    n = len(games)
+    return pd.DataFrame(
+        {
+            "Date_Time": kickoff.dt.strftime("%m/%d/%y %I:%M %p") + " EDT",
+            "Away_Team": games["visitorTeamAbbr"].map(TEAMS),
+            "Home_Team": games["homeTeamAbbr"].map(TEAMS),
+            "Away_Score": games["visitorFinalScore"],
+            "Home_Score": games["homeFinalScore"],
+            "Temperature": rng.integers(10, 95, n).astype(str) + " °F",
+            "Weather_Condition": rng.choice(
+                ["Sunny", "Partly Cloudy", "Mostly Cloudy", "Rain", "Snow"], n
+            ),
+        }
+    )
+
+
+def synthetic_stadiums(rng):
+    n = len(TEAMS)
+    return pd.DataFrame(
+        {
+            "HomeTeam": list(TEAMS.values()),
+            "StadiumName": [f"{name} Stadium" for name in TEAMS.values()],
+            "RoofType": rng.choice(["Outdoor", "Indoor", "Retractable"], n),
+            "Latitude": rng.uniform(25, 48, n).round(4),
+            "Longitude": rng.uniform(-123, -71, n).round(4),
+        }
+    )
+
+
+##########################################
+##  Write                               ##
+##########################################
+
+
+# Repo-relative locations the stage scripts read, under the output root
+PATHS = {
+    "rosters": "7_Deployment/src/team_rosters.csv",
+    "injuries": "1_DataCollection/src/injuries.csv",
+    "merged": "2_DataCleaning/cleaned_data/clean_merged_data.csv",
+    "games": "data/games.parq",
+    "weather": "7_Deployment/src/nfl_weather_data.csv",
+    "stadiums": "7_Deployment/src/stadium_coordinates.csv",
+}
+
+
+def generate(root, scale=1.0, seed=42):
+    rng = np.random.default_rng(seed)
+    rosters = synthetic_rosters(rng, scale)
+    injuries = synthetic_injuries(rng, rosters, scale)
+    games = synthetic_games(rng, scale)
+    tables = {
+        "rosters": rosters,
+        "injuries": injuries,
+        "merged": synthetic_merged(injuries, rosters),
+        "games": games,
+        "weather": synthetic_weather(rng, games),
+        "stadiums": synthetic_stadiums(rng),
+    }
+
+    paths = {}
+    for name, table in tables.items():
+        path = os.path.join(root, PATHS[name])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if path.endswith(".parq"):
+            table.to_parquet(path, index=False)
+        else:
+            table.to_csv(path, index=False)
+        paths[name] = path
+    return paths, {name: len(table) for name, table in tables.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write synthetic pipeline inputs")
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", required=True, help="root of the scratch tree")
+    args = parser.parse_args()
+
+    paths, rows = generate(args.output, args.scale, args.seed)
+    for name, path in paths.items():
+        print(f"{name}: {rows[name]:,} rows -> {path}")